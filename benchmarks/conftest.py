@@ -0,0 +1,15 @@
+"""Reports the measurements recorded by the benchmarks with ``record_property``."""
+
+
+def pytest_terminal_summary(terminalreporter):
+    lines = [
+        f'{report.nodeid}: {name} = {value}'
+        for key in ('passed', 'failed')
+        for report in terminalreporter.stats.get(key, [])
+        if getattr(report, 'when', None) == 'call'
+        for name, value in report.user_properties
+    ]
+    if lines:
+        terminalreporter.write_sep('-', 'measurements')
+        for line in lines:
+            terminalreporter.write_line(line)
@@ -0,0 +1,147 @@
+"""
+Benchmarks of the hot paths of Cloup, based on pytest-benchmark. Run them with::
+
+    tox -e benchmarks
+    # or:
+    pytest benchmarks --benchmark-autosave
+
+With ``--benchmark-autosave``, results are saved in ``.benchmarks/``, so that
+they can be compared across commits with ``--benchmark-compare`` or with
+``pytest-benchmark compare``.
+"""
+import subprocess
+import sys
+
+import click
+import pytest
+
+import cloup
+from cloup import HelpFormatter, HelpTheme
+from cloup.formatting.sep import RowSepIf, multiline_rows_are_at_least
+from benchmarks.util import (
+    make_constrained_command, make_group, make_picklable_group, make_valid_args,
+)
+
+pytest.importorskip('pytest_benchmark')
+
+
+def test_import_cloup(benchmark):
+    benchmark.pedantic(
+        subprocess.run, args=([sys.executable, '-c', 'import cloup'],),
+        kwargs=dict(check=True), rounds=20, warmup_rounds=2,
+    )
+
+
+@pytest.mark.parametrize('num_sections, commands_per_section', [
+    (5, 10), (20, 50),
+], ids=['50_commands', '1000_commands'])
+def test_group_construction(benchmark, num_sections, commands_per_section):
+    benchmark(make_group, num_sections, commands_per_section)
+
+
+@pytest.mark.parametrize('bulk', [False, True], ids=['add_command', 'add_commands'])
+def test_register_10k_commands(benchmark, bulk):
+    commands = [cloup.Command(f'cmd-{i}', aliases=[f'c{i}']) for i in range(10_000)]
+
+    def register():
+        grp = cloup.Group('cli')
+        section = cloup.Section('Generated')
+        if bulk:
+            grp.add_commands(commands, section=section)
+        else:
+            for cmd in commands:
+                grp.add_command(cmd, section=section)
+        return grp
+
+    assert len(benchmark(register).commands) == 10_000
+
+
+def test_restore_snapshot(benchmark, tmp_path):
+    path = tmp_path / 'cli.pickle'
+    assert cloup.snapshot(make_picklable_group(20, 50), path)
+    cli = benchmark(cloup.restore, path)
+    assert len(cli.commands) == 1000
+
+
+@pytest.mark.parametrize('num_constraints', [10, 100])
+def test_parse_args_with_constraints(benchmark, num_constraints):
+    cmd = make_constrained_command(num_constraints)
+    args = make_valid_args(num_constraints)
+
+    def parse():
+        with cmd.make_context('cmd', list(args)) as ctx:
+            return ctx
+
+    ctx = benchmark(parse)
+    assert ctx.params[f'a{num_constraints - 1}'] == 'x'
+
+
+@pytest.mark.parametrize('themed', [False, True], ids=['no_theme', 'theme'])
+@pytest.mark.parametrize('row_sep', [None, 'conditional'])
+def test_format_help(benchmark, themed, row_sep):
+    cmd = make_constrained_command(50)
+    formatter_settings = HelpFormatter.settings(
+        theme=HelpTheme.dark() if themed else HelpTheme(),
+        row_sep=RowSepIf(multiline_rows_are_at_least(0.5)) if row_sep else None,
+    )
+
+    def format_help():
+        ctx = cloup.Context(cmd, info_name='cmd', terminal_width=100,
+                            formatter_settings=formatter_settings)
+        formatter = ctx.make_formatter()
+        cmd.format_help(ctx, formatter)
+        return formatter.getvalue()
+
+    assert '--a49' in benchmark(format_help)
+
+
+@pytest.mark.parametrize('num_sections, commands_per_section', [(20, 100)])
+def test_group_format_help(benchmark, num_sections, commands_per_section):
+    grp = make_group(num_sections, commands_per_section)
+
+    def format_help():
+        ctx = cloup.Context(grp, info_name='grp', terminal_width=100)
+        formatter = ctx.make_formatter()
+        grp.format_help(ctx, formatter)
+        return formatter.getvalue()
+
+    assert 'cmd-0-0' in benchmark(format_help)
+
+
+@pytest.mark.parametrize('num_rows', [100, 1000])
+def test_write_long_dl(benchmark, num_rows):
+    rows = [(f'--option-{i} TEXT', f'Help of option {i}. ' * (1 + i % 8))
+            for i in range(num_rows)]
+
+    def write_dl():
+        formatter = HelpFormatter(width=100)
+        formatter.write_dl(rows)
+        return formatter.getvalue()
+
+    assert f'--option-{num_rows - 1}' in benchmark(write_dl)
+
+
+@pytest.fixture(scope='module')
+def big_group():
+    return make_group(20, 50)
+
+
+@pytest.mark.parametrize('name', ['cmd-19-49', 'c19-49'], ids=['name', 'alias'])
+def test_resolve_command(benchmark, big_group, name):
+    ctx = cloup.Context(big_group, info_name='cli')
+    cmd_name, cmd, _ = benchmark(big_group.resolve_command, ctx, [name])
+    assert cmd_name == 'cmd-19-49'
+
+
+def test_handle_bad_command_name(benchmark, big_group):
+    ctx = cloup.Context(big_group, info_name='cli')
+
+    def resolve_bad_name():
+        try:
+            big_group.resolve_command(ctx, ['cmd-19-499'])
+        except click.UsageError as error:
+            return error
+        raise AssertionError('UsageError not raised')
+
+    error = benchmark(resolve_bad_name)
+    assert 'Did you mean' in error.message
@@ -0,0 +1,62 @@
+"""
+Import-time regression benchmarks. They run ``python -X importtime`` in a
+subprocess and compare the time spent importing the statement under test with
+a budget (in microseconds), which can be overridden with environment variables.
+The measure excludes the modules imported by the interpreter at startup.
+"""
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+import pytest
+
+IMPORT_CLOUP_BUDGET_US = int(os.environ.get('CLOUP_IMPORT_BUDGET_US', 10_000))
+IMPORT_COMMAND_BUDGET_US = int(os.environ.get('CLOUP_IMPORT_COMMAND_BUDGET_US', 80_000))
+NUM_RUNS = int(os.environ.get('CLOUP_IMPORT_RUNS', 5))
+
+
+def parse_importtime(stderr: str) -> List[Tuple[str, int]]:
+    """Return (module, cumulative_us) for each top-level import in the output of
+    ``python -X importtime``."""
+    top_level = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        if not name.startswith('   '):  # nested imports are further indented
+            top_level.append((name.strip(), int(cumulative)))
+    return top_level
+
+
+def top_level_imports(code: str) -> Dict[str, int]:
+    res = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        stderr=subprocess.PIPE, text=True, check=True,
+    )
+    return dict(parse_importtime(res.stderr))
+
+
+def measure_import_time(code: str) -> int:
+    """Return the best cumulative import time (in microseconds) of ``code``
+    across ``NUM_RUNS`` runs, excluding the imports done by the interpreter."""
+    startup_modules = top_level_imports('pass').keys()
+    timings = []
+    for _ in range(NUM_RUNS):
+        imports = top_level_imports(code)
+        timings.append(sum(
+            time for module, time in imports.items()
+            if module not in startup_modules
+        ))
+    return min(timings)
+
+
+@pytest.mark.parametrize('code, budget_us', [
+    ('import cloup', IMPORT_CLOUP_BUDGET_US),
+    ('from cloup import Command', IMPORT_COMMAND_BUDGET_US),
+], ids=['import_cloup', 'import_Command'])
+def test_import_time_is_within_budget(record_property, code, budget_us):
+    import_time = measure_import_time(code)
+    record_property('import_time_us', import_time)
+    record_property('budget_us', budget_us)
+    assert import_time <= budget_us
@@ -0,0 +1,35 @@
+"""
+Memory regression benchmarks. They measure (with ``tracemalloc``) the memory
+retained by a large command tree, which matters for long-lived processes (REPL
+shells, daemons) holding the CLI, and compare it with a budget (in MB), which
+can be overridden with environment variables.
+"""
+import gc
+import os
+import tracemalloc
+
+from benchmarks.util import make_group
+
+TREE_MEMORY_BUDGET_MB = float(os.environ.get('CLOUP_TREE_MEMORY_BUDGET_MB', 40))
+
+
+def measure_retained_memory(build):
+    """Return the object built by ``build()`` and the memory (in bytes) it retains."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        obj = build()
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return obj, retained
+
+
+def test_memory_of_10k_commands_tree(record_property):
+    grp, retained = measure_retained_memory(lambda: make_group(100, 100))
+    assert len(grp.commands) == 10_000
+    retained_mb = round(retained / 1e6, 1)
+    record_property('retained_mb', retained_mb)
+    record_property('budget_mb', TREE_MEMORY_BUDGET_MB)
+    assert retained_mb <= TREE_MEMORY_BUDGET_MB
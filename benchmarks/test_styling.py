@@ -0,0 +1,83 @@
+"""
+Micro-benchmark of the per-row styling cost of a themed help page with 500
+options. It compares the formatter (which uses ``HelpTheme.compiled()``) with
+the same formatter styling each row through ``click.style``, as Cloup did before
+styles were precompiled.
+"""
+import os
+import timeit
+
+import click
+
+import cloup
+from cloup import HelpFormatter, HelpTheme, Style
+
+NUM_OPTIONS = 500
+NUM_RUNS = int(os.environ.get('CLOUP_STYLING_RUNS', 20))
+
+THEME = HelpTheme.dark().with_(
+    col2=Style(fg='bright_black', italic=True),
+    section_help=Style(dim=True, text_transform=str.lower),
+)
+
+
+def make_command() -> cloup.Command:
+    @cloup.command()
+    @cloup.option_group(
+        'Many options',
+        *(cloup.option(f'--option-{i}', help=f'Help of option {i}.')
+          for i in range(NUM_OPTIONS)),
+        help='Group help.',
+    )
+    def cmd(**kwargs):
+        pass
+
+    return cmd
+
+
+def click_style_theme(theme: HelpTheme) -> HelpTheme:
+    """Return a theme equivalent to ``theme`` calling ``click.style`` for each
+    styled fragment."""
+    def to_click_style(style):
+        if not isinstance(style, Style):
+            return style
+        kwargs = {key: val for key, val in vars(style).items()
+                  if val is not None and not key.startswith('_')}
+        transform = kwargs.pop('text_transform', lambda s: s)
+        return lambda text: click.style(transform(text), **kwargs)
+
+    return HelpTheme(*(to_click_style(style) for style in theme))
+
+
+def render_help(cmd: cloup.Command, formatter: HelpFormatter) -> str:
+    ctx = cloup.Context(cmd, info_name='cmd', terminal_width=100)
+    cmd.format_help(ctx, formatter)
+    return formatter.getvalue()
+
+
+def measure_per_row_us(cmd: cloup.Command, make_formatter) -> float:
+    timer = timeit.Timer(lambda: render_help(cmd, make_formatter()))
+    best = min(timer.repeat(repeat=NUM_RUNS, number=1))
+    return best / NUM_OPTIONS * 1e6
+
+
+def test_styling_cost_of_themed_help_page(record_property):
+    cmd = make_command()
+
+    def compiled_formatter():
+        return HelpFormatter(width=100, theme=THEME)
+
+    def click_style_formatter():
+        formatter = HelpFormatter(width=100)
+        # Bypass compilation, so that each fragment goes through click.style
+        formatter._styles = click_style_theme(THEME)
+        return formatter
+
+    assert (render_help(cmd, compiled_formatter())
+            == render_help(cmd, click_style_formatter()))
+
+    compiled_us = measure_per_row_us(cmd, compiled_formatter)
+    click_style_us = measure_per_row_us(cmd, click_style_formatter)
+    record_property('per_row_us_compiled_theme', round(compiled_us, 2))
+    record_property('per_row_us_click_style', round(click_style_us, 2))
+    assert compiled_us <= click_style_us * 1.1
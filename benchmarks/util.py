@@ -0,0 +1,74 @@
+"""Builders of the CLIs used by the benchmarks."""
+from typing import Tuple
+
+import cloup
+from cloup.constraints import RequireAtLeast, mutually_exclusive, require_one
+
+
+def make_group(num_sections: int, commands_per_section: int) -> cloup.Group:
+    """Build a group with ``num_sections`` sections, each containing
+    ``commands_per_section`` subcommands (with an alias each) defined
+    using ``Group.command``."""
+    @cloup.group()
+    def cli():
+        """A group with many subcommands."""
+
+    for i in range(num_sections):
+        section = cloup.Section(f'Section {i}')
+        for j in range(commands_per_section):
+            @cli.command(f'cmd-{i}-{j}', aliases=[f'c{i}-{j}'], section=section,
+                         help=f'Help of command {i}.{j}.')
+            @cloup.option('--opt', help='An option.')
+            def cmd(opt):
+                pass
+
+    return cli
+
+
+def _callback(**kwargs):
+    """A module-level callback, so that commands using it can be pickled."""
+
+
+def make_picklable_group(num_sections: int, commands_per_section: int) -> cloup.Group:
+    """Like ``make_group`` but the subcommands share a module-level callback,
+    so that the group can be pickled (e.g. by ``cloup.snapshot``)."""
+    cli = cloup.Group('cli', help='A group with many subcommands.')
+    for i in range(num_sections):
+        section = cloup.Section(f'Section {i}')
+        for j in range(commands_per_section):
+            cli.add_command(cloup.Command(
+                f'cmd-{i}-{j}', aliases=[f'c{i}-{j}'], callback=_callback,
+                help=f'Help of command {i}.{j}.',
+                params=[cloup.Option(['--opt'], help='An option.')],
+            ), section=section)
+    return cli
+
+
+def make_constrained_command(num_constraints: int) -> cloup.Command:
+    """Build a command with ``num_constraints`` option groups, each with 3
+    options and a constraint, plus a constraint registered with
+    ``@constraint`` for each group."""
+    decorators = []
+    for i in range(num_constraints):
+        constraint = (require_one, mutually_exclusive, RequireAtLeast(1))[i % 3]
+        decorators.append(cloup.option_group(
+            f'Group {i}',
+            cloup.option(f'--a{i}'),
+            cloup.option(f'--b{i}'),
+            cloup.option(f'--c{i}', is_flag=True),
+            constraint=constraint,
+        ))
+        decorators.append(
+            cloup.constraint(mutually_exclusive, [f'b{i}', f'c{i}']))
+
+    def cmd(**kwargs):
+        pass
+
+    for decorator in reversed(decorators):
+        cmd = decorator(cmd)
+    return cloup.command('cmd')(cmd)
+
+
+def make_valid_args(num_constraints: int) -> Tuple[str, ...]:
+    """Arguments satisfying all constraints of ``make_constrained_command``."""
+    return tuple(f'--a{i}=x' for i in range(num_constraints))
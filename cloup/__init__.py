@@ -1,70 +1,149 @@
-"""Top-level package for cloup."""
+"""Top-level package for cloup.
+
+Public names are imported lazily, i.e. the first time they are accessed (see
+``__getattr__`` below), so that ``import cloup`` is almost free and each module
+is loaded only if (and when) it's needed.
+"""
 # WARNING: _version.py is generated by setuptools-scm upon package building/installation
+import importlib
+
 from . import _version
 
+# Don't import `typing` here: it's relatively slow to import and not needed at
+# runtime by this module (mypy treats any variable with this name specially).
+TYPE_CHECKING = False
+
 __author__ = """Gianluca Gippetto"""
 __email__ = 'gianluca.gippetto@gmail.com'
 __version__ = _version.version
 __version_tuple__ = _version.version_tuple
 
-from click import (
-    # decorators
-    confirmation_option,
-    help_option,
-    pass_context,
-    pass_obj,
-    password_option,
-    version_option,
-    # types
-    BOOL,
-    Choice,
-    DateTime,
-    File,
-    FLOAT,
-    FloatRange,
-    INT,
-    IntRange,
-    ParamType,
-    Path,
-    STRING,
-    Tuple,
-    UNPROCESSED,
-    UUID,
-)
-
-from . import warnings
-from .styling import (
-    HelpTheme,
-    Style,
-    Color,
-)
-from .formatting import (
-    HelpFormatter,
-    HelpSection,
-)
-from ._context import Context
-from ._params import Argument, Option, argument, option
-from ._option_groups import (
-    OptionGroup,
-    OptionGroupMixin,
-    option_group,
-)
-from ._sections import (
-    Section,
-    SectionMixin,
-)
-from ._commands import (
-    Command,
-    Group,
-    command,
-    group,
-)
-from .constraints import (
-    ConstraintMixin,
-    constrained_params,
-    constraint,
-)
-from .types import dir_path, file_path, path
+# Modules and the public names they export. The names exported by this package
+# must be kept in sync with the imports in the "if TYPE_CHECKING" block below.
+_EXPORTS_BY_MODULE = {
+    'click': (
+        # decorators
+        'confirmation_option', 'help_option', 'pass_context', 'pass_obj',
+        'password_option', 'version_option',
+        # types
+        'BOOL', 'Choice', 'DateTime', 'File', 'FLOAT', 'FloatRange', 'INT',
+        'IntRange', 'ParamType', 'Path', 'STRING', 'Tuple', 'UNPROCESSED', 'UUID',
+    ),
+    '.styling': ('HelpTheme', 'Style', 'Color'),
+    '.formatting': ('HelpFormatter', 'HelpSection'),
+    '._context': ('Context',),
+    '._help_cache': ('HelpCache',),
+    '._timings': ('PhaseTimings',),
+    '._tracing': ('ConstructionTracer',),
+    '._snapshot': ('restore', 'snapshot'),
+    '._completion': ('CompletionIndex', 'complete_from_index'),
+    '._manifest': ('Manifest', 'run_from_manifest'),
+    '._params': ('Argument', 'Option', 'argument', 'option'),
+    '._option_groups': ('OptionGroup', 'OptionGroupMixin', 'option_group'),
+    '._sections': ('Section', 'SectionMixin'),
+    '._commands': ('Command', 'Group', 'LazyCommand', 'command', 'group'),
+    '.constraints': ('ConstraintMixin', 'constrained_params', 'constraint'),
+    '.types': ('dir_path', 'file_path', 'path'),
+}
+
+_MODULE_BY_NAME = {
+    name: module
+    for module, names in _EXPORTS_BY_MODULE.items()
+    for name in names
+}
+
+# Public submodules that can be accessed as attributes (e.g. ``cloup.warnings``)
+# without importing them explicitly.
+_SUBMODULES = frozenset({
+    'constraints', 'formatting', 'styling', 'types', 'typing', 'warnings',
+})
+
+if TYPE_CHECKING:
+    from typing import Any, List
+
+    from click import (
+        # decorators
+        confirmation_option,
+        help_option,
+        pass_context,
+        pass_obj,
+        password_option,
+        version_option,
+        # types
+        BOOL,
+        Choice,
+        DateTime,
+        File,
+        FLOAT,
+        FloatRange,
+        INT,
+        IntRange,
+        ParamType,
+        Path,
+        STRING,
+        Tuple,
+        UNPROCESSED,
+        UUID,
+    )
+
+    from . import warnings
+    from .styling import (
+        HelpTheme,
+        Style,
+        Color,
+    )
+    from .formatting import (
+        HelpFormatter,
+        HelpSection,
+    )
+    from ._context import Context
+    from ._help_cache import HelpCache
+    from ._timings import PhaseTimings
+    from ._tracing import ConstructionTracer
+    from ._snapshot import restore, snapshot
+    from ._completion import CompletionIndex, complete_from_index
+    from ._manifest import Manifest, run_from_manifest
+    from ._params import Argument, Option, argument, option
+    from ._option_groups import (
+        OptionGroup,
+        OptionGroupMixin,
+        option_group,
+    )
+    from ._sections import (
+        Section,
+        SectionMixin,
+    )
+    from ._commands import (
+        Command,
+        Group,
+        LazyCommand,
+        command,
+        group,
+    )
+    from .constraints import (
+        ConstraintMixin,
+        constrained_params,
+        constraint,
+    )
+    from .types import dir_path, file_path, path
+
+
+def __getattr__(name: str) -> 'Any':
+    module_name = _MODULE_BY_NAME.get(name)
+    if module_name is not None:
+        module = importlib.import_module(module_name, __name__)
+        value = getattr(module, name)
+    elif name in _SUBMODULES:
+        value = importlib.import_module('.' + name, __name__)
+    else:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    globals()[name] = value  # next accesses won't go through __getattr__
+    return value
+
+
+def __dir__() -> 'List[str]':
+    return sorted({*globals(), *__all__})
+
 
 __all__ = [
     "Argument",
@@ -72,23 +151,29 @@ __all__ = [
     "Choice",
     "Color",
     "Command",
+    "CompletionIndex",
     "ConstraintMixin",
+    "ConstructionTracer",
     "Context",
     "DateTime",
     "FLOAT",
     "File",
     "FloatRange",
     "Group",
+    "HelpCache",
     "HelpFormatter",
     "HelpSection",
     "HelpTheme",
     "INT",
     "IntRange",
+    "LazyCommand",
+    "Manifest",
     "Option",
     "OptionGroup",
     "OptionGroupMixin",
     "ParamType",
     "Path",
+    "PhaseTimings",
     "STRING",
     "Section",
     "SectionMixin",
@@ -99,6 +184,7 @@ __all__ = [
     "_version",
     "argument",
     "command",
+    "complete_from_index",
     "confirmation_option",
     "constrained_params",
     "constraint",
@@ -112,6 +198,9 @@ __all__ = [
     "pass_obj",
     "password_option",
     "path",
+    "restore",
+    "run_from_manifest",
+    "snapshot",
     "version_option",
     "warnings",
 ]
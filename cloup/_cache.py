@@ -0,0 +1,73 @@
+"""
+Utilities for the on-disk caches used by Cloup.
+
+All caches live in a directory stamped with the version of Cloup, so that
+upgrading (or downgrading) Cloup never reuses data produced by another version.
+The base directory is (in order of priority):
+
+- the environment variable ``CLOUP_CACHE_DIR``
+- ``$XDG_CACHE_HOME/cloup``
+- ``~/.cache/cloup``.
+"""
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+from ._version import version as cloup_version
+
+PathLike = Union[str, 'os.PathLike[str]']
+
+
+def get_cache_dir(subdir: Optional[str] = None) -> Path:
+    """Return the version-stamped cache directory of Cloup (or one of its
+    subdirectories). The directory is not created by this function."""
+    base = os.environ.get('CLOUP_CACHE_DIR')
+    if base:
+        path = Path(base)
+    else:
+        xdg_cache_home = os.environ.get('XDG_CACHE_HOME')
+        root = Path(xdg_cache_home) if xdg_cache_home else Path.home() / '.cache'
+        path = root / 'cloup'
+    path = path / cloup_version
+    return path / subdir if subdir else path
+
+
+def hash_key(key: str) -> str:
+    """Return a hash of ``key`` usable as file name."""
+    # hashlib and tempfile are imported lazily since this module is imported by
+    # the shell completion bootstrap, which must be fast.
+    import hashlib
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def read_text(path: Path) -> Optional[str]:
+    """Return the content of a file or ``None`` if it can't be read."""
+    try:
+        return path.read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def write_text_atomic(path: Path, text: str) -> bool:
+    """Atomically (over)write a file, creating its parent directory if needed.
+    Return ``False`` (instead of raising) if the file can't be written: a cache
+    should never make a CLI fail."""
+    return write_bytes_atomic(path, text.encode('utf-8'))
+
+
+def write_bytes_atomic(path: Path, data: bytes) -> bool:
+    """Binary version of :func:`write_text_atomic`."""
+    import tempfile
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=str(path.parent), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                tmp_file.write(data)
+            os.replace(tmp_path, str(path))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError:
+        return False
+    return True
@@ -22,22 +22,31 @@ verbose. The ``@overload`` is on the ``cls`` argument:
 
 When and if the MyPy issue is resolved, the overloads will be removed.
 """
+import importlib
 import inspect
+from itertools import chain
 from typing import (
-    Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Type,
-    TypeVar, Union, cast, overload,
+    Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set,
+    TYPE_CHECKING, Tuple, Type, TypeVar, Union, cast, overload,
 )
 
 import click
 
 import cloup
 from ._context import Context
+from .formatting import ColumnWidths
 from ._option_groups import OptionGroupMixin
-from ._sections import Section, SectionMixin
-from ._util import click_version_ge_8_1, first_bool, reindent
+from ._sections import Section, SectionMixin, Subcommands, get_command_items
+from ._suggestions import PrefixIndex, SuggestionIndex
+from ._timings import measure_phase, reporting_timings
+from ._tracing import trace_construction
+from ._util import class_name, click_version_ge_8_1, first_bool, reindent
 from .constraints import ConstraintMixin
 from .typing import AnyCallable
 
+if TYPE_CHECKING:
+    from ._help_cache import HelpCache
+
 ClickCommand = TypeVar('ClickCommand', bound=click.Command)
 ClickGroup = TypeVar('ClickGroup', bound=click.Group)
 
@@ -99,8 +108,43 @@ class Command(ConstraintMixin, OptionGroupMixin, click.Command):
         assert isinstance(formatter, cloup.HelpFormatter)
         formatter.write_aliases(self.aliases)
 
+    def get_help(self, ctx: click.Context) -> str:
+        """Format the help into a string and return it. If the context has a
+        ``help_cache`` (see :class:`~cloup.HelpCache`), the rendered help is
+        taken from (or stored into) it."""
+        with measure_phase(ctx, 'help'):
+            help_cache: Optional['HelpCache'] = getattr(ctx, 'help_cache', None)
+            # A streaming formatter writes most of the help to its sink directly
+            formatter_settings: Dict[str, Any] = (
+                getattr(ctx, 'get_formatter_settings', dict)())
+            if help_cache is None or formatter_settings.get('sink') is not None:
+                return super().get_help(ctx)
+            return help_cache.get_or_render(
+                ctx, lambda: super(Command, self).get_help(ctx))
+
+    def invoke(self, ctx: click.Context) -> Any:
+        with measure_phase(ctx, 'invoke'):
+            return super().invoke(ctx)
+
+    def main(self, *args: Any, **kwargs: Any) -> Any:
+        """Same as :meth:`click.Command.main`; in addition, if timings are
+        enabled (see the ``timings`` context setting), it reports them."""
+        with reporting_timings():
+            return super().main(*args, **kwargs)
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Callbacks are pickled as references by qualified name, since the
+        # module attribute with that name is usually the command, not the function
+        from ._snapshot import make_callback_ref
+        state = self.__dict__.copy()
+        state['callback'] = make_callback_ref(self.callback, self.name)
+        return state
+
     def format_help(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
         self.format_usage(ctx, formatter)
+        if isinstance(formatter, cloup.HelpFormatter):
+            # Not done in write_usage(), which is also used by get_usage()
+            formatter.flush()
         self.format_aliases(ctx, formatter)
         self.format_help_text(ctx, formatter)
         self.format_params(ctx, formatter)
@@ -111,6 +155,97 @@ class Command(ConstraintMixin, OptionGroupMixin, click.Command):
         self.format_epilog(ctx, formatter)
 
 
+class LazyCommand(click.Command):
+    """A placeholder for a subcommand defined in a module that is imported only
+    when the subcommand is actually needed, i.e. when it's selected by
+    :meth:`Group.resolve_command` or when :meth:`Group.get_command` is called
+    with its name (e.g. for generating shell completions or for the help of
+    the subcommand itself).
+
+    A ``LazyCommand`` can be added to a :class:`Group` and to a :class:`Section`
+    like any other command. The help of the parent group and the completion of
+    subcommand names use the ``short_help`` and the ``aliases`` stored in this
+    object, so they don't need to import the subcommand module. When added to a
+    plain ``click.Group``, the command is loaded when its context is created.
+
+    .. code-block:: python
+
+        cli.add_command(LazyCommand(
+            'mycli.commands.deploy:deploy', 'deploy',
+            aliases=['dep'], short_help='Deploy the application.',
+        ))
+
+    :param import_path:
+        a string in the format ``"package.module:attribute"`` identifying the
+        command to import; the attribute part can be a dotted path.
+    :param name:
+        the name of the subcommand.
+    :param aliases:
+        alternative names for the subcommand; they are registered in the
+        parent group as usual. If the loaded command doesn't define any alias,
+        a (shallow) copy of it with these aliases is used, so that the
+        imported object is not modified.
+    :param short_help:
+        the short help shown in the subcommand listing of the parent group.
+    :param hidden:
+        hide this command from the help of the parent group.
+    """
+
+    def __init__(
+        self, import_path: str,
+        name: str,
+        *,
+        aliases: Optional[Iterable[str]] = None,
+        short_help: Optional[str] = None,
+        hidden: bool = False,
+    ):
+        module_name, sep, attr_path = import_path.partition(':')
+        if not (module_name and sep and attr_path):
+            raise ValueError(
+                f'invalid import path {import_path!r}; the expected format is '
+                f'"package.module:attribute"')
+        super().__init__(name, short_help=short_help, hidden=hidden,
+                         add_help_option=False)
+        self.import_path = import_path
+        self.aliases: List[str] = [] if aliases is None else list(aliases)
+        self._command: Optional[click.Command] = None
+
+    def load(self) -> click.Command:
+        """Import and return the actual command (only once)."""
+        if self._command is not None:
+            return self._command
+        module_name, _, attr_path = self.import_path.partition(':')
+        obj: Any = importlib.import_module(module_name)
+        for attr in attr_path.split('.'):
+            obj = getattr(obj, attr)
+        if not isinstance(obj, click.Command):
+            raise TypeError(
+                f'{self.import_path!r} should point to a `click.Command`; '
+                f'it points to an object of type {type(obj).__name__}')
+        command: click.Command = obj
+        if self.aliases and not getattr(command, 'aliases', None):
+            # Not copy.copy(), which would use Command.__getstate__ (for pickling)
+            original = command
+            command = type(original).__new__(type(original))
+            command.__dict__.update(vars(original), aliases=list(self.aliases))
+        self._command = command
+        return command
+
+    def make_context(
+        self, info_name: Optional[str], args: List[str],
+        parent: Optional[click.Context] = None, **extra: Any,
+    ) -> click.Context:
+        # Used when the parent group is not a cloup.Group, which would replace
+        # this object with the loaded command
+        return self.load().make_context(info_name, args, parent, **extra)
+
+    def invoke(self, ctx: click.Context) -> Any:
+        return self.load().invoke(ctx)
+
+    def __repr__(self) -> str:
+        return f'{class_name(self)}({self.import_path!r}, {self.name!r})'
+
+
 class Group(SectionMixin, Command, click.Group):
     """
     A ``click.Group`` that allows to organize its subcommands in multiple help
@@ -122,12 +257,19 @@ class Group(SectionMixin, Command, click.Group):
     - :class:`Command`
     - :class:`click.Group`
 
-    Apart from superclasses arguments, the following is the only additional parameter:
+    Apart from superclasses arguments, the following are the additional parameters:
 
     ``show_subcommand_aliases``: ``Optional[bool] = None``
         whether to show subcommand aliases; aliases are shown by default and
         can be disabled using this argument or the homonym context setting.
 
+    ``case_insensitive``: ``bool = False``
+        whether subcommand names and aliases are matched case-insensitively.
+
+    ``prefix_matching``: ``bool = False``
+        whether a subcommand can be selected by typing an unambiguous prefix of
+        its name or of one of its aliases (e.g. ``dep`` for ``deploy``).
+
     .. versionchanged:: 0.14.0
         this class now supports option groups and constraints.
 
@@ -140,15 +282,115 @@ class Group(SectionMixin, Command, click.Group):
     """
     SHOW_SUBCOMMAND_ALIASES: bool = False
 
+    SUGGESTIONS_CUTOFF: float = 0.6
+    """Minimum similarity (between 0 and 1) of a command name (or alias) to a
+    mistyped command name for being suggested ("Did you mean...?")."""
+
+    MAX_SUGGESTIONS: int = 3
+    """Maximum number of suggestions shown when a command name is mistyped."""
+
     def __init__(
-        self, *args: Any, show_subcommand_aliases: Optional[bool] = None, **kwargs: Any
+        self, *args: Any,
+        show_subcommand_aliases: Optional[bool] = None,
+        case_insensitive: bool = False,
+        prefix_matching: bool = False,
+        **kwargs: Any
     ):
+        # These attributes are updated by add_command(), which is called by
+        # super().__init__() if sections are provided.
+        self.alias2name: Dict[str, str] = {}
+        """Dictionary mapping each alias to a command name."""
+
+        self.case_insensitive = case_insensitive
+        """Whether subcommand names and aliases are matched case-insensitively."""
+
+        self.prefix_matching = prefix_matching
+        """Whether subcommands can be selected by an unambiguous prefix."""
+
+        # Maps each command name and alias (casefolded if case_insensitive) to
+        # the corresponding command name.
+        self._name_index: Dict[str, str] = {}
+        # Trie with the same content of _name_index (built when first needed)
+        self._prefix_index: Optional[PrefixIndex] = None
+
+        # Index of command names and aliases used to suggest the right command
+        # name when the user mistypes it (built when first needed).
+        self._suggestion_index: Optional[SuggestionIndex] = None
+
         super().__init__(*args, **kwargs)
         self.show_subcommand_aliases = show_subcommand_aliases
         """Whether to show subcommand aliases."""
 
-        self.alias2name: Dict[str, str] = {}
-        """Dictionary mapping each alias to a command name."""
+        # Commands passed with the "commands" argument don't go through add_command()
+        for name, cmd in self.commands.items():
+            if self._name_index.get(self._make_index_key(name)) != name:
+                self._index_command(cmd, name)
+
+    def _make_index_key(self, token: str) -> str:
+        return token.casefold() if self.case_insensitive else token
+
+    def _index_command(self, cmd: click.Command, name: str) -> None:
+        self._index_commands([(name, cmd)])
+
+    def _index_commands(self, items: Sequence[Tuple[str, click.Command]]) -> None:
+        """Add the names and aliases of commands to the indexes."""
+        self._update_index(items, *self._check_index_clashes(items))
+
+    def _check_index_clashes(
+        self, items: Sequence[Tuple[str, click.Command]]
+    ) -> Tuple[Dict[str, str], List[Tuple[str, str]], Set[str]]:
+        """Check that the names and aliases of commands don't clash with each
+        other or with those of the other commands of this group. Return the new
+        entries of the name index and of ``alias2name`` and the names of the
+        commands being replaced, to be passed to :meth:`_update_index` once the
+        commands are added."""
+        name_index = self._name_index
+        replaced = {name for name, _ in items if name in self.commands}
+        new_keys: Dict[str, str] = {}
+        new_aliases: List[Tuple[str, str]] = []
+        for name, cmd in items:
+            aliases = getattr(cmd, 'aliases', None) or []
+            for token in (name, *aliases):
+                key = self._make_index_key(token)
+                owner = new_keys.get(key) or name_index.get(key)
+                if owner is not None and owner != name:
+                    raise ValueError(
+                        f'"{token}" (name or alias of command "{name}") clashes with '
+                        f'the name or an alias of command "{owner}"')
+                new_keys[key] = name
+            new_aliases.extend((alias, name) for alias in aliases)
+        return new_keys, new_aliases, replaced
+
+    def _update_index(
+        self, items: Sequence[Tuple[str, click.Command]],
+        new_keys: Dict[str, str], new_aliases: List[Tuple[str, str]],
+        replaced: Set[str],
+    ) -> None:
+        if replaced:
+            # Remove the aliases of the replaced commands; indexes that don't
+            # support removals are rebuilt when needed
+            for key in [k for k, name in self._name_index.items() if name in replaced]:
+                del self._name_index[key]
+            for alias in [a for a, name in self.alias2name.items() if name in replaced]:
+                del self.alias2name[alias]
+            self._prefix_index = None
+            self._suggestion_index = None
+        self._name_index.update(new_keys)
+        self.alias2name.update(new_aliases)
+        if self._prefix_index is not None:
+            for key, name in new_keys.items():
+                self._prefix_index.add(key, name)
+        if self._suggestion_index is not None:
+            for name, _ in items:
+                self._suggestion_index.add(name)
+            for alias, _ in new_aliases:
+                self._suggestion_index.add(alias)
+
+    def _get_suggestion_index(self) -> SuggestionIndex:
+        if self._suggestion_index is None:
+            self._suggestion_index = SuggestionIndex(
+                chain(self.commands, self.alias2name))
+        return self._suggestion_index
 
     def add_command(
         self, cmd: click.Command,
@@ -156,54 +398,158 @@ class Group(SectionMixin, Command, click.Group):
         section: Optional[Section] = None,
         fallback_to_default_section: bool = True,
     ) -> None:
-        super().add_command(cmd, name, section, fallback_to_default_section)
+        """Add a subcommand (see :meth:`SectionMixin.add_command`).
+
+        :raises ValueError:
+            if the name or an alias of the command is already the name or an
+            alias of another command.
+        """
         name = cast(str, cmd.name) if name is None else name
-        aliases = getattr(cmd, 'aliases', [])
-        for alias in aliases:
-            self.alias2name[alias] = name
+        items = [(name, cmd)]
+        # Check clashes first, so that they leave the group untouched; the
+        # indexes are updated only if the command is successfully added
+        index_update = self._check_index_clashes(items)
+        super().add_command(cmd, name, section, fallback_to_default_section)
+        self._update_index(items, *index_update)
+
+    def add_commands(
+        self, commands: Subcommands, section: Optional[Section] = None
+    ) -> None:
+        """Add multiple subcommands (see :meth:`SectionMixin.add_commands`).
+        Names and aliases are validated and indexed in a single pass.
+
+        :raises ValueError:
+            if the name or an alias of a command is already the name or an
+            alias of another command.
+        """
+        items = get_command_items(commands)
+        # See add_command()
+        index_update = self._check_index_clashes(items)
+        super().add_commands(dict(items), section)
+        self._update_index(items, *index_update)
 
     def resolve_command_name(self, ctx: click.Context, name: str) -> Optional[str]:
         """Map a string supposed to be a command name or an alias to a normalized
         command name. If no match is found, it returns ``None``."""
         if ctx.token_normalize_func:
             name = ctx.token_normalize_func(name)
-        if name in self.commands:
-            return name
-        return self.alias2name.get(name)
+        key = self._make_index_key(name)
+        resolved = self._name_index.get(key)
+        # An empty string is a prefix of all names but it doesn't select any
+        if resolved is None and self.prefix_matching and key:
+            resolved = self._get_prefix_index().resolve(key)[0]
+        return resolved
+
+    def _get_prefix_index(self) -> PrefixIndex:
+        if self._prefix_index is None:
+            self._prefix_index = PrefixIndex(self._name_index.items())
+        return self._prefix_index
+
+    def get_prefix_candidates(self, ctx: click.Context, prefix: str) -> List[str]:
+        """Return the (sorted) names of the commands that can be selected by
+        ``prefix`` if it's ambiguous, otherwise an empty list. Used only if
+        :attr:`prefix_matching` is enabled."""
+        if ctx.token_normalize_func:
+            prefix = ctx.token_normalize_func(prefix)
+        key = self._make_index_key(prefix)
+        return self._get_prefix_index().resolve(key)[1] if key else []
+
+    def shell_complete(self, ctx: click.Context, incomplete: str) -> List[Any]:
+        """Same as ``click.Group.shell_complete`` but the names of subcommands
+        registered as :class:`LazyCommand` are completed without loading them."""
+        from click.shell_completion import CompletionItem
+        results = []
+        for name in self.list_commands(ctx):
+            if not name.startswith(incomplete):
+                continue
+            cmd = self.commands.get(name)
+            if not isinstance(cmd, LazyCommand):
+                cmd = self.get_command(ctx, name)
+            if cmd is not None and not cmd.hidden:
+                results.append(CompletionItem(name, help=cmd.get_short_help_str()))
+        # Options (and commands of chained parent groups)
+        results.extend(super(click.MultiCommand, self).shell_complete(ctx, incomplete))
+        return results
+
+    def get_command(self, ctx: click.Context, cmd_name: str) -> Optional[click.Command]:
+        """Return the subcommand named ``cmd_name`` (or ``None``). If the
+        subcommand was registered as a :class:`LazyCommand`, it's loaded and
+        replaces the placeholder in this group and in its section."""
+        cmd = self.commands.get(cmd_name)
+        if isinstance(cmd, LazyCommand):
+            loaded_cmd = cmd.load()
+            self.commands[cmd_name] = loaded_cmd
+            self._replace_section_command(cmd_name, cmd, loaded_cmd)
+            return loaded_cmd
+        return cmd
 
     def resolve_command(
         self, ctx: click.Context, args: List[str]
     ) -> Tuple[Optional[str], Optional[click.Command], List[str]]:
-        normalized_name = self.resolve_command_name(ctx, args[0])
-        if normalized_name:
-            # Replacing this string ensures that super().resolve_command() returns a
-            # normalized command name rather than an alias. The technique described in
-            # Click's docs doesn't work if the subcommand is added using Group.group
-            # passing the "name" argument.
-            args[0] = normalized_name
+        with measure_phase(ctx, 'resolution'):
+            return self._resolve_command(ctx, args)
+
+    def _resolve_command(
+        self, ctx: click.Context, args: List[str]
+    ) -> Tuple[Optional[str], Optional[click.Command], List[str]]:
+        original_name = args[0]
+        name = self.resolve_command_name(ctx, original_name)
+        if name is not None:
+            # Command names and aliases are resolved using the index, without
+            # going through Click's lookup; the normalized name is returned
+            # rather than an alias.
+            cmd = self.get_command(ctx, name)
+            if cmd is not None:
+                return name, cmd, args[1:]
+        # Commands that are not in the index (e.g. provided by an overridden
+        # get_command() or added to self.commands directly) are resolved by Click
         try:
             return super().resolve_command(ctx, args)
         except click.UsageError as error:
+            # Fuzzy suggestions are computed only if the name is not an
+            # ambiguous prefix
+            candidates = (
+                self.get_prefix_candidates(ctx, original_name)
+                if self.prefix_matching else [])
+            if candidates:
+                raise self.make_ambiguous_prefix_error(ctx, original_name, candidates)
             new_error = self.handle_bad_command_name(
-                bad_name=args[0],
+                bad_name=original_name,
                 valid_names=[*self.commands, *self.alias2name],
                 error=error
             )
             raise new_error
 
+    def make_ambiguous_prefix_error(
+        self, ctx: click.Context, prefix: str, candidates: List[str]
+    ) -> click.UsageError:
+        """Return the error raised when ``prefix`` matches multiple commands."""
+        candidates_list = "\n".join("   " + name for name in candidates)
+        return click.UsageError(
+            f"Command '{prefix}' is ambiguous. It could be one of these:\n"
+            f"{candidates_list}", ctx)
+
     def handle_bad_command_name(
         self, bad_name: str, valid_names: List[str], error: click.UsageError
     ) -> click.UsageError:
         """This method is called when a command name cannot be resolved.
         Useful to implement the "Did you mean <x>?" feature.
 
+        Suggestions are limited by :attr:`SUGGESTIONS_CUTOFF` and
+        :attr:`MAX_SUGGESTIONS`.
+
         :param bad_name: the command name that could not be resolved.
         :param valid_names: the list of valid command names, including aliases.
         :param error: the original error coming from Click.
         :return: the original error or a new one.
         """
-        import difflib
-        matches = difflib.get_close_matches(bad_name, valid_names)
+        index = self._get_suggestion_index()
+        names = set(valid_names)
+        if len(names) != len(index) or not all(name in index for name in names):
+            # Not the names of this group (e.g. passed by an override)
+            index = SuggestionIndex(names)
+        matches = index.get_close_matches(
+            bad_name, n=self.MAX_SUGGESTIONS, cutoff=self.SUGGESTIONS_CUTOFF)
         if not matches:
             return error
         elif len(matches) == 1:
@@ -231,6 +577,14 @@ class Group(SectionMixin, Command, click.Group):
             return f"{name} ({alias_list})"
         return name
 
+    def _get_col1_widths_hint(
+        self, ctx: click.Context, section: Section
+    ) -> Optional[ColumnWidths]:
+        if (type(self).format_subcommand_name is Group.format_subcommand_name
+                and not self.must_show_subcommand_aliases(ctx)):
+            return section.col1_widths
+        return super()._get_col1_widths_hint(ctx, section)
+
     # MyPy complains because "Signature of "group" incompatible with supertype".
     # The supertype signature is (*args, **kwargs), which is compatible with
     # this provided that you pass all arguments (expect "name") as keyword arg.
@@ -522,6 +876,10 @@ def command(
         )
 
     def decorator(f: AnyCallable) -> ClickCommand:
+        with trace_construction('command', f):
+            return create_command(f)
+
+    def create_command(f: AnyCallable) -> ClickCommand:
         if hasattr(f, '__cloup_constraints__'):
             if cls and not issubclass(cls, ConstraintMixin):
                 raise TypeError(
@@ -0,0 +1,573 @@
+"""
+Implements a persistent index for fast shell completion.
+
+When shell completion is requested, Click runs the program, so the whole command
+tree is imported and constructed just to list a few names. For large CLIs, this
+is slow. :func:`complete_from_index` answers completion requests using a JSON
+index of the command tree, without importing it (the tree is imported only to
+build the index when it's missing or outdated).
+
+Note: this module must be cheap to import; in particular, Click is imported only
+when the index needs to be (re)built.
+"""
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple, cast
+
+from ._cache import PathLike, get_cache_dir, read_text, write_text_atomic
+
+INDEX_FORMAT_VERSION = 4
+
+Node = Dict[str, Any]
+
+
+class CannotComplete(Exception):
+    """Raised when a command line can't be completed using the index, e.g. when
+    a subcommand name must be normalized by a function that can't be stored in
+    the index or when the values of a parameter have a custom completion (see
+    the ``shell_complete`` argument of parameters and ``ParamType.shell_complete``).
+    Completion is then left to Click."""
+
+
+class CompletionItem(NamedTuple):
+    """A completion candidate; same fields of Click's ``CompletionItem``."""
+    value: str
+    type: str = 'plain'
+    help: Optional[str] = None
+
+
+class CompletionIndex:
+    """An index of a command tree storing all the information needed to
+    complete command lines: subcommand names and aliases, option names (and
+    the option group they belong to), types of option values and arguments.
+
+    You'll rarely use this class directly: see :func:`complete_from_index`.
+
+    :param root: the (JSON-serializable) description of the root command.
+    :param prog_name: the program name.
+    :param version: the version of the program the index was built for.
+    :param sources:
+        the modification times of the source files of the command callbacks
+        (by path) when the index was built; see :meth:`sources_are_modified`.
+    """
+
+    def __init__(
+        self, root: Node, prog_name: str, version: str = '',
+        sources: Optional[Dict[str, float]] = None,
+    ):
+        self.root = root
+        self.prog_name = prog_name
+        self.version = version
+        self.sources = sources or {}
+
+    @classmethod
+    def from_command(
+        cls, command: Any, prog_name: str, version: str = ''
+    ) -> 'CompletionIndex':
+        """Build the index of a ``click.Command`` (usually a ``Group``).
+        Lazy subcommands are loaded in the process."""
+        source_files: Set[str] = set()
+        root = _describe_command(command, prog_name, source_files=source_files)
+        return cls(root, prog_name, version, _get_mtimes(source_files))
+
+    def sources_are_modified(self) -> bool:
+        """Return ``True`` if any of the source files of the command callbacks
+        was modified (or removed) after the index was built."""
+        for path, mtime in self.sources.items():
+            try:
+                if os.stat(path).st_mtime != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    @classmethod
+    def load(cls, path: PathLike) -> Optional['CompletionIndex']:
+        """Load an index from a file. Return ``None`` if the file doesn't exist
+        or is not a valid index."""
+        text = read_text(Path(path))
+        if text is None:
+            return None
+        try:
+            data = json.loads(text)
+            if data['format'] != INDEX_FORMAT_VERSION:
+                return None
+            return cls(
+                data['root'], data['prog_name'], data['version'], data['sources'])
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, path: PathLike) -> bool:
+        """Save the index to a file. Return ``False`` if it couldn't be written."""
+        data = {
+            'format': INDEX_FORMAT_VERSION,
+            'prog_name': self.prog_name,
+            'version': self.version,
+            'sources': self.sources,
+            'root': self.root,
+        }
+        return write_text_atomic(Path(path), json.dumps(data, separators=(',', ':')))
+
+    def resolve(self, args: List[str]) -> Tuple[Node, List[str]]:
+        """Return the node of the (sub)command selected by ``args`` and the
+        arguments that follow its name."""
+        node = self.root
+        remaining: List[str] = []
+        i = 0
+        while i < len(args):
+            arg = args[i]
+            i += 1
+            if arg == '--':
+                remaining.extend(args[i - 1:])
+                break
+            if _is_option_like(arg):
+                remaining.append(arg)
+                option = _find_option(node, arg)
+                if option and option['takes_value'] and '=' not in arg:
+                    remaining.extend(args[i:i + option['nargs']])
+                    i += option['nargs']
+                continue
+            subcommand = _get_subcommand(node, arg)
+            if subcommand is None:
+                remaining.append(arg)
+            else:
+                node, remaining = subcommand, []
+        return node, remaining
+
+    def complete(self, args: List[str], incomplete: str) -> List[CompletionItem]:
+        """Return the completion candidates for ``incomplete`` given the
+        previous (complete) arguments, following the same rules of Click."""
+        node, args = self.resolve(args)
+        if incomplete == '=':
+            incomplete = ''
+        if '=' in incomplete and _is_option_like(incomplete):
+            name, _, incomplete = incomplete.partition('=')
+            args = [*args, name]
+
+        if '--' not in args and _is_option_like(incomplete):
+            return _complete_options(node, args, incomplete)
+
+        # Value of an option?
+        last_option_idx = _get_last_option_index(args)
+        if last_option_idx is not None:
+            option = _find_option(node, args[last_option_idx])
+            num_values = len(args) - last_option_idx - 1
+            if option and option['takes_value'] and num_values < option['nargs']:
+                return _complete_value(option, incomplete)
+
+        # Value of an argument?
+        argument = _get_next_argument(node, args)
+        if argument is not None and argument['type'] is not None:
+            return _complete_value(argument, incomplete)
+
+        items = [
+            CompletionItem(name, help=sub['help'] or None)
+            for name, sub in node['commands'].items()
+            if name.startswith(incomplete) and not sub['hidden']
+        ]
+        if incomplete and not incomplete[0].isalnum():
+            items.extend(_complete_options(node, args, incomplete))
+        return items
+
+
+def complete_from_index(
+    prog_name: str,
+    command: str,
+    *,
+    version: str = '',
+    complete_var: Optional[str] = None,
+    index_path: Optional[PathLike] = None,
+) -> None:
+    """If the program was invoked by the shell to complete a command line (bash,
+    zsh and fish are supported), print the completions using a
+    :class:`CompletionIndex` and exit. Otherwise, do nothing.
+
+    Call this function at the top of the module defining the entry-point of your
+    program, **before importing your command tree**:
+
+    .. code-block:: python
+
+        # mycli/__main__.py
+        from cloup import complete_from_index
+
+        complete_from_index('mycli', 'mycli.commands:cli', version='1.2.0')
+
+        from mycli.commands import cli  # not executed on completion requests
+        cli()
+
+    The index is built (importing ``command``) the first time it's needed and
+    rebuilt when the version changes or when a source file of a command callback
+    is modified; you can also build it at installation time using
+    :meth:`CompletionIndex.from_command` and :meth:`CompletionIndex.save`.
+
+    :param prog_name: the name of the program, as in ``Command.main``.
+    :param command:
+        the import path of the root command, in the format ``"module:attribute"``.
+    :param version:
+        the version of the program; an index built for another version is rebuilt.
+        Since only the source files of command callbacks are tracked, use a value
+        that changes when your command tree changes.
+    :param complete_var:
+        the environment variable used by Click to request completions;
+        by default ``_{PROG_NAME}_COMPLETE``.
+    :param index_path:
+        where to store the index; by default, in the Cloup cache directory.
+    """
+    shell = get_completion_shell(prog_name, complete_var)
+    if shell is None:
+        return
+
+    if index_path is None:
+        index_path = get_cache_dir('completion') / f'{prog_name}.json'
+    index = CompletionIndex.load(index_path)
+    if (index is None or index.version != version or index.prog_name != prog_name
+            or index.sources_are_modified()):
+        from ._commands import LazyCommand
+        root = LazyCommand(command, prog_name).load()
+        index = CompletionIndex.from_command(root, prog_name, version)
+        index.save(index_path)
+    print_completions(index, shell)
+
+
+def get_completion_shell(
+    prog_name: str, complete_var: Optional[str] = None
+) -> Optional[str]:
+    """Return the shell requesting completions for the program or ``None`` if
+    the program was not invoked to complete a command line (or if the request
+    must be handled by Click, e.g. ``bash_source``)."""
+    if complete_var is None:
+        complete_var = f'_{prog_name}_COMPLETE'.replace('-', '_').upper()
+    shell, _, action = os.environ.get(complete_var, '').partition('_')
+    if action != 'complete' or shell not in _FORMATTERS:
+        return None
+    return shell
+
+
+def print_completions(index: CompletionIndex, shell: str) -> None:
+    """Print the completions for the command line passed by ``shell`` and exit.
+    If the index can't be used (see :class:`CannotComplete`), it does nothing,
+    so that completion is left to Click."""
+    args, incomplete = _get_completion_args(shell)
+    try:
+        items = index.complete(args, incomplete)
+    except CannotComplete:
+        return
+    format_item = _FORMATTERS[shell]
+    print('\n'.join(format_item(item) for item in items))
+    sys.exit(0)
+
+
+# =============================================================================
+# Index construction
+
+def _describe_type(param: Any) -> Optional[Node]:
+    """Return the description of the values of ``param`` needed to complete
+    them or ``None`` if they can't be completed. Parameters with a custom
+    completion are marked as such, so that their completion is left to Click."""
+    import click
+    if getattr(param, '_custom_shell_complete', None) is not None:
+        return {'custom': True}
+    param_type = param.type
+    shell_complete = type(param_type).shell_complete
+    if shell_complete is click.Choice.shell_complete:
+        return {'choices': [str(choice) for choice in param_type.choices]}
+    if shell_complete is click.File.shell_complete:
+        return {'path': 'file'}
+    if shell_complete is click.Path.shell_complete:
+        is_dir = param_type.dir_okay and not param_type.file_okay
+        return {'path': 'dir' if is_dir else 'file'}
+    if shell_complete is not click.ParamType.shell_complete:
+        return {'custom': True}
+    return None
+
+
+DescribeExtra = Callable[[Any, Any], Node]
+
+
+def _describe_command(
+    cmd: Any, name: str, parent_ctx: Any = None,
+    describe_extra: Optional[DescribeExtra] = None,
+    source_files: Optional[Set[str]] = None,
+) -> Node:
+    """Return the index node of ``cmd``. ``describe_extra(cmd, ctx)`` can return
+    additional fields to store in the node (used by manifests). If given, the
+    source files of the callbacks of the command tree are added to
+    ``source_files``."""
+    import click
+    from ._commands import LazyCommand
+    if source_files is not None:
+        from ._help_cache import _get_source_file
+        source_file = _get_source_file(cmd.callback)
+        if source_file:
+            source_files.add(source_file)
+    ctx = cmd.context_class(
+        cmd, info_name=name, parent=parent_ctx, **cmd.context_settings)
+    group_by_param: Dict[int, str] = {
+        id(option): group.title
+        for group in getattr(cmd, 'option_groups', ())
+        for option in group.options
+    }
+    options: List[Node] = []
+    arguments: List[Node] = []
+    for param in cmd.get_params(ctx):
+        if isinstance(param, click.Option):
+            options.append({
+                'opts': [*param.opts, *param.secondary_opts],
+                'name': param.name,
+                'help': param.help,
+                'hidden': param.hidden,
+                'takes_value': not param.is_flag and not param.count,
+                'nargs': max(param.nargs, 1),
+                'multiple': param.multiple,
+                'group': group_by_param.get(id(param)),
+                'type': _describe_type(param),
+            })
+        elif isinstance(param, click.Argument):
+            arguments.append({
+                'name': param.name,
+                'nargs': param.nargs,
+                'type': _describe_type(param),
+            })
+
+    commands: Dict[str, Node] = {}
+    aliases: Dict[str, str] = {}
+    name_index: Dict[str, str] = {}
+    if isinstance(cmd, click.MultiCommand):
+        for sub_name in cmd.list_commands(ctx):
+            sub_cmd = cmd.get_command(ctx, sub_name)
+            if sub_cmd is None:
+                continue
+            if isinstance(sub_cmd, LazyCommand):  # in a plain click.Group
+                sub_cmd = sub_cmd.load()
+            commands[sub_name] = _describe_command(
+                sub_cmd, sub_name, ctx, describe_extra, source_files)
+        aliases = {
+            alias: sub_name
+            for alias, sub_name in getattr(cmd, 'alias2name', {}).items()
+            if sub_name in commands
+        }
+        # Keys used by cloup.Group to resolve names and aliases (casefolded if
+        # the group is case-insensitive)
+        name_index = {
+            key: sub_name
+            for key, sub_name in getattr(
+                cmd, '_name_index', {name: name for name in commands}).items()
+            if sub_name in commands
+        }
+
+    node = {
+        'help': cmd.get_short_help_str(),
+        'hidden': cmd.hidden,
+        'options': options,
+        'arguments': arguments,
+        'commands': commands,
+        'aliases': aliases,
+        'name_index': name_index,
+        'case_insensitive': getattr(cmd, 'case_insensitive', False),
+        'prefix_matching': getattr(cmd, 'prefix_matching', False),
+        # None if the function can't be referenced, False if there's no function
+        'token_normalize_func': (
+            _get_function_ref(ctx.token_normalize_func)
+            if ctx.token_normalize_func else False),
+    }
+    if describe_extra is not None:
+        node.update(describe_extra(cmd, ctx))
+    return node
+
+
+def _get_mtimes(paths: Set[str]) -> Dict[str, float]:
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[path] = os.stat(path).st_mtime
+        except OSError:
+            pass
+    return mtimes
+
+
+def _get_function_ref(function: Callable[..., Any]) -> Optional[str]:
+    """Return a reference (``"module:qualname"``) to ``function`` that can be
+    resolved with :func:`_resolve_function_ref` or ``None`` if there's none."""
+    module = getattr(function, '__module__', None) or getattr(
+        getattr(function, '__objclass__', None), '__module__', None)
+    qualname = getattr(function, '__qualname__', None)
+    if not module or not qualname or '<' in qualname:
+        return None
+    ref = f'{module}:{qualname}'
+    try:
+        if _resolve_function_ref(ref) is function:
+            return ref
+    except Exception:
+        pass
+    return None
+
+
+def _resolve_function_ref(ref: str) -> Callable[..., Any]:
+    import importlib
+    module, _, qualname = ref.partition(':')
+    obj: Any = importlib.import_module(module)
+    for attr in qualname.split('.'):
+        obj = getattr(obj, attr)
+    return cast(Callable[..., Any], obj)
+
+
+# =============================================================================
+# Completion
+
+def _is_option_like(arg: str) -> bool:
+    return bool(arg) and not arg[0].isalnum()
+
+
+def _find_option(node: Node, arg: str) -> Optional[Node]:
+    name = arg.partition('=')[0]
+    options: List[Node] = node['options']
+    for option in options:
+        if name in option['opts']:
+            return option
+    return None
+
+
+def _get_subcommand(node: Node, name: str) -> Optional[Node]:
+    resolved = _resolve_subcommand_name(node, name)
+    return None if resolved is None else node['commands'][resolved]
+
+
+def _resolve_subcommand_name(node: Node, name: str) -> Optional[str]:
+    """Return the name of the subcommand selected by ``name`` (a name, an alias
+    or, if enabled, a prefix), resolved like ``Group.resolve_command_name``.
+
+    :raises CannotComplete:
+        if the name must be normalized by a function that isn't in the index.
+    """
+    commands: Dict[str, Node] = node['commands']
+    if not commands:
+        return None
+    normalize_func_ref = node['token_normalize_func']
+    if normalize_func_ref is None:
+        raise CannotComplete('token_normalize_func is not in the index')
+    normalized = (
+        _resolve_function_ref(normalize_func_ref)(name) if normalize_func_ref
+        else name)
+    name_index: Dict[str, str] = node['name_index']
+    key = normalized.casefold() if node['case_insensitive'] else normalized
+    resolved = name_index.get(key)
+    if resolved is None and node['prefix_matching'] and key:
+        candidates = {target for k, target in name_index.items() if k.startswith(key)}
+        if len(candidates) == 1:
+            resolved = candidates.pop()
+    if resolved is None:
+        # Lookup of click.Group.resolve_command (the fallback of cloup.Group)
+        for candidate in (name, normalized):
+            if candidate in commands:
+                return candidate
+    return resolved
+
+
+def _get_last_option_index(args: List[str]) -> Optional[int]:
+    for i in range(len(args) - 1, -1, -1):
+        if _is_option_like(args[i]):
+            return i
+    return None
+
+
+def _get_next_argument(node: Node, args: List[str]) -> Optional[Node]:
+    """Return the argument the next positional value is assigned to."""
+    num_positional = 0
+    skip = 0
+    for arg in args:
+        if skip:
+            skip -= 1
+        elif _is_option_like(arg):
+            option = _find_option(node, arg)
+            if option and option['takes_value'] and '=' not in arg:
+                skip = option['nargs']
+        else:
+            num_positional += 1
+    arguments: List[Node] = node['arguments']
+    for argument in arguments:
+        nargs = argument['nargs']
+        if nargs < 0 or num_positional < nargs:
+            return argument
+        num_positional -= nargs
+    return None
+
+
+def _complete_options(
+    node: Node, args: List[str], incomplete: str
+) -> List[CompletionItem]:
+    used = {id(option) for arg in args
+            for option in [_find_option(node, arg)] if option is not None}
+    return [
+        CompletionItem(opt, help=option['help'])
+        for option in node['options']
+        if not option['hidden'] and (option['multiple'] or id(option) not in used)
+        for opt in option['opts']
+        if opt.startswith(incomplete)
+    ]
+
+
+def _complete_value(param: Node, incomplete: str) -> List[CompletionItem]:
+    param_type = param['type']
+    if param_type is None:
+        return []
+    if 'custom' in param_type:
+        raise CannotComplete(f"{param['name']} has a custom completion")
+    if 'choices' in param_type:
+        return [CompletionItem(choice) for choice in param_type['choices']
+                if choice.startswith(incomplete)]
+    return [CompletionItem(incomplete, type=param_type['path'])]
+
+
+# =============================================================================
+# Shell protocol (same as Click's)
+
+def _split_arg_string(string: str) -> List[str]:
+    import shlex
+    lex = shlex.shlex(string, posix=True)
+    lex.whitespace_split = True
+    lex.commenters = ''
+    out = []
+    try:
+        for token in lex:
+            out.append(token)
+    except ValueError:
+        # Incomplete quote or escape sequence: use the partial token as-is
+        out.append(lex.token)
+    return out
+
+
+def _get_completion_args(shell: str) -> Tuple[List[str], str]:
+    cwords = _split_arg_string(os.environ['COMP_WORDS'])
+    if shell == 'fish':
+        incomplete = os.environ['COMP_CWORD']
+        args = cwords[1:]
+        if incomplete and args and args[-1] == incomplete:
+            args.pop()
+        return args, incomplete
+    cword = int(os.environ['COMP_CWORD'])
+    args = cwords[1:cword]
+    incomplete = cwords[cword] if cword < len(cwords) else ''
+    return args, incomplete
+
+
+def _format_bash(item: CompletionItem) -> str:
+    return f'{item.type},{item.value}'
+
+
+def _format_zsh(item: CompletionItem) -> str:
+    return f"{item.type}\n{item.value}\n{item.help if item.help else '_'}"
+
+
+def _format_fish(item: CompletionItem) -> str:
+    if item.help:
+        return f'{item.type},{item.value}\t{item.help}'
+    return f'{item.type},{item.value}'
+
+
+_FORMATTERS = {
+    'bash': _format_bash,
+    'zsh': _format_zsh,
+    'fish': _format_fish,
+}
@@ -1,5 +1,6 @@
 import warnings
-from typing import Any, Callable, Dict, List, Optional, Type
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING, Type, Union
 
 import click
 
@@ -8,6 +9,10 @@ from cloup._util import coalesce, pick_non_missing
 from cloup.formatting import HelpFormatter
 from cloup.typing import MISSING, Possibly
 
+if TYPE_CHECKING:
+    from cloup._help_cache import HelpCache
+    from cloup._timings import PhaseTimings
+
 
 def _warn_if_formatter_settings_conflict(
     ctx_key: str,
@@ -56,6 +61,20 @@ class Context(click.Context):
     :param check_constraints_consistency:
         enable additional checks for constraints which detects mistakes of the
         developer (see :meth:`cloup.Constraint.check_consistency`).
+    :param cache_constraints_consistency:
+        if True, once the constraints of a command pass the consistency checks,
+        the outcome is stored in the Cloup cache directory, so that next runs of
+        the program can skip them until the parameter declarations change
+        (consistency checks are anyway done only once per command per process).
+    :param help_cache:
+        a :class:`~cloup.HelpCache` used to cache rendered help pages; disabled
+        by default.
+    :param timings:
+        if ``True`` (or ``"-"``), record the time spent in each processing phase
+        by this context and its subcontexts (see :class:`~cloup.PhaseTimings`) and
+        print the timing tree to stderr when ``main()`` returns; if a file path,
+        write it to that file in JSON format. Meaningful only for the root context.
+        If not set, the ``CLOUP_TIMINGS`` environment variable is used.
     :param formatter_settings:
         keyword arguments forwarded to :class:`HelpFormatter` in ``make_formatter``.
         This args are merged with those of the (eventual) parent context and then
@@ -74,9 +93,13 @@ class Context(click.Context):
         show_subcommand_aliases: Optional[bool] = None,
         show_constraints: Optional[bool] = None,
         check_constraints_consistency: Optional[bool] = None,
+        cache_constraints_consistency: Optional[bool] = None,
+        help_cache: Optional['HelpCache'] = None,
+        timings: Union[None, bool, str] = None,
         formatter_settings: Dict[str, Any] = {},
         **ctx_kwargs: Any,
     ):
+        start_time = perf_counter()
         super().__init__(*ctx_args, **ctx_kwargs)
 
         self.align_option_groups = coalesce(
@@ -99,6 +122,14 @@ class Context(click.Context):
             check_constraints_consistency,
             getattr(self.parent, 'check_constraints_consistency', None)
         )
+        self.cache_constraints_consistency = coalesce(
+            cache_constraints_consistency,
+            getattr(self.parent, 'cache_constraints_consistency', None)
+        )
+        self.help_cache: Optional['HelpCache'] = coalesce(
+            help_cache,
+            getattr(self.parent, 'help_cache', None),
+        )
 
         if cloup.warnings.formatter_settings_conflict:
             _warn_if_formatter_settings_conflict(
@@ -115,6 +146,20 @@ class Context(click.Context):
             **formatter_settings,
         }
 
+        #: The timings of this context (see :class:`~cloup.PhaseTimings`) or
+        #: ``None`` if timings are disabled.
+        self.phase_timings: Optional['PhaseTimings'] = None
+        parent_timings = getattr(self.parent, 'phase_timings', None)
+        if parent_timings is not None:
+            self.phase_timings = parent_timings.add_child(self.info_name)
+        elif self.parent is None:
+            from cloup._timings import get_timings_target, start_root_timings
+            target = get_timings_target(timings)
+            if target is not None:
+                self.phase_timings = start_root_timings(self.info_name, target)
+        if self.phase_timings is not None:
+            self.phase_timings.add('construction', perf_counter() - start_time)
+
     def get_formatter_settings(self) -> Dict[str, Any]:
         return {
             'width': self.terminal_width,
@@ -125,6 +170,8 @@ class Context(click.Context):
 
     def make_formatter(self) -> HelpFormatter:
         opts = self.get_formatter_settings()
+        if opts.get('sink') is not None and 'color' not in opts:
+            opts['color'] = self.color
         return self.formatter_class(**opts)
 
     @staticmethod
@@ -146,6 +193,9 @@ class Context(click.Context):
         show_subcommand_aliases: Possibly[bool] = MISSING,
         show_constraints: Possibly[bool] = MISSING,
         check_constraints_consistency: Possibly[bool] = MISSING,
+        cache_constraints_consistency: Possibly[bool] = MISSING,
+        help_cache: Possibly[Optional['HelpCache']] = MISSING,
+        timings: Possibly[Union[None, bool, str]] = MISSING,
         formatter_settings: Possibly[Dict[str, Any]] = MISSING,
     ) -> Dict[str, Any]:
         """Utility method for creating a ``context_settings`` dictionary.
@@ -214,6 +264,20 @@ class Context(click.Context):
         :param check_constraints_consistency:
             enable additional checks for constraints which detects mistakes of the
             developer (see :meth:`cloup.Constraint.check_consistency`).
+        :param cache_constraints_consistency:
+            if True, once the constraints of a command pass the consistency checks,
+            the outcome is stored in the Cloup cache directory, so that next runs of
+            the program can skip them until the parameter declarations change
+            (consistency checks are anyway done only once per command per process).
+        :param help_cache:
+            a :class:`~cloup.HelpCache` used to cache rendered help pages; disabled
+            by default.
+        :param timings:
+            if ``True`` (or ``"-"``), record the time spent in each processing phase
+            by this context and its subcontexts (see :class:`~cloup.PhaseTimings`)
+            and print the timing tree to stderr when ``main()`` returns; if a file
+            path, write it to that file in JSON format. Meaningful only for the root
+            context. If not set, the ``CLOUP_TIMINGS`` environment variable is used.
         :param formatter_settings:
             keyword arguments forwarded to :class:`HelpFormatter` in ``make_formatter``.
             This args are merged with those of the (eventual) parent context and then
@@ -0,0 +1,195 @@
+"""
+Implements an opt-in cache of rendered help pages.
+"""
+import dataclasses as dc
+import inspect
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Set, Union
+from weakref import WeakKeyDictionary
+
+import click
+
+from ._cache import PathLike, get_cache_dir, hash_key, read_text, write_text_atomic
+from ._util import make_repr
+
+# Context attributes that (may) affect the rendering of a help page.
+_CTX_ATTRS_AFFECTING_HELP = (
+    'help_option_names', 'show_default', 'align_option_groups', 'align_sections',
+    'show_subcommand_aliases', 'show_constraints',
+)
+
+
+class HelpCache:
+    """A cache of rendered help pages, enabled by passing an instance of this
+    class as ``help_cache`` context setting.
+
+    A cached page is identified by the command (by its path, for on-disk
+    pages), the formatter settings (see :meth:`cloup.Context.get_formatter_settings`,
+    including the theme), the context settings affecting the help page and
+    the terminal width.
+
+    Pages are always cached in memory. If ``directory`` is provided, they
+    are also stored on disk, so that they can be reused by other processes
+    (e.g. by shell wrappers and documentation generators calling ``--help``
+    many times). On-disk pages are invalidated when the version of Cloup
+    or the given ``version`` change or when the source file of the command
+    (or of one of its direct subcommands) is modified.
+
+    .. warning::
+        The help page of a command is assumed to depend only on the things
+        listed above. Don't enable this cache if your help pages are dynamic
+        (e.g. if they show default values taken from environment variables).
+        Also note that pages are not stored on disk if a formatter setting
+        can't be described in the same way by all processes (e.g. a theme
+        containing lambda functions); use :class:`Style` and module-level
+        functions instead.
+
+    :param directory:
+        if ``True``, on-disk pages are stored in the (version-stamped) Cloup
+        cache directory; if a path, in that directory. If ``None`` (default),
+        pages are cached in memory only.
+    :param version:
+        the version of your application, included in the keys of on-disk pages.
+    """
+
+    def __init__(
+        self, directory: Union[None, bool, PathLike] = None,
+        version: str = '',
+    ):
+        if directory is True:
+            self.directory: Optional[Path] = get_cache_dir('help')
+        elif directory is None or directory is False:
+            self.directory = None
+        else:
+            self.directory = Path(directory)
+        self.version = version
+        # Pages of each command keyed by make_key()
+        self._pages: 'WeakKeyDictionary[click.Command, Dict[str, str]]' = (
+            WeakKeyDictionary())
+
+    def make_key(self, ctx: click.Context) -> str:
+        """Return the key identifying the help page of ``ctx.command``. Settings
+        are described by value, so that keys are the same in all processes
+        when possible."""
+        formatter_settings: Dict[str, Any] = (
+            getattr(ctx, 'get_formatter_settings', dict)())
+        ctx_settings = {
+            attr: getattr(ctx, attr, None) for attr in _CTX_ATTRS_AFFECTING_HELP
+        }
+        terminal_width = (
+            click.formatting.FORCED_WIDTH
+            or shutil.get_terminal_size((80, 100)).columns
+        )
+        return repr((
+            ctx.command_path,
+            _describe(formatter_settings),
+            _describe(ctx_settings),
+            terminal_width,
+        ))
+
+    def get_or_render(self, ctx: click.Context, render: Callable[[], str]) -> str:
+        """Return the cached help page of ``ctx.command`` or render it calling
+        ``render`` and cache it."""
+        key = self.make_key(ctx)
+        pages = self._pages.setdefault(ctx.command, {})
+        page = pages.get(key)
+        if page is not None:
+            return page
+
+        path = self._get_page_path(key, ctx.command)
+        if path is not None:
+            page = read_text(path)
+        if page is None:
+            page = render()
+            if path is not None:
+                write_text_atomic(path, page)
+        pages[key] = page
+        return page
+
+    def clear(self) -> None:
+        """Clear the in-memory cache and delete all the on-disk pages."""
+        self._pages.clear()
+        if self.directory is not None and self.directory.is_dir():
+            for path in self.directory.glob('*.txt'):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    def _get_page_path(self, key: str, cmd: click.Command) -> Optional[Path]:
+        # Object representations containing memory addresses are different in
+        # each process: the corresponding page would never be read again.
+        if self.directory is None or ' at 0x' in key:
+            return None
+        mtimes = sorted(_get_source_mtimes(cmd).items())
+        disk_key = repr((self.version, key, mtimes))
+        return self.directory / (hash_key(disk_key) + '.txt')
+
+    def __repr__(self) -> str:
+        return make_repr(self, directory=self.directory, version=self.version)
+
+
+def _describe(value: Any) -> Any:
+    """Return a description of ``value`` made of builtin types, whose
+    representation is the same in all processes if possible. Functions and
+    classes are described by qualified name, named tuples, dataclasses (e.g.
+    :class:`~cloup.Style`) and other objects by their fields. Objects that can't
+    be described (e.g. lambda functions) are represented by their ``repr``,
+    which usually contains a memory address."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    fields = getattr(value, '_fields', None)
+    if isinstance(value, tuple) and fields is not None:
+        return (_describe(type(value)), _describe(dict(zip(fields, value))))
+    if isinstance(value, (list, tuple)):
+        return tuple(_describe(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted(
+            ((str(k), _describe(v)) for k, v in value.items()), key=lambda kv: kv[0]))
+    if inspect.isfunction(value) or inspect.isbuiltin(value) or inspect.isclass(value):
+        qualname = getattr(value, '__qualname__', '<unknown>')
+        if '<' not in qualname:
+            return f'{value.__module__}.{qualname}'
+    elif dc.is_dataclass(value):
+        return (_describe(type(value)), tuple(
+            (f.name, _describe(getattr(value, f.name)))
+            for f in dc.fields(value) if f.compare))
+    elif (hasattr(value, '__dict__')
+          and getattr(type(value), '__repr__') is object.__repr__):
+        return (_describe(type(value)), _describe(vars(value)))
+    return repr(value)
+
+
+def _iter_help_related_commands(cmd: click.Command) -> Iterator[click.Command]:
+    yield cmd
+    # The help page of a group contains the short help of its subcommands.
+    # LazyCommand's are skipped: their short help is defined together with the group.
+    from ._commands import LazyCommand
+    commands: Dict[str, click.Command] = getattr(cmd, 'commands', {})
+    for subcommand in commands.values():
+        if not isinstance(subcommand, LazyCommand):
+            yield subcommand
+
+
+def _get_source_file(callback: Optional[Callable[..., Any]]) -> Optional[str]:
+    if callback is None:
+        return None
+    code = getattr(inspect.unwrap(callback), '__code__', None)
+    return None if code is None else code.co_filename
+
+
+def _get_source_mtimes(cmd: click.Command) -> Dict[str, float]:
+    files: Set[str] = set()
+    for command in _iter_help_related_commands(cmd):
+        source_file = _get_source_file(command.callback)
+        if source_file:
+            files.add(source_file)
+    mtimes = {}
+    for file in files:
+        try:
+            mtimes[file] = os.stat(file).st_mtime
+        except OSError:
+            pass
+    return mtimes
@@ -0,0 +1,550 @@
+"""
+Implements static manifests of command trees and a manifest-driven bootstrap.
+
+A manifest is a JSON (or msgpack) file describing a fully built command tree:
+subcommands, aliases, sections, option groups (with their constraints), options,
+arguments, hidden flags, short help, formatter settings and the help page of
+each command, recorded in a width-independent way (see ``_RecordingFormatter``).
+:func:`run_from_manifest` uses it to serve shell completions, help pages and
+"no such command" errors without importing the command tree.
+"""
+import dataclasses as dc
+import json
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+import click
+
+from ._cache import PathLike, write_bytes_atomic, write_text_atomic
+from ._completion import (
+    CompletionIndex, Node, _describe_command, _find_option, _get_subcommand,
+    _is_option_like, _resolve_subcommand_name, get_completion_shell,
+    print_completions,
+)
+from ._util import identity
+from .formatting import HelpFormatter, HelpSection
+from .styling import HelpTheme, IStyle, Style
+
+MANIFEST_FORMAT_VERSION = 3
+
+# A recorded call of a formatter method: [method_name, [args...]]
+Call = List[Any]
+
+
+class Manifest:
+    """A static description of a command tree.
+
+    The manifest of a command is created with :meth:`from_command` and saved
+    with :meth:`save`. The format (JSON or msgpack) is chosen based on the
+    extension of the file; msgpack requires the ``msgpack`` package.
+
+    Help pages are recorded as a sequence of calls to the methods of
+    :class:`HelpFormatter`, which are replayed to render the page, so they
+    adapt to the terminal width like the original ones. Definitions whose second
+    column is a function are resolved when the manifest is created.
+
+    Context and formatter settings that can't be serialized (e.g. a
+    ``token_normalize_func`` or a style with a ``text_transform``) are not
+    stored; the manifest records that the settings of the command are
+    incomplete, so that :func:`run_from_manifest` leaves the command (and its
+    subcommands) to the real command tree.
+
+    :param root: the (serializable) description of the root command.
+    :param prog_name: the program name.
+    :param import_path:
+        the import path of the root command in the format ``"module:attribute"``.
+    :param version: the version of the program.
+    """
+
+    def __init__(
+        self, root: Node, prog_name: str, import_path: str, version: str = ''
+    ):
+        self.root = root
+        self.prog_name = prog_name
+        self.import_path = import_path
+        self.version = version
+
+    @classmethod
+    def from_command(
+        cls, command: click.Command, prog_name: str, import_path: str,
+        version: str = '',
+    ) -> 'Manifest':
+        """Create the manifest of ``command``. Lazy subcommands are loaded."""
+        root = _describe_command(command, prog_name, describe_extra=_describe_extra)
+        return cls(root, prog_name, import_path, version)
+
+    @classmethod
+    def load(cls, path: PathLike) -> 'Manifest':
+        """Load a manifest from a file.
+
+        :raises OSError: if the file can't be read.
+        :raises ValueError: if the file is not a valid manifest.
+        """
+        path = Path(path)
+        if _is_msgpack(path):
+            data = _import_msgpack().unpackb(path.read_bytes())
+        else:
+            data = json.loads(path.read_text(encoding='utf-8'))
+        if not isinstance(data, dict) or data.get('format') != MANIFEST_FORMAT_VERSION:
+            raise ValueError(f'{str(path)!r} is not a valid (or up-to-date) manifest')
+        return cls(data['root'], data['prog_name'], data['import_path'],
+                   data['version'])
+
+    def save(self, path: PathLike) -> None:
+        """Save the manifest to a file (atomically).
+
+        :raises OSError: if the file can't be written.
+        """
+        path = Path(path)
+        data = {
+            'format': MANIFEST_FORMAT_VERSION,
+            'prog_name': self.prog_name,
+            'import_path': self.import_path,
+            'version': self.version,
+            'root': self.root,
+        }
+        if _is_msgpack(path):
+            written = write_bytes_atomic(path, _import_msgpack().packb(data))
+        else:
+            written = write_text_atomic(path, json.dumps(data, separators=(',', ':')))
+        if not written:
+            raise OSError(f"couldn't write the manifest to {str(path)!r}")
+
+    def get_completion_index(self) -> CompletionIndex:
+        return CompletionIndex(self.root, self.prog_name, self.version)
+
+    def make_proxy(self, names: Sequence[str] = ()) -> click.Context:
+        """Return a context for a proxy of the command selected by ``names``
+        (subcommand names, starting from the root). A proxy can render the help
+        and the usage of the corresponding command and its parent contexts are
+        proxies as well. Proxies can't be invoked."""
+        node = self.root
+        ctx = _make_proxy_context(node, self.prog_name)
+        for name in names:
+            sub_node = _get_subcommand(node, name)
+            if sub_node is None:
+                raise KeyError(f'no such command: {name!r}')
+            ctx = _make_proxy_context(sub_node, name, parent=ctx)
+            node = sub_node
+        return ctx
+
+
+def run_from_manifest(
+    path: PathLike,
+    args: Optional[Sequence[str]] = None,
+    *,
+    version: str = '',
+    prog_name: Optional[str] = None,
+    complete_var: Optional[str] = None,
+) -> Any:
+    """Run a program using its manifest (see :class:`Manifest`), which is
+    used to serve (without importing the command tree):
+
+    - shell completion requests (like :func:`complete_from_index`)
+    - the help of any (sub)command, including groups invoked with no arguments
+      when ``no_args_is_help`` is enabled
+    - "no such command" errors (including the suggestions).
+
+    Otherwise, the root command is imported and invoked as usual, so only the
+    modules needed to build it are imported. Use :class:`LazyCommand` for
+    subcommands defined in other modules, so that only the module of the
+    selected subcommand is imported.
+
+    .. code-block:: python
+
+        # mycli/__main__.py
+        from cloup import run_from_manifest
+
+        run_from_manifest(Path(__file__).parent / 'manifest.json', version='1.2.0')
+
+    :param path: the path to the manifest.
+    :param args: the command line arguments; by default, ``sys.argv[1:]``.
+    :param version:
+        the version of the program; if the manifest was created for another
+        version, it's outdated, so the root command is imported and invoked
+        as usual.
+    :param prog_name: the program name; by default, the one in the manifest.
+    :param complete_var: see :func:`complete_from_index`.
+    """
+    manifest = Manifest.load(path)
+    if prog_name is not None:
+        manifest.prog_name = prog_name
+    is_up_to_date = manifest.version == version
+    shell = get_completion_shell(manifest.prog_name, complete_var)
+    if shell is not None and is_up_to_date:
+        print_completions(manifest.get_completion_index(), shell)
+
+    args = list(sys.argv[1:] if args is None else args)
+    names, show_help, bad_name = (
+        _scan_args(manifest.root, args) if is_up_to_date else ([], False, None))
+    if show_help or bad_name is not None:
+        ctx = manifest.make_proxy(names)
+        if show_help:
+            click.echo(ctx.get_help(), color=ctx.color)
+            sys.exit(0)
+        ctx.resilient_parsing = False  # otherwise, Click doesn't raise errors
+        try:
+            ctx.command.resolve_command(ctx, [bad_name])  # type: ignore
+        except click.UsageError as error:
+            error.show()
+            sys.exit(error.exit_code)
+
+    from ._commands import LazyCommand
+    command = LazyCommand(manifest.import_path, manifest.prog_name).load()
+    return command.main(args, prog_name=manifest.prog_name)
+
+
+def _scan_args(root: Node, args: List[str]) -> Tuple[List[str], bool, Optional[str]]:
+    """Find the command selected by ``args``. Return a tuple
+    ``(names, show_help, bad_name)``, where ``names`` are the names of the
+    subcommands in the path to it, ``show_help`` tells if its help must be shown,
+    and ``bad_name`` is a subcommand name that can't be resolved (if any).
+    Cases that can't be handled using the manifest, including commands whose
+    settings couldn't be stored in the manifest, are left to Click."""
+    node = root
+    names: List[str] = []
+    if not node['settings_are_complete']:
+        return names, False, None
+    num_args = 0  # number of args of the current command
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        i += 1
+        num_args += 1
+        if arg == '--':
+            break
+        if arg in node['help_option_names']:
+            return names, True, None
+        if _is_option_like(arg):
+            option = _find_option(node, arg)
+            if option and option['takes_value'] and '=' not in arg:
+                i += option['nargs']
+            continue
+        if not node['is_group'] or node['arguments']:
+            continue
+        name = _resolve_subcommand_name(node, arg)
+        if name is None:
+            return names, False, arg
+        node = node['commands'][name]
+        names.append(name)
+        if not node['settings_are_complete']:
+            return names, False, None
+        num_args = 0
+    show_help = node['no_args_is_help'] and num_args == 0
+    return names, show_help, None
+
+
+# =============================================================================
+# Manifest creation
+
+def _describe_extra(cmd: click.Command, ctx: click.Context) -> Node:
+    from ._commands import Command
+
+    recorder = _RecordingFormatter()
+    cmd.format_help(ctx, recorder)
+    formatter_settings = (
+        ctx.get_formatter_settings() if hasattr(ctx, 'get_formatter_settings')
+        else {})
+    # Formatter settings are dumped separately (merged with those of parents)
+    dumped_ctx_settings, ctx_settings_are_complete = _dump_simple_values({
+        key: value for key, value in cmd.context_settings.items()
+        if key != 'formatter_settings'})
+    dumped_formatter_settings, formatter_settings_are_complete = (
+        _dump_formatter_settings(formatter_settings))
+    extra: Node = {
+        'name': cmd.name,
+        'own_aliases': list(getattr(cmd, 'aliases', [])),
+        # Insertion order of subcommands (list_commands() sorts them)
+        'command_order': list(getattr(cmd, 'commands', {})),
+        'is_group': isinstance(cmd, click.MultiCommand),
+        'no_args_is_help': cmd.no_args_is_help,
+        'case_insensitive': getattr(cmd, 'case_insensitive', False),
+        'prefix_matching': getattr(cmd, 'prefix_matching', False),
+        'help_option_names': list(ctx.help_option_names),
+        'context_settings': dumped_ctx_settings,
+        'formatter_settings': dumped_formatter_settings,
+        # If False, the command is left to the real command tree
+        'settings_are_complete': (
+            ctx_settings_are_complete and formatter_settings_are_complete
+            and recorder.is_complete),
+        'help_page': recorder.calls,
+    }
+    if isinstance(cmd, Command):
+        extra['option_groups'] = [
+            {
+                'title': group.title,
+                'help': group.help,
+                'hidden': group.hidden,
+                'constraint': _dump_constraint(group.constraint, ctx),
+                'options': [option.name for option in group.options],
+            }
+            for group in getattr(cmd, 'option_groups', ())
+        ]
+    list_sections = getattr(cmd, 'list_sections', None)
+    if list_sections is not None:
+        extra['sections'] = [
+            {'title': section.title, 'commands': list(section.commands)}
+            for section in list_sections(ctx)
+        ]
+    return extra
+
+
+def _dump_constraint(constraint: Any, ctx: click.Context) -> Optional[Node]:
+    if constraint is None:
+        return None
+    return {'help': constraint.help(ctx), 'repr': repr(constraint)}
+
+
+def _is_simple_value(value: Any) -> bool:
+    if isinstance(value, (list, tuple)):
+        return all(_is_simple_value(item) for item in value)
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def _dump_simple_values(settings: Mapping[str, Any]) -> Tuple[Node, bool]:
+    """Return the settings with a simple (serializable) value and whether all
+    the other settings are ``None``."""
+    dumped = {}
+    complete = True
+    for key, value in settings.items():
+        if value is None:
+            continue
+        if _is_simple_value(value):
+            dumped[key] = value
+        else:
+            complete = False
+    return dumped, complete
+
+
+def _dump_formatter_settings(settings: Dict[str, Any]) -> Tuple[Node, bool]:
+    """Like :func:`_dump_simple_values` but it also stores the ``Style`` objects
+    of the theme (without text transformations, which make the result incomplete)."""
+    theme = settings.get('theme')
+    dumped, complete = _dump_simple_values(
+        {key: value for key, value in settings.items() if key != 'theme'})
+    if isinstance(theme, HelpTheme):
+        dumped['theme'] = dumped_theme = {}
+        for field, style in theme._asdict().items():
+            if isinstance(style, Style):
+                dumped_theme[field] = _dump_style(style)
+                complete = complete and style.text_transform is None
+            elif style is not identity:
+                complete = False
+    elif theme is not None:
+        complete = False
+    return dumped, complete
+
+
+def _dump_style(style: Style) -> Node:
+    return {field.name: getattr(style, field.name)
+            for field in dc.fields(style)
+            if field.init and field.name != 'text_transform'
+            and getattr(style, field.name) is not None}
+
+
+def _load_formatter_settings(dumped: Node) -> Dict[str, Any]:
+    settings = dict(dumped)
+    if 'theme' in settings:
+        settings['theme'] = HelpTheme(**{
+            field: Style(**kwargs) for field, kwargs in settings['theme'].items()
+        })
+    return settings
+
+
+class _HelpText:
+    """Stands for a command in ``HelpFormatter.write_command_help_text``."""
+    deprecated = False
+
+    def __init__(self, help: str):
+        self.help = help
+
+
+class _RecordingFormatter(HelpFormatter):
+    """A formatter that, instead of writing a help page, records the calls to
+    its high-level methods (with serializable arguments), so that they can be
+    replayed on a real formatter by :func:`_replay`. ``is_complete`` is set to
+    ``False`` if an argument couldn't be recorded (e.g. a style function)."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.calls: List[Call] = []
+        self.is_complete = True
+
+    def _record(self, method: str, *args: Any) -> None:
+        self.calls.append([method, list(args)])
+
+    def write(self, *strings: str) -> None:
+        self._record('write', *strings)
+
+    def write_usage(
+        self, prog: str, args: str = '', prefix: Optional[str] = None
+    ) -> None:
+        self._record('write_usage', prog, args, prefix)
+
+    def write_aliases(self, aliases: Sequence[str]) -> None:
+        self._record('write_aliases', list(aliases))
+
+    def write_command_help_text(self, cmd: click.Command) -> None:
+        help_text = cmd.help or ''
+        if cmd.deprecated:
+            help_text = '(DEPRECATED) ' + help_text
+        self._record('write_command_help_text', help_text)
+
+    def write_heading(self, heading: str, newline: bool = True) -> None:
+        self._record('write_heading', heading, newline)
+
+    def write_paragraph(self) -> None:
+        self._record('write_paragraph')
+
+    def write_text(self, text: str, style: IStyle = identity) -> None:
+        if style is identity:
+            self._record('write_text', text)
+        elif isinstance(style, Style):
+            self._record('write_styled_text', text, _dump_style(style))
+            self.is_complete = self.is_complete and style.text_transform is None
+        else:
+            self._record('write_text', text)
+            self.is_complete = False
+
+    def write_many_sections(
+        self, sections: Sequence[HelpSection], aligned: bool = True
+    ) -> None:
+        self._record('write_many_sections', [_dump_section(s) for s in sections],
+                     aligned)
+
+    def write_section(self, s: HelpSection, col1_width: Optional[int] = None) -> None:
+        self._record('write_section', _dump_section(s), col1_width)
+
+    def write_dl(
+        self, rows: Sequence[Tuple[str, Any]], *args: Any, **kwargs: Any
+    ) -> None:
+        self._record('write_dl', _dump_definitions(rows), *args)
+
+    def write_epilog(self, epilog: str) -> None:
+        self._record('write_epilog', epilog)
+
+    def indent(self) -> None:
+        self._record('indent')
+
+    def dedent(self) -> None:
+        self._record('dedent')
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        self._record('section_begin', name)
+        yield
+        self._record('section_end')
+
+
+def _dump_definitions(rows: Sequence[Tuple[str, Any]]) -> List[List[str]]:
+    # Functions in the 2nd column are resolved using the default width
+    width = HelpFormatter().width
+    return [[row[0], row[1](width) if callable(row[1]) else row[1]] for row in rows]
+
+
+def _dump_section(section: HelpSection) -> Node:
+    return {
+        'heading': section.heading,
+        'definitions': _dump_definitions(section.definitions),
+        'help': section.help,
+        'constraint': section.constraint,
+    }
+
+
+def _load_section(dumped: Node) -> HelpSection:
+    return HelpSection(
+        heading=dumped['heading'],
+        definitions=[(row[0], row[1]) for row in dumped['definitions']],
+        help=dumped['help'],
+        constraint=dumped['constraint'],
+    )
+
+
+def _replay(
+    calls: List[Call], formatter: HelpFormatter, command_path: str,
+    usage_only: bool = False,
+) -> None:
+    open_sections: List[Any] = []
+    for method, args in calls:
+        if method == 'write_usage':
+            formatter.write_usage(command_path, *args[1:])
+        elif usage_only:
+            continue
+        elif method == 'write_command_help_text':
+            formatter.write_command_help_text(_HelpText(args[0]))  # type: ignore
+        elif method == 'write_many_sections':
+            formatter.write_many_sections([_load_section(s) for s in args[0]], args[1])
+        elif method == 'write_section':
+            formatter.write_section(_load_section(args[0]), args[1])
+        elif method == 'write_styled_text':
+            formatter.write_text(args[0], Style(**args[1]))
+        elif method == 'write_dl':
+            formatter.write_dl([tuple(row) for row in args[0]], *args[1:])
+        elif method == 'section_begin':
+            section = formatter.section(args[0])
+            section.__enter__()
+            open_sections.append(section)
+        elif method == 'section_end':
+            open_sections.pop().__exit__(None, None, None)
+        else:
+            getattr(formatter, method)(*args)
+
+
+# =============================================================================
+# Proxies
+
+def _make_proxy_context(
+    node: Node, info_name: str, parent: Optional[click.Context] = None
+) -> click.Context:
+    from ._commands import Command, Group
+
+    class Proxy(Group if node['is_group'] else Command):  # type: ignore
+        def format_usage(self, ctx: click.Context, formatter: Any) -> None:
+            _replay(node['help_page'], formatter, ctx.command_path, usage_only=True)
+
+        def format_help(self, ctx: click.Context, formatter: Any) -> None:
+            _replay(node['help_page'], formatter, ctx.command_path)
+
+        def invoke(self, ctx: click.Context) -> Any:
+            raise RuntimeError('manifest proxies cannot be invoked')
+
+    group_kwargs = (
+        dict(case_insensitive=node['case_insensitive'],
+             prefix_matching=node['prefix_matching'])
+        if node['is_group'] else {})
+    proxy = Proxy(
+        **group_kwargs,
+        name=node['name'] or info_name,
+        aliases=node['own_aliases'],
+        hidden=node['hidden'],
+        short_help=node['help'],
+        context_settings=dict(node['context_settings']),
+        formatter_settings=_load_formatter_settings(node['formatter_settings']),
+    )
+    if node['is_group']:
+        # Subcommands are added in the original order, with their aliases, so
+        # that "Did you mean" suggestions are the same
+        for name in node['command_order']:
+            sub_node = node['commands'].get(name)
+            if sub_node is not None:
+                sub_cmd = Command(name, aliases=sub_node['own_aliases'],
+                                  hidden=sub_node['hidden'])
+                proxy.add_command(sub_cmd, name)
+    ctx: click.Context = proxy.make_context(
+        info_name, [], parent=parent, resilient_parsing=True)
+    return ctx
+
+
+def _import_msgpack() -> Any:
+    try:
+        import msgpack
+    except ImportError:
+        raise ImportError(
+            'the msgpack format requires the msgpack package: pip install msgpack')
+    return msgpack
+
+
+def _is_msgpack(path: Path) -> bool:
+    return path.suffix == '.msgpack'
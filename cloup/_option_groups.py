@@ -1,9 +1,11 @@
 """
 Implements the "option groups" feature.
 """
+import sys
 from collections import defaultdict
 from typing import (
-    Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, overload,
+    Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence,
+    Tuple, overload,
 )
 
 import click
@@ -11,13 +13,21 @@ from click import Option, Parameter
 
 import cloup
 from cloup._params import option
+from cloup._tracing import trace_construction
 from cloup._util import first_bool, make_repr
 from cloup.constraints import Constraint
 from cloup.formatting import HelpSection, ensure_is_cloup_formatter
 from cloup.typing import Decorator, F
 
+if sys.version_info[:2] >= (3, 8):
+    from typing import SupportsIndex
+else:  # pragma: no cover
+    from typing_extensions import SupportsIndex
+
 
 class OptionGroup:
+    __slots__ = ('title', 'help', '_options', 'constraint', 'hidden')
+
     def __init__(self, title: str,
                  help: Optional[str] = None,
                  constraint: Optional[Constraint] = None,
@@ -89,6 +99,81 @@ def get_option_group_of(param: click.Option) -> Optional[OptionGroup]:
     return getattr(param, 'group', None)
 
 
+class ParamList(List[click.Parameter]):
+    """The list of parameters of a command. It's a ``list`` that counts its
+    modifications in ``version``, so that the information derived from the
+    parameters (e.g. their partition in option groups) can be cached and
+    recomputed only when the list changes."""
+
+    __slots__ = ('version',)
+
+    def __init__(self, params: Iterable[click.Parameter] = (), version: int = 0):
+        super().__init__(params)
+        self.version = version
+
+    def __reduce__(self) -> Any:
+        return ParamList, (list(self), self.version)
+
+    def append(self, param: click.Parameter) -> None:
+        super().append(param)
+        self.version += 1
+
+    def extend(self, params: Iterable[click.Parameter]) -> None:
+        super().extend(params)
+        self.version += 1
+
+    def insert(self, index: SupportsIndex, param: click.Parameter) -> None:
+        super().insert(index, param)
+        self.version += 1
+
+    def remove(self, param: click.Parameter) -> None:
+        super().remove(param)
+        self.version += 1
+
+    def pop(self, index: SupportsIndex = -1) -> click.Parameter:
+        self.version += 1
+        return super().pop(index)
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        super().sort(*args, **kwargs)
+        self.version += 1
+
+    def reverse(self) -> None:
+        super().reverse()
+        self.version += 1
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        super().__setitem__(index, value)
+        self.version += 1
+
+    def __delitem__(self, index: Any) -> None:
+        super().__delitem__(index)
+        self.version += 1
+
+    def __iadd__(self, params: Iterable[click.Parameter]) -> 'ParamList':  # type: ignore
+        self.extend(params)
+        return self
+
+    def __imul__(self, n: SupportsIndex) -> 'ParamList':
+        super().__imul__(n)
+        self.version += 1
+        return self
+
+
+class _ParamsPartition(NamedTuple):
+    """The parameters of a command partitioned by kind and option group."""
+    version: int
+    arguments: List[click.Argument]
+    option_groups: List[OptionGroup]
+    ungrouped_options: List[click.Option]
+    visible_option_groups: List[OptionGroup]
+    arguments_have_help: bool
+
+
 # noinspection PyMethodMayBeStatic
 class OptionGroupMixin:
     """Implements support for:
@@ -131,23 +216,54 @@ class OptionGroupMixin:
             keyword arguments forwarded to the next class in the MRO
         """
         super().__init__(*args, **kwargs)
-
         self.align_option_groups = align_option_groups
-        params = kwargs.get('params') or []
-        arguments, option_groups, ungrouped_options = self._group_params(params)
 
-        self.arguments = arguments
+    @property
+    def params(self) -> List[click.Parameter]:
+        """The parameters of the command, stored in a ``ParamList``."""
+        return self._params
+
+    @params.setter
+    def params(self, params: Iterable[click.Parameter]) -> None:
+        self._params = ParamList(params)
+        self._params_partition: Optional[_ParamsPartition] = None
+
+    def _get_params_partition(self) -> _ParamsPartition:
+        """Return the partition of ``self.params``, computing it only if the
+        parameters changed since the last call."""
+        partition = self._params_partition
+        params = self._params
+        if partition is None or partition.version != params.version:
+            arguments, option_groups, ungrouped_options = self._group_params(params)
+            self._params_partition = partition = _ParamsPartition(
+                version=params.version,
+                arguments=arguments,
+                option_groups=option_groups,
+                ungrouped_options=ungrouped_options,
+                visible_option_groups=[g for g in option_groups if not g.hidden],
+                arguments_have_help=any(getattr(a, 'help', None) for a in arguments),
+            )
+        return partition
+
+    @property
+    def arguments(self) -> List[click.Argument]:
+        """List of all arguments."""
+        return self._get_params_partition().arguments
 
-        self.option_groups = option_groups
+    @property
+    def option_groups(self) -> List[OptionGroup]:
         """List of all option groups, except the "default option group"."""
+        return self._get_params_partition().option_groups
 
-        self.ungrouped_options = ungrouped_options
+    @property
+    def ungrouped_options(self) -> List[click.Option]:
         """List of options not explicitly assigned to an user-defined option group.
         These options will be included in the "default option group".
         **Note:** this list does not include options added automatically by Click
         based on context settings, like the ``--help`` option; use the
         :meth:`get_ungrouped_options` method if you need the real full list
         (which needs a ``Context`` object)."""
+        return self._get_params_partition().ungrouped_options
 
     @staticmethod
     def _group_params(
@@ -191,13 +307,13 @@ class OptionGroupMixin:
         return arg.make_metavar(), ""
 
     def get_arguments_help_section(self, ctx: click.Context) -> Optional[HelpSection]:
-        args_with_help = (arg for arg in self.arguments if getattr(arg, "help", None))
-        if not any(args_with_help):
+        partition = self._get_params_partition()
+        if not partition.arguments_have_help:
             return None
         return HelpSection(
             heading="Positional arguments",
             definitions=[
-                self.get_argument_help_record(arg, ctx) for arg in self.arguments
+                self.get_argument_help_record(arg, ctx) for arg in partition.arguments
             ],
         )
 
@@ -261,8 +377,7 @@ class OptionGroupMixin:
         # Option groups
         option_group_sections = [
             self.make_option_group_help_section(group, ctx)
-            for group in self.option_groups
-            if not group.hidden
+            for group in self._get_params_partition().visible_option_groups
         ]
         default_group = self.get_default_option_group(
             ctx, is_the_only_visible_option_group=not option_group_sections
@@ -361,6 +476,10 @@ def _option_group(
         raise ValueError('you must provide at least one option')
 
     def decorator(f: F) -> F:
+        with trace_construction('option_group', f, title):
+            return add_option_group(f)
+
+    def add_option_group(f: F) -> F:
         opt_group = OptionGroup(title, help=help, constraint=constraint, hidden=hidden)
         if not hasattr(f, '__click_params__'):
             f.__click_params__ = []  # type: ignore
@@ -5,13 +5,39 @@ from typing import (
 
 import click
 
+from cloup._tracing import trace_construction
 from cloup._util import first_bool, pick_not_none
-from cloup.formatting import HelpSection, ensure_is_cloup_formatter
+from cloup.formatting import (
+    ColumnWidths, HelpSection, display_width, ensure_is_cloup_formatter,
+)
 
 CommandType = TypeVar('CommandType', bound=Type[click.Command])
 Subcommands = Union[Iterable[click.Command], Dict[str, click.Command]]
 
 
+def get_command_items(commands: Subcommands) -> List[Tuple[str, click.Command]]:
+    """Return the ``(name, command)`` pairs of ``commands``, an iterable of
+    commands or a dict of commands keyed by name.
+
+    :raises TypeError: if a command has no name.
+    :raises ValueError: if two commands have the same name.
+    """
+    if isinstance(commands, dict):
+        return list(commands.items())
+    items = []
+    for cmd in commands:
+        if not cmd.name:
+            raise TypeError('missing command name')
+        items.append((cmd.name, cmd))
+    if len({name for name, _ in items}) != len(items):
+        seen = set()
+        for name, _ in items:
+            if name in seen:
+                raise ValueError(f'command "{name}" was passed more than once')
+            seen.add(name)
+    return items
+
+
 class Section:
     """
     A group of (sub)commands to show in the same help section of a
@@ -24,6 +50,7 @@ class Section:
     .. versionchanged:: 0.5.0
         introduced the new name ``Section`` and deprecated the old ``GroupSection``.
     """
+    __slots__ = ('title', 'is_sorted', 'commands', '_col1_widths')
 
     def __init__(self, title: str,
                  commands: Subcommands = (),
@@ -39,11 +66,12 @@ class Section:
                 'the first argument must be a string, the title; you probably forgot it')
         self.title = title
         self.is_sorted = is_sorted
+        # Display widths of the names of visible commands; built lazily, then
+        # kept updated by add_command() so that the help can be aligned quickly.
+        self._col1_widths: Optional[ColumnWidths] = None
         self.commands: OrderedDict[str, click.Command] = OrderedDict()
         if isinstance(commands, Sequence):
-            self.commands = OrderedDict()
-            for cmd in commands:
-                self.add_command(cmd)
+            self.extend(commands)
         elif isinstance(commands, dict):
             self.commands = OrderedDict(commands)
         else:
@@ -61,6 +89,42 @@ class Section:
         if name in self.commands:
             raise Exception(f'command "{name}" already exists')
         self.commands[name] = cmd
+        if self._col1_widths is not None and not cmd.hidden:
+            self._col1_widths.add(display_width(name))
+
+    def extend(self, commands: Subcommands) -> None:
+        """Add multiple commands, given as an iterable of commands or as a dict
+        of commands keyed by name. Names are validated before any command is
+        added, so the section is left unchanged if one of them is invalid."""
+        items = get_command_items(commands)
+        self._check_new_names(items)
+        self._add_items(items)
+
+    def _check_new_names(self, items: Sequence[Tuple[str, click.Command]]) -> None:
+        for name, _ in items:
+            if name in self.commands:
+                raise Exception(f'command "{name}" already exists')
+
+    def _add_items(self, items: Iterable[Tuple[str, click.Command]]) -> None:
+        commands = self.commands
+        col1_widths = self._col1_widths
+        for name, cmd in items:
+            commands[name] = cmd
+            if col1_widths is not None and not cmd.hidden:
+                col1_widths.add(display_width(name))
+
+    def _replace_command(self, name: str, cmd: click.Command) -> None:
+        if self.commands[name].hidden != cmd.hidden:
+            self._col1_widths = None
+        self.commands[name] = cmd
+
+    @property
+    def col1_widths(self) -> ColumnWidths:
+        """Display widths of the names of the visible commands of this section."""
+        if self._col1_widths is None:
+            self._col1_widths = ColumnWidths.of(
+                name for name, cmd in self.commands.items() if not cmd.hidden)
+        return self._col1_widths
 
     def list_commands(self) -> List[Tuple[str, click.Command]]:
         command_list = [(name, cmd) for name, cmd in self.commands.items()
@@ -144,17 +208,39 @@ class SectionMixin:
             self._user_sections.append(section)
             self._section_set.add(section)
 
+    def _add_commands_to_section(
+        self, items: Sequence[Tuple[str, click.Command]],
+        section: Optional[Section] = None,
+    ) -> None:
+        if section is None:
+            section = self._default_section
+        section._add_items(items)
+        if section not in self._section_set:
+            self._user_sections.append(section)
+            self._section_set.add(section)
+
+    def _replace_section_command(
+        self, name: str, old_cmd: click.Command, new_cmd: click.Command
+    ) -> None:
+        """Replace ``old_cmd`` with ``new_cmd`` in the section containing it."""
+        for section in (self._default_section, *self._user_sections):
+            if section.commands.get(name) is old_cmd:
+                section._replace_command(name, new_cmd)
+                return
+
     def add_section(self, section: Section) -> None:
         """Add a :class:`Section` to this group. You can add the same
         section object a single time."""
         if section in self._section_set:
             raise ValueError(f'section "{section}" was already added')
-        self._user_sections.append(section)
-        self._section_set.add(section)
-        for name, cmd in section.commands.items():
-            # It's important to call self.add_command() and not super().add_command() here
-            # otherwise subclasses' add_command() is not called.
-            self.add_command(cmd, name, fallback_to_default_section=False)
+        with trace_construction('section', getattr(self, 'name', None), section.title):
+            self._user_sections.append(section)
+            self._section_set.add(section)
+            for name, cmd in section.commands.items():
+                # It's important to call self.add_command() and not
+                # super().add_command() here otherwise subclasses' add_command()
+                # is not called.
+                self.add_command(cmd, name, fallback_to_default_section=False)
 
     def section(self, title: str, *commands: click.Command, **attrs: Any) -> Section:
         """Create a new :class:`Section`, adds it to this group and returns it."""
@@ -190,6 +276,30 @@ class SectionMixin:
         if section or fallback_to_default_section:
             self._add_command_to_section(cmd, name, section)
 
+    def add_commands(
+        self, commands: Subcommands, section: Optional[Section] = None
+    ) -> None:
+        """
+        Add multiple subcommands to this ``Group``, given as an iterable of
+        commands or as a dict of commands keyed by name, to ``section`` (if
+        provided) or to the "default section".
+
+        This is equivalent to calling :meth:`add_command` for each command but
+        it's faster when adding many commands at once, since names are validated
+        in a single pass (before adding any command) and the section is updated
+        once. Note that :meth:`add_command` is not called, so overrides of that
+        method in subclasses don't apply.
+
+        :param commands: commands or dict of commands keyed by name.
+        :param section:
+            a ``Section`` instance. The commands must not be in the section already.
+        """
+        items = get_command_items(commands)
+        (self._default_section if section is None else section)._check_new_names(items)
+        for name, cmd in items:
+            super().add_command(cmd, name)  # type: ignore
+        self._add_commands_to_section(items, section)
+
     def list_sections(
         self, ctx: click.Context, include_default_section: bool = True
     ) -> List[Section]:
@@ -201,9 +311,11 @@ class SectionMixin:
         """
         section_list = list(self._user_sections)
         if include_default_section and len(self._default_section) > 0:
+            # The commands of the default section are shared, not copied
             default_section = Section.sorted(
-                title='Other commands' if len(self._user_sections) > 0 else 'Commands',
-                commands=self._default_section.commands)
+                title='Other commands' if len(self._user_sections) > 0 else 'Commands')
+            default_section.commands = self._default_section.commands
+            default_section._col1_widths = self._default_section.col1_widths
             section_list.append(default_section)
         return section_list
 
@@ -218,18 +330,32 @@ class SectionMixin:
         """
         return name
 
+    def _get_col1_widths_hint(
+        self, ctx: click.Context, section: Section
+    ) -> Optional[ColumnWidths]:
+        """Return the display widths of the formatted names of the visible
+        subcommands of ``section`` if they're known without formatting them,
+        i.e. if :meth:`format_subcommand_name` returns names as they are."""
+        if type(self).format_subcommand_name is SectionMixin.format_subcommand_name:
+            return section.col1_widths
+        return None
+
     def make_commands_help_section(
         self, ctx: click.Context, section: Section
     ) -> Optional[HelpSection]:
         visible_subcommands = section.list_commands()
         if not visible_subcommands:
             return None
+        col1_widths = self._get_col1_widths_hint(ctx, section)
+        if col1_widths is not None and len(col1_widths) != len(visible_subcommands):
+            col1_widths = None  # section.commands was modified directly
         return HelpSection(
             heading=section.title,
             definitions=[
                 (self.format_subcommand_name(ctx, name, cmd), cmd.get_short_help_str)
                 for name, cmd in visible_subcommands
-            ]
+            ],
+            col1_widths=col1_widths,
         )
 
     def must_align_sections(
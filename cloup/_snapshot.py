@@ -0,0 +1,145 @@
+"""
+Implements snapshots of command trees, i.e. command trees saved with ``pickle``
+so that they can be restored without running the code that constructs them.
+"""
+import importlib
+import pickle
+import sys
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import click
+
+from ._cache import PathLike, write_bytes_atomic
+from ._util import click_version_tuple
+from ._version import version as cloup_version
+
+SNAPSHOT_FORMAT = 1
+
+
+class CallbackRef:
+    """A reference to a command callback by module and qualified name, used to
+    pickle commands. The referenced function is imported only when it's called
+    for the first time (i.e. when the command is invoked).
+
+    If the referenced object is a command (which is the case when the callback
+    was decorated with ``@command``), its callback is used.
+    """
+
+    __slots__ = ('module', 'qualname', '_function')
+
+    def __init__(self, module: str, qualname: str):
+        self.module = module
+        self.qualname = qualname
+        self._function: Optional[Callable[..., Any]] = None
+
+    @classmethod
+    def of(cls, function: Callable[..., Any]) -> 'CallbackRef':
+        """Return a reference to ``function``; raise ``pickle.PicklingError`` if
+        the function is not reachable through its qualified name."""
+        module: Optional[str] = getattr(function, '__module__', None)
+        qualname: Optional[str] = getattr(function, '__qualname__', None)
+        if not module or not qualname or '<' in qualname:
+            raise pickle.PicklingError(
+                f"can't reference the callback {function!r} by qualified name; "
+                f"only functions defined at module level (or in classes) can "
+                f"be pickled")
+        return cls(module, qualname)
+
+    def resolve(self) -> Callable[..., Any]:
+        """Import and return the referenced function (only once)."""
+        if self._function is None:
+            obj: Any = importlib.import_module(self.module)
+            for attr in self.qualname.split('.'):
+                obj = getattr(obj, attr)
+            if isinstance(obj, click.Command):
+                obj = obj.callback
+            self._function = obj
+        return self._function
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self.resolve()(*args, **kwargs)
+
+    def __reduce__(self) -> Any:
+        return CallbackRef, (self.module, self.qualname)
+
+    def __repr__(self) -> str:
+        return f'CallbackRef({self.module!r}, {self.qualname!r})'
+
+
+def make_callback_ref(
+    callback: Optional[Callable[..., Any]], command_name: Optional[str] = None
+) -> Optional[Callable[..., Any]]:
+    """Return the value stored in place of ``callback`` when a command is pickled.
+
+    :raise pickle.PicklingError:
+        if the qualified name of ``callback`` refers to another object (e.g.
+        because two callbacks in the same module have the same name).
+    """
+    if callback is None or isinstance(callback, CallbackRef):
+        return callback
+    ref = CallbackRef.of(callback)
+    try:
+        resolved: Any = ref.resolve()
+    except Exception:
+        resolved = None
+    if resolved is not callback:
+        raise pickle.PicklingError(
+            f"can't pickle the callback of command {command_name!r}: "
+            f"'{ref.module}.{ref.qualname}' refers to another object; make sure "
+            f"that each callback has a unique name in its module")
+    return ref
+
+
+def _make_header(version: str) -> Any:
+    return (SNAPSHOT_FORMAT, cloup_version, click_version_tuple,
+            sys.version_info[:2], version)
+
+
+def snapshot(command: click.Command, path: PathLike, *, version: str = '') -> bool:
+    """Save ``command`` (and all its subcommands) to ``path`` so that it can be
+    restored by :func:`restore` without running the code that constructs it.
+
+    Command callbacks are saved as references by qualified name (see
+    :class:`CallbackRef`), so they must be module-level functions (possibly
+    decorated). All other objects of the tree (e.g. parameter types and
+    callbacks, constraints, formatter settings) must be picklable.
+
+    :param command: the root command.
+    :param path: the snapshot file; parent directories are created if needed.
+    :param version:
+        the version of your application; a snapshot is restored only if the
+        same version is passed to :func:`restore`.
+    :return:
+        ``False`` if the file couldn't be written, ``True`` otherwise.
+    :raise pickle.PicklingError:
+        if an object of the tree can't be pickled or if a callback can't be
+        referenced unambiguously by its qualified name.
+    """
+    data = (
+        pickle.dumps(_make_header(version), protocol=pickle.HIGHEST_PROTOCOL)
+        + pickle.dumps(command, protocol=pickle.HIGHEST_PROTOCOL)
+    )
+    return write_bytes_atomic(Path(path), data)
+
+
+def restore(path: PathLike, *, version: str = '') -> Optional[click.Command]:
+    """Restore a command saved with :func:`snapshot`.
+
+    Return ``None`` if the snapshot doesn't exist, can't be loaded or was
+    saved by another version of your application (see the ``version`` argument
+    of :func:`snapshot`), of Cloup, of Click or of Python. In that case, you should
+    construct the command as usual and take a new snapshot.
+
+    .. warning::
+        Unpickling data can execute arbitrary code: restore only snapshots
+        written by your application in a location that only it can write.
+    """
+    try:
+        with open(path, 'rb') as file:
+            if pickle.load(file) != _make_header(version):
+                return None
+            command = pickle.load(file)
+    except Exception:
+        return None
+    return command if isinstance(command, click.Command) else None
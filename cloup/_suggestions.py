@@ -0,0 +1,171 @@
+"""
+Implements indexes for resolving mistyped or abbreviated command names efficiently:
+an n-gram index for "Did you mean <x>?" suggestions and a trie for prefix matching.
+"""
+import difflib
+import heapq
+from collections import defaultdict
+from typing import DefaultDict, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from ._util import check_arg
+
+
+class SuggestionIndex:
+    """An n-gram index over a collection of names (e.g. command names and
+    aliases), used to find the names that are similar to a misspelled one.
+
+    :meth:`get_close_matches` is equivalent to :func:`difflib.get_close_matches`
+    but compares the input word only with the names sharing at least one n-gram
+    with it. Words are padded so that names with the same first or last character
+    always share an n-gram. This makes the search sublinear in practice with a
+    negligible impact on the quality of the suggestions (names sharing no n-gram
+    with the input word are very unlikely to reach a reasonable cutoff).
+
+    Names can be added incrementally with :meth:`add`.
+
+    :param names: initial names.
+    :param ngram_size: the length of the n-grams; bigrams by default.
+    """
+
+    def __init__(self, names: Iterable[str] = (), ngram_size: int = 2):
+        check_arg(ngram_size >= 1, 'ngram_size must be positive')
+        self.ngram_size = ngram_size
+        self._names: Set[str] = set()
+        # Lists are more compact than sets; names are added a single time
+        self._postings: DefaultDict[str, List[str]] = defaultdict(list)
+        for name in names:
+            self.add(name)
+
+    def _ngrams(self, word: str) -> Set[str]:
+        n = self.ngram_size
+        padded = '\0' * (n - 1) + word + '\0' * (n - 1)
+        return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+    def add(self, name: str) -> None:
+        """Add a name to the index (if not already present)."""
+        if name in self._names:
+            return
+        self._names.add(name)
+        for ngram in self._ngrams(name):
+            self._postings[ngram].append(name)
+
+    def get_candidates(self, word: str) -> Dict[str, int]:
+        """Return the names sharing at least one n-gram with ``word``, mapped
+        to the number of shared n-grams."""
+        candidates: DefaultDict[str, int] = defaultdict(int)
+        for ngram in self._ngrams(word):
+            for name in self._postings.get(ngram, ()):
+                candidates[name] += 1
+        return candidates
+
+    def get_close_matches(
+        self, word: str, n: int = 3, cutoff: float = 0.6
+    ) -> List[str]:
+        """Return a list of the (at most ``n``) best "good enough" matches
+        of ``word``, sorted by similarity (most similar first). Similarity is
+        measured with ``difflib.SequenceMatcher.ratio()`` and only names with
+        a similarity of at least ``cutoff`` are returned.
+
+        :param word: the misspelled word.
+        :param n: maximum number of matches to return.
+        :param cutoff: float in the interval [0, 1].
+        """
+        check_arg(n > 0, 'n must be > 0')
+        check_arg(0.0 <= cutoff <= 1.0, 'cutoff must be in [0.0, 1.0]')
+        result = []
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(word)
+        for name in self.get_candidates(word):
+            matcher.set_seq1(name)
+            if (matcher.real_quick_ratio() >= cutoff
+                    and matcher.quick_ratio() >= cutoff
+                    and matcher.ratio() >= cutoff):
+                result.append((matcher.ratio(), name))
+        best = heapq.nlargest(n, result)
+        return [name for _, name in best]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._names)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+
+class _TrieNode:
+    __slots__ = ('children', 'target', 'is_ambiguous')
+
+    def __init__(self) -> None:
+        self.children: Dict[str, '_TrieNode'] = {}
+        # The target of all the keys starting with the prefix of this node
+        # (None if there's none or if there are multiple targets)
+        self.target: Optional[str] = None
+        self.is_ambiguous = False
+
+
+class PrefixIndex:
+    """A trie mapping keys (e.g. command names and aliases) to targets (e.g.
+    the corresponding command names), used to resolve unambiguous prefixes of
+    keys in ``O(len(prefix))``.
+
+    Each node stores the target shared by all keys starting with its prefix, so
+    a prefix is resolved by walking the trie. The candidate targets of an
+    ambiguous prefix are collected only when requested.
+    """
+
+    def __init__(self, items: Iterable[Tuple[str, str]] = ()):
+        self._root = _TrieNode()
+        for key, target in items:
+            self.add(key, target)
+
+    def add(self, key: str, target: str) -> None:
+        """Add ``key`` (mapped to ``target``) to the index."""
+        node = self._root
+        self._update_target(node, target)
+        for char in key:
+            node = node.children.setdefault(char, _TrieNode())
+            self._update_target(node, target)
+
+    @staticmethod
+    def _update_target(node: _TrieNode, target: str) -> None:
+        if node.is_ambiguous:
+            return
+        if node.target is None:
+            node.target = target
+        elif node.target != target:
+            node.target = None
+            node.is_ambiguous = True
+
+    def _find(self, prefix: str) -> Optional[_TrieNode]:
+        node: Optional[_TrieNode] = self._root
+        for char in prefix:
+            node = node.children.get(char)  # type: ignore
+            if node is None:
+                return None
+        return node
+
+    def resolve(self, prefix: str) -> Tuple[Optional[str], List[str]]:
+        """Return a tuple ``(target, candidates)``:
+
+        - if all keys starting with ``prefix`` have the same target, ``target``
+          is that target and ``candidates`` is empty;
+        - if ``prefix`` is ambiguous, ``target`` is ``None`` and ``candidates``
+          is the sorted list of the targets of all keys starting with ``prefix``;
+        - if no key starts with ``prefix``, both are empty/``None``.
+        """
+        node = self._find(prefix)
+        if node is None or not (node.target or node.is_ambiguous):
+            return None, []
+        if not node.is_ambiguous:
+            return node.target, []
+        targets: Set[str] = set()
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.is_ambiguous:
+                stack.extend(node.children.values())
+            elif node.target is not None:
+                targets.add(node.target)
+        return None, sorted(targets)
@@ -0,0 +1,160 @@
+"""
+Implements the opt-in recording of the time spent in each phase of the
+processing of a command line (see :class:`PhaseTimings`).
+"""
+import os
+import sys
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from time import perf_counter
+from typing import (
+    Any, ContextManager, Dict, Iterator, List, Optional, Tuple, Union,
+)
+
+import click
+
+#: Environment variable enabling timings for all root contexts that don't set
+#: the ``timings`` context setting.
+TIMINGS_ENV_VAR = 'CLOUP_TIMINGS'
+
+#: Phases in the order they are reported.
+PHASES = (
+    'construction', 'consistency', 'parsing', 'constraints', 'resolution',
+    'help', 'invoke',
+)
+
+# Returned by measure_phase() when timings are disabled (nullcontext is reusable)
+_NO_TIMING = nullcontext()
+
+# Root timings (and where to report them) of the contexts created during the
+# current call of Command.main().
+_pending_reports: 'ContextVar[Optional[List[Tuple[PhaseTimings, str]]]]' = \
+    ContextVar('cloup_pending_timing_reports', default=None)
+
+
+class PhaseTimings:
+    """The time (in seconds) spent by a context in each processing phase, plus
+    the timings of its subcontexts. Phases are:
+
+    - ``construction``: creation of the context;
+    - ``consistency``: consistency checks of constraints;
+    - ``parsing``: parsing of the command line arguments (by Click);
+    - ``constraints``: checks of the constraints on parameter values;
+    - ``resolution``: resolution of the subcommand name;
+    - ``help``: rendering of the help page;
+    - ``invoke``: invocation of the command; for groups, this includes the
+      processing of subcommands.
+
+    Only phases that actually happened are recorded. Phases can overlap: e.g.
+    the help page requested with ``--help`` is rendered while parsing.
+
+    Enable timings with the ``timings`` context setting or the ``CLOUP_TIMINGS``
+    environment variable; the timings of a context are then available as
+    ``ctx.phase_timings``.
+    """
+
+    __slots__ = ('command_name', 'phases', 'children')
+
+    def __init__(self, command_name: Optional[str]):
+        self.command_name = command_name
+        self.phases: Dict[str, float] = {}
+        self.children: List[PhaseTimings] = []
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """Add the time spent in the ``with`` block to ``phase``."""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(phase, perf_counter() - start)
+
+    def add_child(self, command_name: Optional[str]) -> 'PhaseTimings':
+        child = PhaseTimings(command_name)
+        self.children.append(child)
+        return child
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the timings tree as a JSON-serializable dictionary."""
+        return {
+            'command': self.command_name,
+            'phases': {
+                phase: self.phases[phase] for phase in PHASES if phase in self.phases
+            },
+            'children': [child.to_dict() for child in self.children],
+        }
+
+    def format(self, indent: int = 0) -> str:
+        """Return the timings tree as text, one line per context, in milliseconds."""
+        phases = ' '.join(
+            f'{phase}={self.phases[phase] * 1000:.3f}ms'
+            for phase in PHASES if phase in self.phases
+        )
+        lines = [f'{" " * indent}{self.command_name}: {phases}']
+        lines.extend(child.format(indent + 2) for child in self.children)
+        return '\n'.join(lines)
+
+    def report(self, target: str) -> None:
+        """Write the timings to stderr (if ``target`` is ``"-"``) or, in JSON
+        format, to the file at path ``target``."""
+        if target == '-':
+            click.echo(self.format(), file=sys.stderr)
+        else:
+            import json
+            with open(target, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, indent=2)
+
+    def __repr__(self) -> str:
+        return f'PhaseTimings({self.command_name!r}, {self.phases!r})'
+
+
+def get_timings_target(setting: Union[None, bool, str]) -> Optional[str]:
+    """Return where the timings of a root context must be reported, given the
+    value of the ``timings`` context setting (or, if ``None``, of the environment
+    variable): ``"-"`` for stderr, a file path for JSON, or ``None`` if timings
+    are disabled (including by ``"0"``, ``"false"`` and ``"no"``)."""
+    if setting is None:
+        setting = os.environ.get(TIMINGS_ENV_VAR)
+    if setting is True or setting in ('-', '1', 'stderr'):
+        return '-'
+    if not setting or setting.lower() in ('0', 'false', 'no'):
+        return None
+    return setting
+
+
+def start_root_timings(
+    command_name: Optional[str], target: str
+) -> PhaseTimings:
+    """Create the timings of a root context. If created inside
+    :func:`reporting_timings`, they are reported when the block exits."""
+    timings = PhaseTimings(command_name)
+    pending = _pending_reports.get()
+    if pending is not None:
+        pending.append((timings, target))
+    return timings
+
+
+@contextmanager
+def reporting_timings() -> Iterator[None]:
+    """Report the timings of the root contexts created in the ``with`` block
+    when the block exits, even with an exception (e.g. after ``--help``)."""
+    pending: List[Tuple[PhaseTimings, str]] = []
+    token = _pending_reports.set(pending)
+    try:
+        yield
+    finally:
+        _pending_reports.reset(token)
+        for timings, target in pending:
+            timings.report(target)
+
+
+def measure_phase(ctx: click.Context, phase: str) -> ContextManager[None]:
+    """Return a context manager measuring the time spent in ``phase`` by ``ctx``,
+    or a no-op one if timings are disabled."""
+    timings: Optional[PhaseTimings] = getattr(ctx, 'phase_timings', None)
+    if timings is None:
+        return _NO_TIMING
+    return timings.measure(phase)
@@ -0,0 +1,161 @@
+"""
+Implements a tracer of the time (and memory) spent constructing a command tree,
+i.e. in Cloup decorators and in the initialization of commands.
+"""
+from contextlib import contextmanager, nullcontext
+from time import perf_counter
+from types import TracebackType
+from typing import (
+    Any, ContextManager, Iterator, List, NamedTuple, Optional, Type,
+)
+
+# Returned by trace_construction() when no tracer is active (nullcontext is reusable)
+_NO_TRACE = nullcontext()
+
+_active_tracer: Optional['ConstructionTracer'] = None
+
+
+class TraceRecord(NamedTuple):
+    """The time (in seconds) and the memory (in bytes) spent in a construction
+    step. "Self" values exclude nested steps (e.g. the construction of a command
+    includes the binding of its constraints). Memory is the net amount of
+    memory allocated by the step and it's 0 if allocations are not traced."""
+
+    kind: str
+    """One of ``"command"`` (the ``@command``/``@group`` decorators, including
+    the initialization of the command), ``"option_group"`` (the ``@option_group``
+    decorator, including the creation of its options; since it's applied before
+    the command decorator, it's not part of the command), ``"constraints"`` (the
+    binding of the constraints of a command) and ``"section"`` (the addition of
+    a section to a group)."""
+    name: str
+    seconds: float
+    self_seconds: float
+    allocated: int
+    self_allocated: int
+
+
+class ConstructionTracer:
+    """Records the time (and, optionally, the memory) spent constructing
+    commands and option groups while it's active, i.e. inside a ``with`` block::
+
+        with cloup.ConstructionTracer() as tracer:
+            import mycli
+
+        print(tracer.format_report())
+
+    Commands and option groups are identified by the qualified name of the
+    decorated function. Note that only the construction of commands created
+    with Cloup decorators is traced.
+
+    :param trace_allocations:
+        if ``True``, also record the net memory allocated by each step using
+        :mod:`tracemalloc` (started if not already tracing), which makes
+        construction much slower, so times are less reliable.
+    """
+
+    def __init__(self, trace_allocations: bool = False):
+        self.trace_allocations = trace_allocations
+        self.records: List[TraceRecord] = []
+        # For each open step, the time and memory spent in nested steps
+        self._stack: List[List[float]] = []
+        self._previous: Optional[ConstructionTracer] = None
+        self._started_tracemalloc = False
+
+    def __enter__(self) -> 'ConstructionTracer':
+        global _active_tracer
+        self._previous, _active_tracer = _active_tracer, self
+        if self.trace_allocations:
+            import tracemalloc
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracemalloc = True
+        return self
+
+    def __exit__(
+        self, exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        global _active_tracer
+        _active_tracer = self._previous
+        if self._started_tracemalloc:
+            import tracemalloc
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    @contextmanager
+    def trace(self, kind: str, name: str) -> Iterator[None]:
+        """Record the time (and memory) spent in the ``with`` block as a step."""
+        nested = [0.0, 0.0]
+        self._stack.append(nested)
+        get_traced_memory = None
+        if self.trace_allocations:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                get_traced_memory = tracemalloc.get_traced_memory
+        start_memory = get_traced_memory()[0] if get_traced_memory else 0
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            seconds = perf_counter() - start
+            allocated = get_traced_memory()[0] - start_memory if get_traced_memory else 0
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][0] += seconds
+                self._stack[-1][1] += allocated
+            self.records.append(TraceRecord(
+                kind, name,
+                seconds=seconds, self_seconds=seconds - nested[0],
+                allocated=allocated, self_allocated=allocated - int(nested[1]),
+            ))
+
+    @property
+    def total_seconds(self) -> float:
+        """The total time spent in traced steps."""
+        return sum(record.self_seconds for record in self.records)
+
+    def top(self, n: int = 10, by: str = 'self_seconds') -> List[TraceRecord]:
+        """Return the ``n`` records with the highest value of the attribute ``by``
+        (e.g. ``"seconds"`` or ``"self_allocated"``)."""
+        return sorted(self.records, key=lambda r: getattr(r, by), reverse=True)[:n]
+
+    def format_report(self, n: int = 10, by: str = 'self_seconds') -> str:
+        """Return a table with the top ``n`` records (see :meth:`top`)."""
+        memory = self.trace_allocations
+        lines = [
+            f'{len(self.records)} construction steps traced, '
+            f'{self.total_seconds * 1000:.3f}ms in total; top {n} by {by}:',
+            '  self ms  total ms' + ('  self KiB' if memory else '')
+            + '  kind          name',
+        ]
+        for r in self.top(n, by):
+            line = f'{r.self_seconds * 1000:9.3f} {r.seconds * 1000:9.3f}'
+            if memory:
+                line += f' {r.self_allocated / 1024:9.1f}'
+            lines.append(f'{line}  {r.kind:<12}  {r.name}')
+        return '\n'.join(lines)
+
+
+def trace_construction(
+    kind: str, subject: Any, detail: Optional[str] = None
+) -> ContextManager[None]:
+    """Return a context manager that records a construction step if a
+    :class:`ConstructionTracer` is active or does nothing otherwise.
+
+    The name of the step is built only if a tracer is active, from ``subject``
+    (a decorated function, identified by its qualified name, or any other object,
+    converted to string) and ``detail`` (if any), e.g. the title of a section."""
+    tracer = _active_tracer
+    if tracer is None:
+        return _NO_TRACE
+    name = get_callback_name(subject) if callable(subject) else str(subject)
+    if detail is not None:
+        name = f'{name}: {detail}'
+    return tracer.trace(kind, name)
+
+
+def get_callback_name(f: Any) -> str:
+    """Return the qualified name of the function decorated by a decorator."""
+    return f'{getattr(f, "__module__", "?")}.{getattr(f, "__qualname__", f)}'
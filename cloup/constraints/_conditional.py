@@ -1,11 +1,12 @@
 """
 This modules contains classes for creating conditional constraints.
 """
+from functools import partial
 from typing import Optional, Sequence, Union
 
 from click import Context, Parameter
 
-from ._core import Constraint
+from ._core import Constraint, _checks_values_as
 from .conditions import AllSet, IsSet, Predicate
 from .exceptions import ConstraintViolated
 from .._util import make_repr
@@ -73,15 +74,32 @@ class If(Constraint):
         try:
             branch.check_values(params, ctx=ctx)
         except ConstraintViolated as err:
-            desc = (
-                condition.description(ctx)
-                if condition_is_true
-                else condition.negated_description(ctx)
-            )
             raise ConstraintViolated(
-                f"when {desc}, {err}", ctx=ctx, constraint=self, params=params
+                partial(self._format_error, ctx, condition_is_true, err),
+                ctx=ctx, constraint=self, params=params
             )
 
+    def _format_error(
+        self, ctx: Context, condition_is_true: bool, err: ConstraintViolated
+    ) -> str:
+        condition = self._condition
+        desc = (
+            condition.description(ctx)
+            if condition_is_true
+            else condition.negated_description(ctx)
+        )
+        return f"when {desc}, {err}"
+
+    def is_satisfied(self, params: Sequence[Parameter], ctx: Context) -> bool:
+        if not _checks_values_as(self, If):
+            return super().is_satisfied(params, ctx)
+        branch = self._then if self._condition(ctx) else self._else
+        return branch is None or branch.is_satisfied(params, ctx)
+
+    def _estimated_cost(self) -> int:
+        branches = [self._then] if self._else is None else [self._then, self._else]
+        return 1 + max(c._estimated_cost() for c in branches)
+
     def __repr__(self) -> str:
         if self._else:
             return make_repr(self, self._condition, then=self._then, else_=self._else)
@@ -0,0 +1,63 @@
+"""
+Persistence of the outcome of constraints consistency checks.
+
+Consistency checks depend only on the constraints and on static properties of
+the parameters, so a set of bound constraints that passed the checks once is
+identified by a "fingerprint" of them. Fingerprints of consistent constraints
+are stored as empty files in the (version-stamped) Cloup cache directory.
+"""
+import types
+from typing import Any, Optional, Sequence, TYPE_CHECKING
+
+import click
+
+from .._cache import get_cache_dir, hash_key, write_text_atomic
+
+if TYPE_CHECKING:
+    from ._support import BoundConstraint
+
+
+def _param_fingerprint(param: click.Parameter) -> Any:
+    return (
+        type(param).__module__, type(param).__qualname__,
+        param.name, tuple(param.opts), tuple(param.secondary_opts),
+        param.required, param.nargs, param.multiple,
+        getattr(param, 'is_flag', False), getattr(param, 'is_bool_flag', False),
+    )
+
+
+def _fingerprint(obj: Any) -> Any:
+    if obj is None or isinstance(obj, (str, int, float)):
+        return obj
+    if isinstance(obj, click.Parameter):
+        return _param_fingerprint(obj)
+    if isinstance(obj, (list, tuple)):
+        return tuple(_fingerprint(item) for item in obj)
+    if isinstance(obj, dict):
+        return tuple(sorted(
+            (str(key), _fingerprint(value)) for key, value in obj.items()))
+    if isinstance(obj, (type, types.FunctionType, types.BuiltinFunctionType,
+                        types.MethodType)):
+        return obj.__module__, obj.__qualname__
+    if hasattr(obj, '__dict__'):
+        cls = type(obj)
+        return cls.__module__, cls.__qualname__, _fingerprint(vars(obj))
+    return repr(obj)
+
+
+def get_consistency_key(constraints: Sequence['BoundConstraint']) -> Optional[str]:
+    """Return a key identifying a sequence of bound constraints with respect to
+    consistency checks or ``None`` if no stable key can be computed (i.e. when
+    the representation of some object contains a memory address)."""
+    fingerprint = repr(_fingerprint(constraints))
+    if ' at 0x' in fingerprint:
+        return None
+    return hash_key(fingerprint)
+
+
+def is_known_consistent(key: str) -> bool:
+    return (get_cache_dir('consistency') / key).exists()
+
+
+def mark_consistent(key: str) -> None:
+    write_text_atomic(get_cache_dir('consistency') / key, '')
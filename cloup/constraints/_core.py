@@ -1,6 +1,7 @@
 import abc
+from functools import partial
 from typing import (
-    Any, Callable, Optional, Sequence, TypeVar, Union, cast, overload,
+    Any, Callable, FrozenSet, Optional, Sequence, Type, TypeVar, Union, cast, overload,
 )
 
 import click
@@ -10,14 +11,14 @@ from cloup._util import (
     first_bool, make_one_line_repr, make_repr, pluralize, reindent,
 )
 from .common import (
+    count_params_whose_value_is_set,
     format_param_list,
     get_param_label,
     get_param_name,
-    get_params_whose_value_is_set,
     get_required_params,
     param_value_is_set,
 )
-from .exceptions import ConstraintViolated, UnsatisfiableConstraint
+from .exceptions import ConstraintViolated, MessageOrFactory, UnsatisfiableConstraint
 from ..typing import Decorator, F
 
 Op = TypeVar('Op', bound='Operator')
@@ -25,6 +26,12 @@ HelpRephraser = Callable[[click.Context, 'Constraint'], str]
 ErrorRephraser = Callable[[ConstraintViolated], str]
 
 
+def _checks_values_as(constr: 'Constraint', cls: Type['Constraint']) -> bool:
+    """Return True if ``constr`` uses ``cls.check_values``, i.e. if the method
+    was not overridden by a subclass of ``cls``."""
+    return type(constr).check_values is cls.check_values
+
+
 class Constraint(abc.ABC):
     """
     A constraint that can be checked against an arbitrary collection of CLI
@@ -58,6 +65,8 @@ class Constraint(abc.ABC):
                 f'`check_constraints_consistency`. '
                 f'Pass it as part of your `context_settings`.'
             )
+        raise AttributeError(
+            f'{class_name(self)!r} object has no attribute {attr!r}')
 
     @abc.abstractmethod
     def help(self, ctx: click.Context) -> str:
@@ -101,6 +110,45 @@ class Constraint(abc.ABC):
             :exc:`~cloup.constraints.ConstraintViolated`
         """
 
+    def _get_accepted_counts(self, num_params: int) -> Optional[FrozenSet[int]]:
+        """If this constraint is satisfied or not depending only on the *number*
+        of set parameters, return the set of the accepted numbers (given the
+        total number of parameters). Otherwise, return ``None``.
+
+        This is used by :class:`ConstraintMixin` to check constraints with a
+        cheap bit count. Subclasses overriding :meth:`check_values` must not
+        inherit this method, so built-in implementations check for this.
+        """
+        return None
+
+    def is_satisfied(
+        self, params: Sequence[click.Parameter], ctx: click.Context
+    ) -> bool:
+        """
+        Return ``True`` if the constraint is satisfied by the input parameters
+        in the given context. Unlike :meth:`check_values`, this method doesn't
+        raise and, for built-in constraints, doesn't build any error message.
+        Operators use it to evaluate their operands, calling
+        :meth:`check_values` only to raise the final error.
+
+        The default implementation calls :meth:`check_values`, so you don't need
+        to override this method unless you want a faster implementation.
+
+        :param params: list of :class:`click.Parameter` instances
+        :param ctx: :class:`click.Context`
+        """
+        try:
+            self.check_values(params, ctx)
+        except ConstraintViolated:
+            return False
+        return True
+
+    def _estimated_cost(self) -> int:
+        """A rough estimate of the cost of :meth:`is_satisfied`. Operators
+        evaluate cheaper operands first. Constraints that only count the set
+        parameters cost 1; unknown constraints are assumed to be expensive."""
+        return 10
+
     @overload
     def check(
         self, params: Sequence[click.Parameter], ctx: Optional[click.Context] = None
@@ -231,6 +279,9 @@ class Operator(Constraint, abc.ABC):
         :param constraints: operands
         """
         self.constraints = constraints
+        # Operands in evaluation order (sorted() is stable)
+        self._constraints_by_cost = tuple(
+            sorted(constraints, key=lambda c: c._estimated_cost()))
 
     def help(self, ctx: click.Context) -> str:
         return self.HELP_SEP.join(
@@ -242,6 +293,9 @@ class Operator(Constraint, abc.ABC):
         for c in self.constraints:
             c.check_consistency(params)
 
+    def _estimated_cost(self) -> int:
+        return sum(c._estimated_cost() for c in self.constraints)
+
     def __repr__(self) -> str:
         return make_repr(self, *self.constraints)
 
@@ -251,9 +305,30 @@ class And(Operator):
     HELP_SEP = ' and '
 
     def check_values(self, params: Sequence[click.Parameter], ctx: click.Context) -> None:
+        if all(c.is_satisfied(params, ctx) for c in self._constraints_by_cost):
+            return
+        # Raise the error of the first violated operand in declaration order
         for c in self.constraints:
             c.check_values(params, ctx)
 
+    def is_satisfied(
+        self, params: Sequence[click.Parameter], ctx: click.Context
+    ) -> bool:
+        if not _checks_values_as(self, And):
+            return super().is_satisfied(params, ctx)
+        return all(c.is_satisfied(params, ctx) for c in self._constraints_by_cost)
+
+    def _get_accepted_counts(self, num_params: int) -> Optional[FrozenSet[int]]:
+        if not _checks_values_as(self, And):
+            return None
+        accepted = frozenset(range(num_params + 1))
+        for c in self.constraints:
+            counts = c._get_accepted_counts(num_params)
+            if counts is None:
+                return None
+            accepted &= counts
+        return accepted
+
     def __and__(self, other: Constraint) -> 'And':
         if isinstance(other, And):
             return And(*self.constraints, *other.constraints)
@@ -265,16 +340,30 @@ class Or(Operator):
     HELP_SEP = ' or '
 
     def check_values(self, params: Sequence[click.Parameter], ctx: click.Context) -> None:
-        for c in self.constraints:
-            try:
-                c.check_values(params, ctx)
-                return
-            except ConstraintViolated:
-                pass
+        if any(c.is_satisfied(params, ctx) for c in self._constraints_by_cost):
+            return
         raise ConstraintViolated.default(
-            self.help(ctx), ctx=ctx, constraint=self, params=params
+            partial(self.help, ctx), ctx=ctx, constraint=self, params=params
         )
 
+    def is_satisfied(
+        self, params: Sequence[click.Parameter], ctx: click.Context
+    ) -> bool:
+        if not _checks_values_as(self, Or):
+            return super().is_satisfied(params, ctx)
+        return any(c.is_satisfied(params, ctx) for c in self._constraints_by_cost)
+
+    def _get_accepted_counts(self, num_params: int) -> Optional[FrozenSet[int]]:
+        if not _checks_values_as(self, Or):
+            return None
+        accepted: FrozenSet[int] = frozenset()
+        for c in self.constraints:
+            counts = c._get_accepted_counts(num_params)
+            if counts is None:
+                return None
+            accepted |= counts
+        return accepted
+
     def __or__(self, other: Constraint) -> 'Or':
         if isinstance(other, Or):
             return Or(*self.constraints, *other.constraints)
@@ -353,14 +442,41 @@ class Rephraser(Constraint):
                 self, params=params, reason=exc.reason)
 
     def check_values(self, params: Sequence[click.Parameter], ctx: click.Context) -> None:
+        if self.constraint.is_satisfied(params, ctx):
+            return
         try:
             self.constraint.check_values(params, ctx)
         except ConstraintViolated as err:
-            rephrased_error = self._get_rephrased_error(err)
-            if rephrased_error:
-                raise ConstraintViolated(
-                    rephrased_error, ctx=ctx, constraint=self, params=params)
-            raise
+            message: MessageOrFactory
+            if isinstance(self._error, str) and self._error:
+                # Formatting a non-empty string never gives an empty message,
+                # so it's postponed until the message is needed
+                message = partial(self._format_error, err)
+            else:
+                rephrased_error = self._get_rephrased_error(err)
+                if not rephrased_error:
+                    raise
+                message = rephrased_error
+            raise ConstraintViolated(
+                message, ctx=ctx, constraint=self, params=params)
+
+    def _format_error(self, err: ConstraintViolated) -> str:
+        return self._get_rephrased_error(err) or err.message
+
+    def _get_accepted_counts(self, num_params: int) -> Optional[FrozenSet[int]]:
+        if not _checks_values_as(self, Rephraser):
+            return None
+        return self.constraint._get_accepted_counts(num_params)
+
+    def is_satisfied(
+        self, params: Sequence[click.Parameter], ctx: click.Context
+    ) -> bool:
+        if not _checks_values_as(self, Rephraser):
+            return super().is_satisfied(params, ctx)
+        return self.constraint.is_satisfied(params, ctx)
+
+    def _estimated_cost(self) -> int:
+        return self.constraint._estimated_cost()
 
     def __repr__(self) -> str:
         return make_one_line_repr(self, help=self._help)
@@ -396,6 +512,21 @@ class WrapperConstraint(Constraint, metaclass=abc.ABCMeta):
     def check_values(self, params: Sequence[click.Parameter], ctx: click.Context) -> None:
         self._constraint.check_values(params, ctx)
 
+    def _get_accepted_counts(self, num_params: int) -> Optional[FrozenSet[int]]:
+        if not _checks_values_as(self, WrapperConstraint):
+            return None
+        return self._constraint._get_accepted_counts(num_params)
+
+    def is_satisfied(
+        self, params: Sequence[click.Parameter], ctx: click.Context
+    ) -> bool:
+        if not _checks_values_as(self, WrapperConstraint):
+            return super().is_satisfied(params, ctx)
+        return self._constraint.is_satisfied(params, ctx)
+
+    def _estimated_cost(self) -> int:
+        return self._constraint._estimated_cost()
+
     def __repr__(self) -> str:
         return make_repr(self, **self._attrs)
 
@@ -412,7 +543,7 @@ class _RequireAll(Constraint):
                         if not param_value_is_set(param, values[get_param_name(param)])]
         if any(unset_params):
             raise ConstraintViolated(
-                pluralize(
+                lambda: pluralize(
                     len(unset_params),
                     one=f"{get_param_label(unset_params[0])} is required",
                     many=f"the following parameters are required:\n"
@@ -422,6 +553,23 @@ class _RequireAll(Constraint):
                 params=params,
             )
 
+    def _get_accepted_counts(self, num_params: int) -> Optional[FrozenSet[int]]:
+        if not _checks_values_as(self, _RequireAll):
+            return None
+        return frozenset({num_params})
+
+    def is_satisfied(
+        self, params: Sequence[click.Parameter], ctx: click.Context
+    ) -> bool:
+        if not _checks_values_as(self, _RequireAll):
+            return super().is_satisfied(params, ctx)
+        values = ctx.params
+        return all(param_value_is_set(param, values[get_param_name(param)])
+                   for param in params)
+
+    def _estimated_cost(self) -> int:
+        return 1
+
 
 class RequireAtLeast(Constraint):
     """Satisfied if the number of set parameters is >= n."""
@@ -444,14 +592,29 @@ class RequireAtLeast(Constraint):
 
     def check_values(self, params: Sequence[click.Parameter], ctx: click.Context) -> None:
         n = self.min_num_params
-        given_params = get_params_whose_value_is_set(params, ctx.params)
-        if len(given_params) < n:
+        if count_params_whose_value_is_set(params, ctx.params) < n:
             raise ConstraintViolated(
-                f"at least {n} of the following parameters must be set:\n"
-                f"{format_param_list(params)}",
+                lambda: f"at least {n} of the following parameters must be set:\n"
+                        f"{format_param_list(params)}",
                 ctx=ctx, constraint=self, params=params,
             )
 
+    def _get_accepted_counts(self, num_params: int) -> Optional[FrozenSet[int]]:
+        if not _checks_values_as(self, RequireAtLeast):
+            return None
+        return frozenset(range(self.min_num_params, num_params + 1))
+
+    def is_satisfied(
+        self, params: Sequence[click.Parameter], ctx: click.Context
+    ) -> bool:
+        if not _checks_values_as(self, RequireAtLeast):
+            return super().is_satisfied(params, ctx)
+        num_set = count_params_whose_value_is_set(params, ctx.params)
+        return num_set >= self.min_num_params
+
+    def _estimated_cost(self) -> int:
+        return 1
+
     def __repr__(self) -> str:
         return make_repr(self, self.min_num_params)
 
@@ -474,14 +637,29 @@ class AcceptAtMost(Constraint):
 
     def check_values(self, params: Sequence[click.Parameter], ctx: click.Context) -> None:
         n = self.max_num_params
-        given_params = get_params_whose_value_is_set(params, ctx.params)
-        if len(given_params) > n:
+        if count_params_whose_value_is_set(params, ctx.params) > n:
             raise ConstraintViolated(
-                f"no more than {n} of the following parameters can be set:\n"
-                f"{format_param_list(params)}",
+                lambda: f"no more than {n} of the following parameters can be set:\n"
+                        f"{format_param_list(params)}",
                 ctx=ctx, constraint=self, params=params,
             )
 
+    def _get_accepted_counts(self, num_params: int) -> Optional[FrozenSet[int]]:
+        if not _checks_values_as(self, AcceptAtMost):
+            return None
+        return frozenset(range(min(self.max_num_params, num_params) + 1))
+
+    def is_satisfied(
+        self, params: Sequence[click.Parameter], ctx: click.Context
+    ) -> bool:
+        if not _checks_values_as(self, AcceptAtMost):
+            return super().is_satisfied(params, ctx)
+        num_set = count_params_whose_value_is_set(params, ctx.params)
+        return num_set <= self.max_num_params
+
+    def _estimated_cost(self) -> int:
+        return 1
+
     def __repr__(self) -> str:
         return make_repr(self, self.max_num_params)
 
@@ -500,16 +678,33 @@ class RequireExactly(WrapperConstraint):
 
     def check_values(self, params: Sequence[click.Parameter], ctx: click.Context) -> None:
         n = self.num_params
-        given_params = get_params_whose_value_is_set(params, ctx.params)
-        if len(given_params) != n:
-            reason = pluralize(
-                count=n,
-                zero='none of the following parameters must be set:\n',
-                many=f'exactly {n} of the following parameters must be set:\n'
-            ) + format_param_list(params)
+        if count_params_whose_value_is_set(params, ctx.params) != n:
+            def reason() -> str:
+                return pluralize(
+                    count=n,
+                    zero='none of the following parameters must be set:\n',
+                    many=f'exactly {n} of the following parameters must be set:\n'
+                ) + format_param_list(params)
+
             raise ConstraintViolated(
                 reason, ctx=ctx, constraint=self, params=params)
 
+    def _get_accepted_counts(self, num_params: int) -> Optional[FrozenSet[int]]:
+        if not _checks_values_as(self, RequireExactly):
+            return None
+        return frozenset({self.num_params})
+
+    def is_satisfied(
+        self, params: Sequence[click.Parameter], ctx: click.Context
+    ) -> bool:
+        if not _checks_values_as(self, RequireExactly):
+            return super().is_satisfied(params, ctx)
+        num_set = count_params_whose_value_is_set(params, ctx.params)
+        return num_set == self.num_params
+
+    def _estimated_cost(self) -> int:
+        return 1
+
     def __repr__(self) -> str:
         return make_repr(self, self.num_params)
 
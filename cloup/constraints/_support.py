@@ -1,12 +1,14 @@
 from typing import (
-    Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence,
+    Any, Callable, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Sequence,
     TYPE_CHECKING, Tuple, Union,
 )
 
 import click
 
 from ._core import Constraint
-from .common import join_param_labels
+from .common import get_param_name, join_param_labels, param_value_is_set
+from .._timings import measure_phase
+from .._tracing import trace_construction
 from .._util import first_bool
 from ..typing import Decorator, F
 
@@ -118,6 +120,57 @@ class BoundConstraint(NamedTuple):
         return param_list, constr_help
 
 
+class _ConstraintsPlan:
+    """A flat evaluation plan for a sequence of bound constraints.
+
+    Constraints that depend only on the number of set parameters (see
+    ``Constraint._get_accepted_counts``) are checked by counting the bits of a
+    mask, where each bit tells if a parameter is set. The mask is computed once
+    per check, so each parameter value is inspected only once, no matter how many
+    constraints it's involved in. Other constraints are checked calling
+    ``check_values()``. If a constraint is violated, ``check_values()`` is always
+    called to raise the usual error. Constraints are checked in order.
+    """
+
+    def __init__(self, constraints: Sequence[BoundConstraint]):
+        self.constraints = constraints
+        self.params: List[click.Parameter] = []
+        bit_by_param: Dict[int, int] = {}  # id(param) -> bit index
+        self.steps: List[Tuple[BoundConstraint, int, Optional[FrozenSet[int]]]] = []
+        for bound in constraints:
+            params = bound.params
+            counts = None
+            if len({id(param) for param in params}) == len(params):
+                counts = bound.constraint._get_accepted_counts(len(params))
+            mask = 0
+            if counts is not None:
+                for param in params:
+                    bit = bit_by_param.get(id(param))
+                    if bit is None:
+                        bit = bit_by_param[id(param)] = len(self.params)
+                        self.params.append(param)
+                    mask |= 1 << bit
+            self.steps.append((bound, mask, counts))
+
+    def get_set_mask(self, values: Dict[str, Any]) -> int:
+        mask = 0
+        for bit, param in enumerate(self.params):
+            if param_value_is_set(param, values[get_param_name(param)]):
+                mask |= 1 << bit
+        return mask
+
+    def check_values(self, ctx: click.Context) -> None:
+        set_mask: Optional[int] = None
+        for bound, mask, counts in self.steps:
+            if counts is None:
+                bound.check_values(ctx)
+                continue
+            if set_mask is None:
+                set_mask = self.get_set_mask(ctx.params)
+            if bin(set_mask & mask).count('1') not in counts:
+                bound.check_values(ctx)  # raises the error
+
+
 class ConstraintMixin:
     """Provides support for constraints."""
 
@@ -143,13 +196,20 @@ class ConstraintMixin:
             keyword arguments forwarded to the next class in the MRO
         """
         super().__init__(*args, **kwargs)
-
+        with trace_construction(
+            'constraints', getattr(self, 'callback', None) or getattr(self, 'name', None)
+        ):
+            self._init_constraints(constraints, show_constraints)
+
+    def _init_constraints(
+        self, constraints: Sequence[Union[BoundConstraintSpec, BoundConstraint]],
+        show_constraints: Optional[bool],
+    ) -> None:
         self.show_constraints = show_constraints
 
-        # This allows constraints to efficiently access parameters by name
-        self._params_by_name: Dict[str, click.Parameter] = {
-            param.name: param for param in self.params  # type: ignore
-        }
+        # This allows constraints to efficiently access parameters by name.
+        # It's built only when needed, since most commands don't need it.
+        self._params_by_name: Optional[Dict[str, click.Parameter]] = None
 
         # Collect constraints applied to option groups and bind them to the
         # corresponding Option instances
@@ -174,13 +234,20 @@ class ConstraintMixin:
         self.all_constraints = self.optgroup_constraints + self.param_constraints
         """All constraints applied to parameter/option groups of this command."""
 
+        # Compiled when constraints are first checked
+        self._constraints_plan: Optional[_ConstraintsPlan] = None
+
+        # The constraints that already passed the consistency checks (if any)
+        self._consistent_constraints: Optional[Sequence[BoundConstraint]] = None
+
     def parse_args(self, ctx: click.Context, args: List[str]) -> List[str]:
         # Check constraints' consistency *before* parsing
         if not ctx.resilient_parsing and Constraint.must_check_consistency(ctx):
-            for constr in self.all_constraints:
-                constr.check_consistency()
+            with measure_phase(ctx, 'consistency'):
+                self._check_constraints_consistency(ctx)
 
-        args = super().parse_args(ctx, args)  # type: ignore
+        with measure_phase(ctx, 'parsing'):
+            args = super().parse_args(ctx, args)  # type: ignore
 
         # Skip constraints checking if the user wants to see --help for subcommand
         # or if resilient parsing is enabled
@@ -191,11 +258,36 @@ class ConstraintMixin:
             return args
 
         # Check constraints
-        for constr in self.all_constraints:
-            constr.check_values(ctx)
+        plan = self._constraints_plan
+        if plan is None or plan.constraints is not self.all_constraints:
+            plan = self._constraints_plan = _ConstraintsPlan(self.all_constraints)
+        with measure_phase(ctx, 'constraints'):
+            plan.check_values(ctx)
         return args
 
+    def _check_constraints_consistency(self, ctx: click.Context) -> None:
+        # Consistency doesn't depend on user input: check once per process and,
+        # if enabled, reuse the outcome of previous runs.
+        constraints = self.all_constraints
+        if self._consistent_constraints is constraints:
+            return
+        key = None
+        if getattr(ctx, 'cache_constraints_consistency', None):
+            from ._consistency import (
+                get_consistency_key, is_known_consistent, mark_consistent)
+            key = get_consistency_key(constraints)
+        if key is None or not is_known_consistent(key):
+            for constr in constraints:
+                constr.check_consistency()
+            if key is not None:
+                mark_consistent(key)
+        self._consistent_constraints = constraints
+
     def get_param_by_name(self, name: str) -> click.Parameter:
+        if self._params_by_name is None:
+            self._params_by_name = {
+                param.name: param for param in self.params  # type: ignore
+            }
         try:
             return self._params_by_name[name]
         except KeyError:
@@ -49,6 +49,14 @@ def get_params_whose_value_is_set(
             if param_value_is_set(p, values[get_param_name(p)])]
 
 
+def count_params_whose_value_is_set(
+    params: Iterable[Parameter], values: Dict[str, Any]
+) -> int:
+    """Return the number of ``params`` that have a value, without building a list."""
+    return sum(1 for p in params
+               if param_value_is_set(p, values[get_param_name(p)]))
+
+
 def get_required_params(params: Iterable[Parameter]) -> List[Parameter]:
     return [p for p in params if p.required]
 
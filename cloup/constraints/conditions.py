@@ -6,14 +6,13 @@ Predicates should be treated as immutable objects, even though immutability
 is not (at the moment) enforced.
 """
 import abc
-from typing import Any, Dict, Generic, TypeVar
+from typing import Any, Dict, Generic, Tuple, TypeVar
 
 import click
 
 from ._support import ensure_constraints_support
 from .common import (
     get_param_labels,
-    get_param_name,
     join_with_and,
     param_label_by_name,
     param_value_by_name,
@@ -24,6 +23,36 @@ from .._util import make_repr
 P = TypeVar('P', bound='Predicate')
 
 
+def _get_params_set_table(ctx: click.Context) -> Dict[str, Tuple[Any, bool]]:
+    """Return a table mapping the name of each parameter to its value and to
+    whether that value is set; the table is attached to ``ctx`` and filled
+    lazily, so each parameter is looked up (and its value checked) once per
+    parsing, no matter how many predicates (e.g. nested in ``If`` constraints)
+    involve it. The table is reset if ``ctx.params`` is replaced."""
+    cached = getattr(ctx, '_cloup_params_set_table', None)
+    if cached is not None and cached[0] is ctx.params:
+        return cached[1]  # type: ignore
+    table: Dict[str, Tuple[Any, bool]] = {}
+    ctx._cloup_params_set_table = (ctx.params, table)  # type: ignore
+    return table
+
+
+def is_param_set(ctx: click.Context, param_name: str) -> bool:
+    """Return ``True`` if the parameter named ``param_name`` is set
+    (see :func:`~cloup.constraints.common.param_value_is_set`)."""
+    table = _get_params_set_table(ctx)
+    value = param_value_by_name(ctx, param_name)
+    entry = table.get(param_name)
+    # Values in ctx.params can be replaced in place (e.g. by callbacks)
+    if entry is not None and entry[0] is value:
+        return entry[1]
+    command = ensure_constraints_support(ctx.command)
+    param = command.get_param_by_name(param_name)
+    is_set = param_value_is_set(param, value)
+    table[param_name] = (value, is_set)
+    return is_set
+
+
 class Predicate(abc.ABC):
     """
     A ``Callable`` that takes a ``click.Context`` and returns a boolean, with an
@@ -168,10 +197,7 @@ class IsSet(Predicate):
         return '%s is not set' % param_label_by_name(ctx, self.param_name)
 
     def __call__(self, ctx: click.Context) -> bool:
-        command = ensure_constraints_support(ctx.command)
-        param = command.get_param_by_name(self.param_name)
-        value = param_value_by_name(ctx, self.param_name)
-        return param_value_is_set(param, value)
+        return is_param_set(ctx, self.param_name)
 
     def __and__(self, other: Predicate) -> Predicate:
         if isinstance(other, IsSet):
@@ -210,10 +236,7 @@ class AllSet(Predicate):
         return f'{join_with_and(labels)} are {pronoun} set'
 
     def __call__(self, ctx: click.Context) -> bool:
-        command = ensure_constraints_support(ctx.command)
-        params = command.get_params_by_name(self.param_names)
-        return all(param_value_is_set(param, ctx.params[get_param_name(param)])
-                   for param in params)
+        return all(is_param_set(ctx, name) for name in self.param_names)
 
     def __and__(self, other: Predicate) -> Predicate:
         if isinstance(other, AllSet):
@@ -249,10 +272,7 @@ class AnySet(Predicate):
         return f'any of {join_with_and(labels)} is set'
 
     def __call__(self, ctx: click.Context) -> bool:
-        command = ensure_constraints_support(ctx.command)
-        params = command.get_params_by_name(self.param_names)
-        return any(param_value_is_set(param, ctx.params[get_param_name(param)])
-                   for param in params)
+        return any(is_param_set(ctx, name) for name in self.param_names)
 
     def __or__(self, other: Predicate) -> Predicate:
         if isinstance(other, AnySet):
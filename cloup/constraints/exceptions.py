@@ -1,4 +1,4 @@
-from typing import Iterable, Sequence, TYPE_CHECKING
+from typing import Any, Callable, Iterable, Sequence, TYPE_CHECKING, Tuple, Union
 
 import click
 from click import Context, Parameter
@@ -8,6 +8,8 @@ from .common import join_param_labels
 if TYPE_CHECKING:
     from ._core import Constraint
 
+MessageOrFactory = Union[str, Callable[[], str]]
+
 
 def default_constraint_error(params: Iterable[Parameter], desc: str) -> str:
     return (
@@ -17,28 +19,64 @@ def default_constraint_error(params: Iterable[Parameter], desc: str) -> str:
 
 
 class ConstraintViolated(click.UsageError):
+    """Raised when a constraint is not satisfied.
+
+    The error carries the ``ctx``, the ``constraint`` and the ``params`` it was
+    checked against. The ``message`` can be passed as a function with no
+    arguments: in that case, it's called (once) only when the message is
+    actually needed, e.g. when the error is displayed. This avoids formatting
+    messages of errors that are caught and discarded (e.g. by operators)."""
+
+    _message: MessageOrFactory
+
     def __init__(
-        self, message: str,
+        self, message: MessageOrFactory,
         ctx: Context,
         constraint: 'Constraint',
         params: Sequence[click.Parameter]
     ):
-        super().__init__(message, ctx=ctx)
+        # Sets self.message and self.args; args are updated with the actual
+        # message once it's generated
+        super().__init__(message, ctx=ctx)  # type: ignore[arg-type]
         self.ctx = ctx
         self.constraint = constraint
         self.params = params
 
+    @property
+    def message(self) -> str:
+        if not isinstance(self._message, str):
+            self._message = self._message()
+            self.args = (self._message,)
+        return self._message
+
+    @message.setter
+    def message(self, value: MessageOrFactory) -> None:
+        self._message = value
+
+    def __str__(self) -> str:
+        return self.message
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.message!r})'
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (
+            type(self), (self.message, self.ctx, self.constraint, self.params))
+
     @classmethod
     def default(
         cls,
-        desc: str,
+        desc: MessageOrFactory,
         ctx: Context,
         constraint: 'Constraint',
         params: Sequence[Parameter],
     ) -> 'ConstraintViolated':
+        def make_message() -> str:
+            return default_constraint_error(
+                params, desc if isinstance(desc, str) else desc())
+
         return ConstraintViolated(
-            default_constraint_error(params, desc),
-            ctx=ctx, constraint=constraint, params=params,
+            make_message, ctx=ctx, constraint=constraint, params=params,
         )
 
 
@@ -3,13 +3,17 @@ from ._formatter import (
     HelpSection,
 )
 from ._util import (
+    ColumnWidths,
+    display_width,
     ensure_is_cloup_formatter,
     unstyled_len,
 )
 
 __all__ = [
+    "ColumnWidths",
     "HelpFormatter",
     "HelpSection",
+    "display_width",
     "ensure_is_cloup_formatter",
     "unstyled_len",
 ]
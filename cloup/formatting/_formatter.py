@@ -2,20 +2,18 @@ import dataclasses as dc
 import inspect
 import shutil
 import textwrap
-from itertools import chain
 from typing import (
     Any, Callable, Dict, Iterable, Iterator, Optional, Sequence, TYPE_CHECKING,
-    Tuple, Union,
+    TextIO, Tuple, Union,
 )
 
 from cloup._util import click_version_ge_8_1
-from cloup.formatting._util import unstyled_len
+from cloup.formatting._util import ColumnWidths, display_width, wrap_lines, wrap_rows
 
 if TYPE_CHECKING:
     from .sep import RowSepPolicy, SepGenerator
 
 import click
-from click.formatting import wrap_text
 
 from cloup._util import (
     check_positive_int, identity, indent_lines, make_repr,
@@ -43,6 +41,12 @@ class HelpSection:
     constraint: Optional[str] = None
     """(Optional) option group constraint description."""
 
+    col1_widths: Optional[ColumnWidths] = None
+    """(Optional) display widths of the first column of ``definitions``, if they
+    are known in advance (e.g. maintained while subcommands are added to a
+    ``Section``); when provided, the formatter uses them to compute the width of
+    the first column instead of scanning ``definitions``."""
+
 
 # noinspection PyMethodMayBeStatic
 class HelpFormatter(click.HelpFormatter):
@@ -101,6 +105,20 @@ class HelpFormatter(click.HelpFormatter):
     :param theme:
         an :class:`~cloup.HelpTheme` instance specifying how to style the various
         elements of the help page.
+    :param sink:
+        if provided, the formatter works in "streaming mode": while a help page
+        is rendered, the usage and each completed help section are written to
+        this text stream (e.g. ``sys.stdout`` or the stdin of a pager) as soon
+        as they are produced, instead of being kept in the buffer until
+        :meth:`getvalue` is called. The usage rendered for error messages is
+        never written to the sink. Trailing newlines
+        are kept in the buffer, so that the output of ``Command.get_help()``
+        followed by ``click.echo()`` is identical to the non-streaming mode.
+    :param color:
+        used in streaming mode only; same as the ``color`` argument of
+        ``click.echo()``, used to write to the sink: if ``None`` (default), ANSI
+        styles are stripped unless the sink is a terminal. When the formatter is
+        created by a :class:`~cloup.Context`, it defaults to ``ctx.color``.
     """
 
     def __init__(
@@ -112,6 +130,8 @@ class HelpFormatter(click.HelpFormatter):
         col_spacing: int = 2,
         row_sep: Union[None, str, 'SepGenerator', 'RowSepPolicy'] = None,
         theme: HelpTheme = HelpTheme(),
+        sink: Optional[TextIO] = None,
+        color: Optional[bool] = None,
     ):
         check_positive_int(col1_max_width, 'col1_max_width')
         check_positive_int(col_spacing, 'col_spacing')
@@ -139,6 +159,8 @@ class HelpFormatter(click.HelpFormatter):
         self.col_spacing = col_spacing
         self.theme = theme
         self.row_sep = row_sep
+        self.sink = sink
+        self.color = color
 
     @staticmethod
     def settings(
@@ -150,6 +172,8 @@ class HelpFormatter(click.HelpFormatter):
         col_spacing: Possibly[int] = MISSING,
         row_sep: Possibly[Union[None, str, 'SepGenerator', 'RowSepPolicy']] = MISSING,
         theme: Possibly[HelpTheme] = MISSING,
+        sink: Possibly[Optional[TextIO]] = MISSING,
+        color: Possibly[Optional[bool]] = MISSING,
     ) -> Dict[str, Any]:
         """A utility method for creating a ``formatter_settings`` dictionary to
         pass as context settings or command attribute. This method exists for
@@ -160,6 +184,16 @@ class HelpFormatter(click.HelpFormatter):
         """
         return pick_non_missing(locals())
 
+    @property
+    def theme(self) -> HelpTheme:
+        return self._theme
+
+    @theme.setter
+    def theme(self, theme: HelpTheme) -> None:
+        self._theme = theme
+        # Used for the actual styling; see HelpTheme.compiled()
+        self._styles = theme.compiled()
+
     @property
     def available_width(self) -> int:
         return self.width - self.current_indent
@@ -167,17 +201,29 @@ class HelpFormatter(click.HelpFormatter):
     def write(self, *strings: str) -> None:
         self.buffer += strings
 
+    def flush(self) -> None:
+        """In streaming mode (see the ``sink`` argument), write the buffered
+        content to the sink, excluding trailing newlines, which are kept in the
+        buffer. Otherwise, it does nothing."""
+        if self.sink is None:
+            return
+        text = ''.join(self.buffer)
+        content = text.rstrip('\n')
+        if content:
+            click.echo(content, file=self.sink, nl=False, color=self.color)
+        self.buffer = [text[len(content):]] if len(content) < len(text) else []
+
     def write_usage(
         self, prog: str, args: str = "", prefix: Optional[str] = 'Usage:'
     ) -> None:
         if prefix:
-            prefix = self.theme.heading(prefix + ' ')
-        prog = self.theme.invoked_command(prog)
+            prefix = self._styles.heading(prefix + ' ')
+        prog = self._styles.invoked_command(prog)
         super().write_usage(prog, args, prefix)
 
     def write_aliases(self, aliases: Sequence[str]) -> None:
         self.write_heading("Aliases", newline=False)
-        alias_list = ", ".join(self.theme.col1(alias) for alias in aliases)
+        alias_list = ", ".join(self._styles.col1(alias) for alias in aliases)
         self.write(f" {alias_list}\n")
 
     def write_command_help_text(self, cmd: click.Command) -> None:
@@ -189,12 +235,12 @@ class HelpFormatter(click.HelpFormatter):
         if help_text:
             self.write_paragraph()
             with self.indentation():
-                self.write_text(help_text, style=self.theme.command_help)
+                self.write_text(help_text, style=self._styles.command_help)
 
     def write_heading(self, heading: str, newline: bool = True) -> None:
         if self.current_indent:
             self.write(" " * self.current_indent)
-        self.write(self.theme.heading(heading + ":"))
+        self.write(self._styles.heading(heading + ":"))
         if newline:
             self.write('\n')
 
@@ -209,19 +255,22 @@ class HelpFormatter(click.HelpFormatter):
 
     def write_aligned_sections(self, sections: Sequence[HelpSection]) -> None:
         """Write multiple aligned definition lists."""
-        all_rows = chain.from_iterable(dl.definitions for dl in sections)
-        col1_width = self.compute_col1_width(all_rows, self.col1_max_width)
+        col1_width = max(
+            (self.compute_section_col1_width(s, self.col1_max_width)
+             for s in sections),
+            default=0,
+        )
         for s in sections:
             self.write_section(s, col1_width=col1_width)
 
     def write_section(self, s: HelpSection, col1_width: Optional[int] = None) -> None:
-        theme = self.theme
+        theme = self._styles
         self.write("\n")
         self.write_heading(s.heading, newline=not s.constraint)
         if s.constraint:
             constraint_text = f'[{s.constraint}]'
-            available_width = self.available_width - len(s.heading) - len(': ')
-            if len(constraint_text) <= available_width:
+            available_width = self.available_width - display_width(s.heading) - len(': ')
+            if display_width(constraint_text) <= available_width:
                 self.write(" ", theme.constraint(constraint_text), "\n")
             else:
                 self.write("\n")
@@ -231,11 +280,14 @@ class HelpFormatter(click.HelpFormatter):
         with self.indentation():
             if s.help:
                 self.write_text(s.help, theme.section_help)
+            if col1_width is None and s.col1_widths is not None:
+                col1_width = s.col1_widths.max_under(
+                    min(self.col1_max_width, self.available_width))
             self.write_dl(s.definitions, col1_width=col1_width)
+        self.flush()
 
     def write_text(self, text: str, style: IStyle = identity) -> None:
-        wrapped = wrap_text(
-            text, self.width - self.current_indent, preserve_paragraphs=True)
+        wrapped = '\n'.join(wrap_lines(text, self.width - self.current_indent))
         if style is identity:
             wrapped_text = textwrap.indent(wrapped, prefix=' ' * self.current_indent)
         else:
@@ -245,10 +297,17 @@ class HelpFormatter(click.HelpFormatter):
         self.write(wrapped_text, "\n")
 
     def compute_col1_width(self, rows: Iterable[Definition], max_width: int) -> int:
-        col1_lengths = (unstyled_len(r[0]) for r in rows)
+        col1_lengths = (display_width(r[0]) for r in rows)
         lengths_under_limit = (length for length in col1_lengths if length <= max_width)
         return max(lengths_under_limit, default=0)
 
+    def compute_section_col1_width(self, s: HelpSection, max_width: int) -> int:
+        """Like :meth:`compute_col1_width` for the definitions of a section;
+        ``s.col1_widths`` is used when available."""
+        if s.col1_widths is not None:
+            return s.col1_widths.max_under(max_width)
+        return self.compute_col1_width(s.definitions, max_width)
+
     def write_dl(
         self, rows: Sequence[Definition],
         col_max: Optional[int] = None,  # default changed to None wrt parent class
@@ -333,38 +392,33 @@ class HelpFormatter(click.HelpFormatter):
         )
         indentation = " " * self.current_indent
 
-        # Note: iter_defs() resolves eventual callables in row[1]
+        # Note: iter_defs() resolves eventual callables in row[1] (only once)
         text_rows = list(iter_defs(rows, col2_width))
         row_sep = self._get_row_sep_for(text_rows, (col1_width, col2_width), col_spacing)
-        col1_styler, col2_styler = self.theme.col1, self.theme.col2
+        col1_styler, col2_styler = self._styles.col1, self._styles.col2
+        # All 2nd-column texts are wrapped in a single pass
+        wrapped_rows = wrap_rows([second for _, second in text_rows], col2_width)
 
-        def write_row(row: Tuple[str, str]) -> None:
-            first, second = row
+        def write_row(first: str, second: str, lines: Tuple[str, ...]) -> None:
             self.write(indentation, col1_styler(first))
             if not second:
                 self.write("\n")
             else:
-                first_display_length = unstyled_len(first)
+                first_display_length = display_width(first)
                 if first_display_length <= col1_width:
                     spaces_to_col2 = col1_plus_spacing - first_display_length
                     self.write(" " * spaces_to_col2)
                 else:
                     self.write("\n", col2_indentation)
 
-                if len(second) <= col2_width:
-                    self.write(col2_styler(second), "\n")
-                else:
-                    wrapped_text = wrap_text(second, col2_width, preserve_paragraphs=True)
-                    lines = [col2_styler(line) for line in wrapped_text.splitlines()]
-                    self.write(lines[0], "\n")
-                    for line in lines[1:]:
-                        self.write(col2_indentation, line, "\n")
-
-        write_row(text_rows[0])
-        for row in text_rows[1:]:
-            if row_sep is not None:
+                self.write(col2_styler(lines[0]), "\n")
+                for line in lines[1:]:
+                    self.write(col2_indentation, col2_styler(line), "\n")
+
+        for i, (row, lines) in enumerate(zip(text_rows, wrapped_rows)):
+            if i and row_sep is not None:
                 self.write(indentation, row_sep, "\n")
-            write_row(row)
+            write_row(row[0], row[1], lines)
 
     def write_linear_dl(self, dl: Sequence[Definition]) -> None:
         """Format a definition list as a "linear list". This is the default when
@@ -375,8 +429,8 @@ class HelpFormatter(click.HelpFormatter):
         help_max_width = self.width - help_total_indent
         current_indentation = " " * self.current_indent
 
-        col1_styler = self.theme.col1
-        col2_styler = self.theme.col2
+        col1_styler = self._styles.col1
+        col2_styler = self._styles.col2
 
         for names, help in iter_defs(dl, help_max_width):
             self.write(current_indentation + col1_styler(names) + '\n')
@@ -388,7 +442,8 @@ class HelpFormatter(click.HelpFormatter):
         self.buffer.pop()  # pop last newline
 
     def write_epilog(self, epilog: str) -> None:
-        self.write_text(epilog, self.theme.epilog)
+        self.write_text(epilog, self._styles.epilog)
+        self.flush()
 
     def __repr__(self) -> str:
         return make_repr(
@@ -1,6 +1,10 @@
-from typing import TYPE_CHECKING
+import unicodedata
+from bisect import bisect_right, insort
+from functools import lru_cache
+from typing import Iterable, List, Sequence, TYPE_CHECKING, Tuple
 
 import click
+from click.formatting import wrap_text
 
 if TYPE_CHECKING:
     import cloup
@@ -24,4 +28,80 @@ def ensure_is_cloup_formatter(formatter: click.HelpFormatter) -> 'cloup.HelpForm
 
 
 def unstyled_len(string: str) -> int:
+    """Return the length of ``string`` excluding ANSI styles."""
+    if '\x1b' not in string:
+        return len(string)
     return len(click.unstyle(string))
+
+
+# Zero-width characters: non-spacing and enclosing marks and format characters
+_ZERO_WIDTH_CATEGORIES = frozenset({'Mn', 'Me', 'Cf'})
+
+
+@lru_cache(maxsize=8192)
+def display_width(string: str) -> int:
+    """Return the number of terminal columns needed to display ``string``.
+    ANSI styles are ignored, East Asian wide and fullwidth characters count as
+    2 columns and combining/format characters as 0. Results are cached, since
+    the formatter computes the width of the same strings many times."""
+    if '\x1b' in string:
+        string = click.unstyle(string)
+    if string.isascii():
+        return len(string)
+    width = 0
+    for char in string:
+        if unicodedata.category(char) in _ZERO_WIDTH_CATEGORIES:
+            continue
+        width += 2 if unicodedata.east_asian_width(char) in 'WF' else 1
+    return width
+
+
+@lru_cache(maxsize=4096)
+def wrap_lines(text: str, width: int) -> Tuple[str, ...]:
+    """Wrap ``text`` to ``width`` columns (preserving paragraphs like
+    ``click.formatting.wrap_text``) and return the resulting lines. Results are
+    cached by ``(text, width)``: the same help strings are usually wrapped with
+    the same width many times (e.g. in tests or when the help is re-rendered)."""
+    return tuple(wrap_text(text, width, preserve_paragraphs=True).splitlines())
+
+
+def wrap_rows(texts: Sequence[str], width: int) -> List[Tuple[str, ...]]:
+    """Wrap a batch of texts (e.g. the 2nd column of a definition list) to the
+    same ``width``. Texts that fit in ``width`` are not passed to the wrapper."""
+    return [
+        (text,) if display_width(text) <= width else wrap_lines(text, width)
+        for text in texts
+    ]
+
+
+class ColumnWidths:
+    """A sorted multiset of display widths of the first column of a definition
+    list. It's maintained incrementally (as rows are added or removed), so that
+    the width of the first column, i.e. the largest width not exceeding a
+    maximum, can be found without scanning all rows."""
+
+    def __init__(self, widths: Iterable[int] = ()):
+        self._widths = sorted(widths)
+
+    @classmethod
+    def of(cls, strings: Iterable[str]) -> 'ColumnWidths':
+        return cls(map(display_width, strings))
+
+    def add(self, width: int) -> None:
+        insort(self._widths, width)
+
+    def remove(self, width: int) -> None:
+        """Remove one occurrence of ``width``; raise ``ValueError`` if missing."""
+        self._widths.remove(width)
+
+    def max_under(self, max_width: int) -> int:
+        """Return the largest width less than or equal to ``max_width``
+        (0 if there's none)."""
+        i = bisect_right(self._widths, max_width)
+        return self._widths[i - 1] if i else 0
+
+    def __len__(self) -> int:
+        return len(self._widths)
+
+    def __repr__(self) -> str:
+        return f'ColumnWidths({self._widths})'
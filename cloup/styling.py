@@ -3,7 +3,8 @@ This module contains components that specifically address the styling and themin
 of the ``--help`` output.
 """
 import dataclasses as dc
-from typing import Any, Callable, Dict, NamedTuple, Optional
+from functools import lru_cache
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
 
 import click
 
@@ -81,6 +82,17 @@ class HelpTheme(NamedTuple):
             return self._replace(**kwargs)
         return self
 
+    def compiled(self) -> 'HelpTheme':
+        """Return an equivalent theme where each :class:`Style` is replaced by
+        the plain function returned by :meth:`Style.compile`. Other styles are
+        left as they are. Compiled themes are cached, so calling this method
+        many times with equal themes is cheap. This is used by the formatter
+        to minimize the cost of styling each row of a help page."""
+        try:
+            return _compile_theme(self)
+        except TypeError:  # unhashable style
+            return _compile_theme.__wrapped__(self)
+
     @staticmethod
     def dark() -> "HelpTheme":
         """A theme assuming a dark terminal background color."""
@@ -147,22 +159,52 @@ class Style:
     strikethrough: Optional[bool] = None
     text_transform: Optional[IStyle] = None
 
-    _style_kwargs: Optional[Dict[str, Any]] = dc.field(init=False, default=None)
-
-    def __call__(self, text: str) -> str:
-        if self._style_kwargs is None:
-            kwargs = dc.asdict(self)
-            delete_keys(kwargs, ['text_transform', '_style_kwargs'])
+    _codes: Optional[Tuple[str, str]] = dc.field(
+        init=False, default=None, repr=False, compare=False)
+
+    def _get_codes(self) -> Tuple[str, str]:
+        """Return the (prefix, suffix) pair of ANSI codes surrounding the styled
+        text. They are computed with ``click.style`` only once."""
+        if self._codes is None:
+            kwargs: Dict[str, Any] = {
+                field.name: getattr(self, field.name)
+                for field in dc.fields(self) if field.init
+            }
+            delete_keys(kwargs, ['text_transform'])
             if int(click_version_tuple[0]) < 8:
                 # These arguments are not supported in Click < 8. Ignore them.
                 delete_keys(kwargs, ['overline', 'italic', 'strikethrough'])
-            object.__setattr__(self, '_style_kwargs', kwargs)
+            prefix = click.style('', reset=False, **kwargs)
+            suffix = click.style('', **kwargs)[len(prefix):]
+            object.__setattr__(self, '_codes', (prefix, suffix))
+        return self._codes  # type: ignore
+
+    def compile(self) -> IStyle:
+        """Return a plain function equivalent to this style, which just
+        concatenates the precomputed ANSI codes to the (transformed) text."""
+        prefix, suffix = self._get_codes()
+        text_transform = self.text_transform
+        if text_transform is None:
+            def style(text: str) -> str:
+                return prefix + text + suffix
         else:
-            kwargs = self._style_kwargs
+            def style(text: str) -> str:
+                return prefix + text_transform(text) + suffix
+        return style
 
+    def __call__(self, text: str) -> str:
+        prefix, suffix = self._get_codes()
         if self.text_transform:
             text = self.text_transform(text)
-        return click.style(text, **kwargs)
+        return prefix + text + suffix
+
+
+@lru_cache(maxsize=32)
+def _compile_theme(theme: HelpTheme) -> HelpTheme:
+    return HelpTheme(*(
+        style.compile() if isinstance(style, Style) else style
+        for style in theme
+    ))
 
 
 class Color(FrozenSpace):
@@ -348,3 +348,31 @@ class TestAnySet:
         assert AnySet('a', 'b') == AnySet('a', 'b')
         assert AnySet('a') != AnySet('a', 'b')
         assert AnySet('a', 'b') != AllSet('a', 'b')
+
+
+def test_parameters_are_looked_up_once_per_parsing(sample_cmd, monkeypatch):
+    ctx = make_context(sample_cmd, 'arg1 --bool-opt=0 --flag2')
+    get_param_by_name = Mock(wraps=sample_cmd.get_param_by_name)
+    monkeypatch.setattr(sample_cmd, 'get_param_by_name', get_param_by_name)
+    predicates = [
+        IsSet('arg1'), AllSet('arg1', 'flag2'), AnySet('flag', 'flag2'),
+        IsSet('arg1') & IsSet('flag') | AnySet('flag2', 'arg1'),
+    ]
+    assert [p(ctx) for p in predicates] == [True, True, True, True]
+    assert [p(ctx) for p in predicates] == [True, True, True, True]
+    assert sorted(call.args[0] for call in get_param_by_name.call_args_list) == [
+        'arg1', 'flag', 'flag2']
+
+    ctx.params = {**ctx.params, 'arg1': None}  # new params, new table
+    assert not IsSet('arg1')(ctx)
+
+
+def test_parameters_set_in_place_are_looked_up_again(sample_cmd):
+    ctx = make_context(sample_cmd, 'arg1 --flag2')
+    assert IsSet('arg1')(ctx)
+    assert not IsSet('flag')(ctx)
+    # e.g. done by a parameter callback
+    ctx.params['arg1'] = None
+    ctx.params['flag'] = True
+    assert not IsSet('arg1')(ctx)
+    assert IsSet('flag')(ctx)
@@ -1,3 +1,4 @@
+import pickle
 from functools import partial
 from typing import Sequence
 from unittest import mock
@@ -11,11 +12,17 @@ from pytest import mark
 from cloup.constraints import (
     AcceptAtMost,
     AcceptBetween,
+    And,
     Constraint,
     ErrorFmt,
+    If,
+    Or,
     Rephraser,
     RequireAtLeast,
     RequireExactly,
+    accept_none,
+    all_or_none,
+    mutually_exclusive,
     require_all,
 )
 from cloup.constraints.exceptions import ConstraintViolated, UnsatisfiableConstraint
@@ -337,6 +344,16 @@ class TestRephraser:
         assert isinstance(error.constraint, Constraint)
         assert len(error.params) == 3
 
+    def test_original_error_is_used_if_rephrased_error_is_empty(self):
+        fake_ctx = make_fake_context(make_options('abc'))
+        wrapped = FakeConstraint(satisfied=False, error='__error__')
+        rephrased = Rephraser(wrapped, error=lambda err: '')
+        with pytest.raises(ConstraintViolated) as exc_info:
+            rephrased.check(['a', 'b'], ctx=fake_ctx)
+        assert exc_info.value.message == '__error__'
+        # The original error is re-raised
+        assert exc_info.value.constraint is wrapped
+
     def test_check_consistency_raises_if_wrapped_constraint_raises(self):
         constraint = FakeConstraint(consistent=True)
         rephraser = Rephraser(constraint, help='help')
@@ -349,3 +366,129 @@ class TestRephraser:
         params = make_options('abc')
         with pytest.raises(UnsatisfiableConstraint):
             rephraser.check_consistency(params)
+
+
+class RequireAtLeastWithCustomCheck(RequireAtLeast):
+    def check_values(self, params, ctx):
+        pass
+
+
+@pytest.mark.parametrize('constraint, expected', [
+    pytest.param(require_all, {3}, id='require_all'),
+    pytest.param(RequireAtLeast(2), {2, 3}, id='RequireAtLeast'),
+    pytest.param(AcceptAtMost(1), {0, 1}, id='AcceptAtMost'),
+    pytest.param(AcceptAtMost(5), {0, 1, 2, 3}, id='AcceptAtMost_more_than_params'),
+    pytest.param(RequireExactly(2), {2}, id='RequireExactly'),
+    pytest.param(AcceptBetween(1, 2), {1, 2}, id='AcceptBetween'),
+    pytest.param(mutually_exclusive, {0, 1}, id='mutually_exclusive'),
+    pytest.param(accept_none, {0}, id='accept_none'),
+    pytest.param(all_or_none, {0, 3}, id='all_or_none'),
+    pytest.param(RequireAtLeast(1) & AcceptAtMost(2), {1, 2}, id='And'),
+    pytest.param(If('a', then=require_all), None, id='If'),
+    pytest.param(RequireAtLeast(1) | FakeConstraint(), None, id='Or_with_unknown'),
+    pytest.param(RequireAtLeastWithCustomCheck(1), None, id='overridden_check'),
+])
+def test_accepted_counts(constraint, expected):
+    counts = constraint._get_accepted_counts(3)
+    assert counts == (None if expected is None else frozenset(expected))
+
+
+@pytest.mark.parametrize('constraint', [
+    pytest.param(require_all, id='require_all'),
+    pytest.param(RequireAtLeast(2), id='RequireAtLeast'),
+    pytest.param(AcceptAtMost(1), id='AcceptAtMost'),
+    pytest.param(RequireExactly(2), id='RequireExactly'),
+    pytest.param(AcceptBetween(1, 2), id='AcceptBetween'),
+    pytest.param(mutually_exclusive, id='mutually_exclusive'),
+    pytest.param(all_or_none, id='all_or_none'),
+    pytest.param(If('a', then=require_all, else_=accept_none), id='If'),
+    pytest.param(require_all | RequireExactly(1), id='Or'),
+    pytest.param(RequireAtLeast(1) & AcceptAtMost(2), id='And'),
+    pytest.param(RequireAtLeastWithCustomCheck(3), id='overridden_check'),
+])
+@pytest.mark.parametrize('set_mask', range(8))
+def test_is_satisfied_agrees_with_check_values(constraint, set_mask):
+    params = make_options('abc')
+    ctx = make_fake_context(params)
+    ctx.params = {p.name: 'v' if set_mask & (1 << i) else None
+                  for i, p in enumerate(params)}
+    satisfied = constraint.is_satisfied(params, ctx)
+    with should_raise(ConstraintViolated, when=not satisfied):
+        constraint.check_values(params, ctx)
+
+
+def test_operators_evaluate_cheaper_operands_first():
+    params = make_options('abc')
+    ctx = make_fake_context(params)
+    ctx.params = dict.fromkeys('abc')
+    expensive = Mock(wraps=FakeConstraint(satisfied=True))
+    expensive._estimated_cost.return_value = 10
+    assert Or(expensive, accept_none)._constraints_by_cost[0] is accept_none
+
+    Or(expensive, accept_none).check_values(params, ctx)
+    expensive.is_satisfied.assert_not_called()
+    with pytest.raises(ConstraintViolated, match='at least 1 of'):
+        And(expensive, RequireAtLeast(1)).check_values(params, ctx)
+    expensive.is_satisfied.assert_not_called()
+
+
+def test_operators_build_only_the_final_error():
+    params = make_options('abc')
+    ctx = make_fake_context(params)
+    ctx.params = dict.fromkeys('abc')
+    with mock.patch.object(ConstraintViolated, '__init__', return_value=None) as init:
+        all_or_none.check_values(params, ctx)
+        (require_all | RequireAtLeast(1) | accept_none).check_values(params, ctx)
+        init.assert_not_called()
+
+    # Errors are the same no matter the evaluation order
+    a, b = RequireAtLeast(2), FakeConstraint(satisfied=False, error='b error')
+    with pytest.raises(ConstraintViolated, match='at least 2 of'):
+        (a & b).check_values(params, ctx)
+    with pytest.raises(ConstraintViolated, match='b error'):
+        (b & a).check_values(params, ctx)
+
+
+@pytest.mark.parametrize('constraint, set_params', [
+    pytest.param(require_all, 'a', id='require_all'),
+    pytest.param(RequireAtLeast(2), 'a', id='RequireAtLeast'),
+    pytest.param(AcceptAtMost(0), 'a', id='AcceptAtMost'),
+    pytest.param(RequireExactly(2), 'a', id='RequireExactly'),
+    pytest.param(mutually_exclusive, 'ab', id='mutually_exclusive'),
+    pytest.param(all_or_none, 'a', id='all_or_none'),
+    pytest.param(If('a', then=RequireExactly(2)), 'a', id='If'),
+    pytest.param(require_all | accept_none, 'a', id='Or'),
+])
+def test_error_messages_are_formatted_lazily(constraint, set_params):
+    params = make_options('abc')
+    ctx = make_fake_context(params)
+    ctx.params = {name: 'v' if name in set_params else None for name in 'abc'}
+    with pytest.raises(ConstraintViolated) as exc_info:
+        constraint.check_values(params, ctx)
+    err = exc_info.value
+
+    with mock.patch('cloup.constraints._core.format_param_list') as format_list, \
+            mock.patch('cloup.constraints.exceptions.join_param_labels') as join_labels:
+        assert err.constraint is constraint
+        assert err.params is params
+        format_list.assert_not_called()
+        join_labels.assert_not_called()
+    message = err.message
+    assert message and str(err) == message
+    assert err.message is message  # rendered only once
+
+
+def test_lazy_error_message_is_used_by_str_args_and_pickle():
+    cmd = Command('cmd', params=make_options('abc'))
+    ctx = make_context(cmd, '--a=1 --b=2')
+    err = ConstraintViolated(
+        lambda: 'lazy message', ctx=ctx, constraint=mutually_exclusive,
+        params=cmd.params)
+    assert str(err) == 'lazy message'
+    assert err.args == ('lazy message',)
+    assert repr(err) == "ConstraintViolated('lazy message')"
+    loaded = pickle.loads(pickle.dumps(err))
+    assert str(loaded) == 'lazy message'
+    assert loaded.args == ('lazy message',)
+    assert repr(loaded.constraint) == repr(mutually_exclusive)
+    assert [p.name for p in loaded.params] == ['a', 'b', 'c']
@@ -1,3 +1,4 @@
+from unittest import mock
 from unittest.mock import Mock
 
 import click
@@ -8,8 +9,10 @@ import cloup
 from cloup import Context
 from cloup._util import pick_non_missing, reindent
 from cloup.constraints import (
-    Constraint, RequireAtLeast, mutually_exclusive, require_all, require_one
+    BoundConstraintSpec, Constraint, If, RequireAtLeast, UnsatisfiableConstraint,
+    accept_none, all_or_none, mutually_exclusive, require_all, require_one,
 )
+from cloup.constraints._support import BoundConstraint
 from cloup.typing import MISSING
 from tests.constraints.test_constraints import FakeConstraint
 from tests.util import new_dummy_func, pick_first_bool
@@ -222,3 +225,100 @@ def test_group_constraints_doesnt_prevent_displaying_help_in_subcommand(runner):
 
     res = runner.invoke(cli, ["subgroup", "subcommand", "--help"])
     assert res.exit_code == 0, res.output
+
+
+@pytest.mark.parametrize('args', [
+    pytest.param('', id='none'),
+    pytest.param('-a 1 -b 2', id='mutually_exclusive'),
+    pytest.param('-a 1 -c 3', id='require_one'),
+    pytest.param('-c 3', id='all_or_none'),
+    pytest.param('-a 1 -c 3 -d 4 -e 5', id='custom'),
+    pytest.param('-a 1 -c 3 -d 4', id='valid'),
+])
+def test_constraints_plan_preserves_errors(runner, args):
+    constraints = [
+        BoundConstraintSpec(mutually_exclusive, ['a', 'b']),
+        BoundConstraintSpec(require_one, ['a', 'b']),
+        BoundConstraintSpec(all_or_none, ['c', 'd']),
+        BoundConstraintSpec(If('e', then=accept_none), ['a', 'c']),
+    ]
+
+    class RefCommand(cloup.Command):
+        """Checks constraints one by one calling check_values()."""
+
+        def parse_args(self, ctx, args):
+            args = click.Command.parse_args(self, ctx, args)
+            for constr in self.all_constraints:
+                constr.check_values(ctx)
+            return args
+
+    def make_cmd(cls):
+        return cls(
+            name='cmd', params=[Option([f'-{name}']) for name in 'abcde'],
+            callback=new_dummy_func(), constraints=constraints,
+        )
+
+    res = runner.invoke(make_cmd(cloup.Command), args.split())
+    ref_res = runner.invoke(make_cmd(RefCommand), args.split())
+    assert res.exit_code == ref_res.exit_code
+    assert res.output == ref_res.output
+
+
+class TestConsistencyChecksCaching:
+    @staticmethod
+    def make_cmd(cache=None, required=False):
+        @cloup.command(context_settings=Context.settings(
+            cache_constraints_consistency=cache))
+        @cloup.option('--a', required=required)
+        @cloup.option('--b')
+        @cloup.constraint(mutually_exclusive, ['a', 'b'])
+        def cmd(a, b):
+            pass
+
+        return cmd
+
+    @pytest.fixture()
+    def count_checks(self):
+        with mock.patch.object(
+            BoundConstraint, 'check_consistency', autospec=True,
+            side_effect=BoundConstraint.check_consistency,
+        ) as mocked:
+            yield mocked
+
+    def test_consistency_is_checked_once_per_command(self, runner, count_checks):
+        cmd = self.make_cmd()
+        for _ in range(3):
+            assert runner.invoke(cmd, ['--a=1']).exit_code == 0
+        assert count_checks.call_count == 1
+        runner.invoke(self.make_cmd(), ['--a=1'])
+        assert count_checks.call_count == 2
+
+    def test_consistency_is_persisted_if_enabled(
+        self, runner, count_checks, tmp_path, monkeypatch
+    ):
+        monkeypatch.setenv('CLOUP_CACHE_DIR', str(tmp_path))
+        for _ in range(2):
+            assert runner.invoke(self.make_cmd(cache=True), []).exit_code == 0
+        assert count_checks.call_count == 1
+        assert len(list(tmp_path.glob('*/consistency/*'))) == 1
+
+        # Changing parameter declarations invalidates the cached outcome
+        res = runner.invoke(self.make_cmd(cache=True, required=True), ['--a=1'])
+        assert res.exit_code == 0
+        assert count_checks.call_count == 2
+
+    def test_inconsistent_constraints_are_not_persisted(self, tmp_path, monkeypatch):
+        monkeypatch.setenv('CLOUP_CACHE_DIR', str(tmp_path))
+
+        @cloup.command(context_settings=Context.settings(
+            cache_constraints_consistency=True))
+        @cloup.option('--a', required=True)
+        @cloup.option('--b', required=True)
+        @cloup.constraint(mutually_exclusive, ['a', 'b'])
+        def cmd(a, b):
+            pass
+
+        for _ in range(2):
+            with pytest.raises(UnsatisfiableConstraint):
+                cmd.main(['--a=1', '--b=2'], standalone_mode=False)
+        assert not list(tmp_path.glob('*/consistency/*'))
@@ -1,3 +1,5 @@
+from contextlib import nullcontext
+
 import click
 import pytest
 
@@ -168,3 +170,101 @@ def test_cloup_subgroup_help(cli, runner):
           --help  Show this message and exit.
     """)
     assert res.output == expected
+
+
+@pytest.mark.parametrize('name, aliases', [
+    ('other', ['i']),
+    ('other', ['install']),
+    ('i', []),
+])
+def test_clashing_names_and_aliases_are_rejected(cli, name, aliases):
+    with pytest.raises(ValueError, match='clashes with'):
+        cli.add_command(cloup.Command(name, aliases=aliases))
+    assert name not in cli.commands
+    assert cli.alias2name['i'] == 'install'
+
+
+def test_failed_add_command_leaves_aliases_unchanged():
+    cli = cloup.Group('cli')
+    section = cloup.Section('Section', [cloup.Command('a')])
+    cli.add_section(section)
+    alias2name = dict(cli.alias2name)
+    with pytest.raises(Exception, match='already exists'):
+        cli.add_command(cloup.Command('a', aliases=['x']), section=section)
+    with pytest.raises(Exception, match='already exists'):
+        cli.add_commands([cloup.Command('a', aliases=['y'])], section=section)
+    assert cli.alias2name == alias2name
+    assert cli.resolve_command_name(cloup.Context(cli), 'x') is None
+    assert cli.resolve_command_name(cloup.Context(cli), 'y') is None
+
+
+@pytest.mark.parametrize('add_many', [False, True], ids=['add_command', 'add_commands'])
+def test_readding_a_command_replaces_its_aliases(runner, add_many):
+    cli = cloup.Group('cli', prefix_matching=True)
+    cli.add_command(cloup.Command('deploy', aliases=['dep', 'ship']))
+    ctx = cloup.Context(cli)
+    assert cli.resolve_command_name(ctx, 'sh') == 'deploy'  # build the prefix index
+    new_cmd = cloup.Command('deploy', aliases=['push'], callback=lambda: print('new'))
+    # Sections don't accept duplicate names, so it's added to another section
+    section = cloup.Section('New')
+    if add_many:
+        cli.add_commands([new_cmd], section=section)
+    else:
+        cli.add_command(new_cmd, section=section)
+    assert cli.alias2name == {'push': 'deploy'}
+    for token in ['ship', 'sh']:
+        assert cli.resolve_command_name(ctx, token) is None
+    assert cli.resolve_command_name(ctx, 'pu') == 'deploy'
+    assert runner.invoke(cli, ['push']).output == 'new\n'
+    assert runner.invoke(cli, ['ship']).exit_code == 2
+    # The old aliases can be used by other commands
+    cli.add_command(cloup.Command('ship'))
+
+
+@pytest.mark.parametrize('commands', [
+    [cloup.Command('other', aliases=['o']), cloup.Command('another', aliases=['i'])],
+    [cloup.Command('other', aliases=['o']), cloup.Command('another', aliases=['o'])],
+    [cloup.Command('other', aliases=['o']), cloup.Command('o')],
+])
+def test_add_commands_rejects_clashes_before_adding_any_command(cli, commands):
+    with pytest.raises(ValueError, match='clashes with'):
+        cli.add_commands(commands)
+    assert 'other' not in cli.commands
+    assert 'o' not in cli.alias2name
+    assert cli.resolve_command_name(cloup.Context(cli), 'o') is None
+
+
+def test_add_commands_registers_aliases(runner):
+    cli = cloup.Group('cli', prefix_matching=True)
+    cli.add_command(cloup.Command('remove', aliases=['rm']))
+    ctx = cloup.Context(cli)
+    cli.resolve_command_name(ctx, 'rem')  # build the prefix index
+    cli.add_commands([
+        cloup.Command('install', aliases=['i'], callback=lambda: print('install')),
+        cloup.Command('update', aliases=['up']),
+    ])
+    assert cli.alias2name == {'rm': 'remove', 'i': 'install', 'up': 'update'}
+    assert cli.resolve_command_name(ctx, 'upd') == 'update'
+    assert runner.invoke(cli, ['i']).output == 'install\n'
+
+
+def test_aliases_of_commands_passed_to_the_constructor(runner):
+    cmd = cloup.Command('install', aliases=['i'], callback=lambda: print('install'))
+    cli = cloup.Group('cli', commands={'install': cmd})
+    assert cli.alias2name == {'i': 'install'}
+    assert runner.invoke(cli, ['i']).output == 'install\n'
+
+
+@pytest.mark.parametrize('case_insensitive', [False, True])
+def test_case_insensitive(runner, case_insensitive):
+    cli = cloup.Group('cli', case_insensitive=case_insensitive)
+    cli.add_command(
+        cloup.Command('Install', aliases=['I'], callback=lambda: print('install')))
+    for arg in ['Install', 'I', 'install', 'i', 'INSTALL']:
+        res = runner.invoke(cli, [arg])
+        if case_insensitive or arg in ('Install', 'I'):
+            assert res.output == 'install\n'
+        else:
+            assert res.exit_code == 2
+    with pytest.raises(ValueError) if case_insensitive else nullcontext():
+        cli.add_command(cloup.Command('install'))
@@ -98,6 +98,63 @@ class TestDidYouMean:
         """)
 
 
+class TestPrefixMatching:
+    @pytest.fixture()
+    def cmd(self):
+        cmd = cloup.Group(name="cmd", prefix_matching=True)
+        for name, aliases in [('deploy', ['ship']), ('delete', ['rm']), ('show', [])]:
+            cmd.add_command(cloup.Command(
+                name=name, aliases=aliases, callback=lambda name=name: print(name)))
+        return cmd
+
+    @pytest.mark.parametrize('arg, expected', [
+        ('deploy', 'deploy'),
+        ('dep', 'deploy'),
+        ('shi', 'deploy'),
+        ('del', 'delete'),
+        ('r', 'delete'),
+        ('sho', 'show'),
+    ])
+    def test_unambiguous_prefixes_are_resolved(self, runner, cmd, arg, expected):
+        res = runner.invoke(cmd, [arg])
+        assert res.output == expected + '\n'
+
+    def test_ambiguous_prefix(self, runner, cmd):
+        res = runner.invoke(cmd, ['de'])
+        assert res.exit_code == 2
+        assert res.output.endswith(reindent("""
+            Error: Command 'de' is ambiguous. It could be one of these:
+               delete
+               deploy
+        """))
+
+    @pytest.mark.parametrize('names', [['deploy'], ['deploy', 'delete', 'show']])
+    def test_empty_string_is_not_a_prefix(self, runner, names):
+        cmd = cloup.Group(name='cmd', prefix_matching=True)
+        for name in names:
+            cmd.add_command(cloup.Command(name=name, callback=lambda: print('invoked')))
+        res = runner.invoke(cmd, [''])
+        assert res.exit_code == 2
+        assert res.output.endswith("Error: No such command ''.\n")
+
+    def test_fuzzy_suggestions_when_no_prefix_matches(self, runner, cmd):
+        res = runner.invoke(cmd, ['dploy'])
+        assert res.output.endswith(
+            "Error: No such command 'dploy'. Did you mean 'deploy'?\n")
+
+    def test_commands_added_later_are_matched(self, runner, cmd):
+        assert runner.invoke(cmd, ['sh']).exit_code == 2
+        cmd.add_command(cloup.Command(name='status', callback=lambda: print('status')))
+        assert runner.invoke(cmd, ['st']).output == 'status\n'
+        res = runner.invoke(cmd, ['s'])
+        assert 'It could be one of these:\n   deploy\n   show\n   status' in res.output
+
+    def test_disabled_by_default(self, runner):
+        cmd = cloup.Group(name="cmd")
+        cmd.add_command(cloup.Command(name='deploy'))
+        assert runner.invoke(cmd, ['dep']).exit_code == 2
+
+
 @pytest.mark.parametrize("decorator", [cloup.command, cloup.group])
 def test_error_is_raised_when_command_decorators_are_used_without_parenthesis(decorator):
     with pytest.raises(Exception, match="parenthesis"):
@@ -0,0 +1,276 @@
+"""Tests for the shell completion index (``cloup.CompletionIndex``)."""
+import os
+import sys
+import textwrap
+
+import click
+import pytest
+from click.shell_completion import ShellComplete
+
+import cloup
+from cloup import CompletionIndex, complete_from_index
+from cloup._completion import CannotComplete
+
+
+def make_cli() -> cloup.Group:
+    @cloup.group()
+    @cloup.option('--verbose', '-v', is_flag=True, help='Be verbose.')
+    @cloup.option('--config', type=click.Path(dir_okay=False))
+    def cli(**kwargs):
+        """The CLI."""
+
+    @cli.command(aliases=['dep'], help='Deploy something.')
+    @cloup.option_group(
+        'Target',
+        cloup.option('--env', type=click.Choice(['dev', 'staging', 'prod'])),
+        cloup.option('--region', help='The region.'),
+    )
+    @cloup.option('--tag', multiple=True)
+    @cloup.option('--secret', hidden=True)
+    @cloup.argument('what', type=click.Choice(['app', 'db']))
+    @cloup.argument('dest', type=click.Path(file_okay=False), required=False)
+    def deploy(**kwargs):
+        pass
+
+    @cli.group(help='Manage users.')
+    def users():
+        pass
+
+    @users.command('add')
+    @cloup.option('--admin', is_flag=True)
+    def add_user(admin):
+        pass
+
+    @users.command('remove', hidden=True)
+    def remove_user():
+        pass
+
+    return cli
+
+
+def click_completions(cli, args, incomplete):
+    comp = ShellComplete(cli, {}, 'cli', '_CLI_COMPLETE')
+    return [(item.value, item.type) for item in comp.get_completions(args, incomplete)]
+
+
+def index_completions(index, args, incomplete):
+    return [(item.value, item.type) for item in index.complete(args, incomplete)]
+
+
+@pytest.mark.parametrize('args, incomplete', [
+    ([], ''),
+    ([], 'd'),
+    ([], '-'),
+    ([], '--'),
+    ([], '--c'),
+    (['--config'], ''),
+    (['-v'], 'u'),
+    (['dep'], '--'),
+    (['deploy'], '--e'),
+    (['deploy'], '--env='),
+    (['deploy', '--env'], ''),
+    (['deploy', '--env'], 's'),
+    (['deploy', '--tag', 'x'], '--t'),
+    (['deploy', '--region', 'eu'], '--'),
+    (['deploy'], ''),
+    (['deploy'], 'a'),
+    (['deploy', 'app'], ''),
+    (['users'], ''),
+    (['users', 'add'], '--'),
+    (['users', 'add', '--admin'], '--'),
+], ids=repr)
+def test_index_completions_match_click_completions(args, incomplete):
+    cli = make_cli()
+    index = CompletionIndex.from_command(cli, 'cli')
+    expected = click_completions(cli, list(args), incomplete)
+    assert index_completions(index, list(args), incomplete) == expected
+
+
+def make_cli_with_custom_resolution(**group_kwargs) -> cloup.Group:
+    cli = cloup.Group('cli', **group_kwargs)
+    cli.add_command(cloup.Command(
+        'Deploy', aliases=['dep'], params=[cloup.Option(['--force'], is_flag=True)]))
+    cli.add_command(cloup.Command('delete'))
+    cli.add_command(cloup.Command('status'))
+    return cli
+
+
+@pytest.mark.parametrize('group_kwargs', [
+    dict(case_insensitive=True),
+    dict(prefix_matching=True),
+    dict(case_insensitive=True, prefix_matching=True),
+    dict(context_settings=dict(token_normalize_func=str.lower)),
+], ids=repr)
+@pytest.mark.parametrize('args', [
+    ['DEPLOY'], ['DEP'], ['dep'], ['Deploy'], ['deploy'], ['stat'], ['STAT'], ['de'],
+    [''],
+], ids=repr)
+def test_index_resolves_subcommands_like_the_group(group_kwargs, args):
+    cli = make_cli_with_custom_resolution(**group_kwargs)
+    index = CompletionIndex.from_command(cli, 'cli')
+    expected = click_completions(cli, list(args), '--')
+    assert index_completions(index, list(args), '--') == expected
+
+
+def test_index_cannot_complete_if_token_normalize_func_is_not_referenceable():
+    cli = make_cli_with_custom_resolution(
+        context_settings=dict(token_normalize_func=lambda s: s.lower()))
+    index = CompletionIndex.from_command(cli, 'cli')
+    assert index.root['token_normalize_func'] is None
+    with pytest.raises(CannotComplete):
+        index.complete(['deploy'], '--')
+    # Only resolving subcommand names needs the function
+    assert index_completions(index, [], 'st') == [('status', 'plain')]
+
+
+class ColorType(click.ParamType):
+    name = 'color'
+
+    def shell_complete(self, ctx, param, incomplete):
+        from click.shell_completion import CompletionItem
+        return [CompletionItem(c) for c in ['red', 'green'] if c.startswith(incomplete)]
+
+
+def complete_env(ctx, param, incomplete):
+    return [env for env in ['alpha', 'beta'] if env.startswith(incomplete)]
+
+
+@pytest.mark.parametrize('args, incomplete', [
+    (['--env'], ''),
+    (['--env'], 'a'),
+    (['--color'], ''),
+    ([], ''),
+], ids=repr)
+def test_index_leaves_custom_completions_to_click(args, incomplete):
+    cli = cloup.Command('cli', params=[
+        cloup.Option(['--env'], shell_complete=complete_env),
+        cloup.Option(['--color'], type=ColorType()),
+        cloup.Argument(['target'], type=ColorType()),
+    ])
+    index = CompletionIndex.from_command(cli, 'cli')
+    assert click_completions(cli, list(args), incomplete)
+    with pytest.raises(CannotComplete):
+        index.complete(list(args), incomplete)
+
+
+def test_index_stores_aliases_and_option_groups():
+    index = CompletionIndex.from_command(make_cli(), 'cli')
+    assert index.root['aliases'] == {'dep': 'deploy'}
+    deploy = index.root['commands']['deploy']
+    groups = {opt['opts'][0]: opt['group'] for opt in deploy['options']}
+    assert groups['--env'] == groups['--region'] == 'Target'
+    assert groups['--tag'] is None
+
+
+def test_save_and_load(tmp_path):
+    index = CompletionIndex.from_command(make_cli(), 'cli', version='1.0')
+    path = tmp_path / 'index.json'
+    assert index.save(path)
+    loaded = CompletionIndex.load(path)
+    assert loaded.root == index.root
+    assert loaded.version == '1.0'
+    assert loaded.prog_name == 'cli'
+
+
+@pytest.mark.parametrize('content', ['', '{"format": 0}', '[1, 2]'])
+def test_load_returns_None_if_the_index_is_not_valid(tmp_path, content):
+    path = tmp_path / 'index.json'
+    path.write_text(content)
+    assert CompletionIndex.load(path) is None
+    assert CompletionIndex.load(tmp_path / 'missing.json') is None
+
+
+MODULE_NAME = 'cloup_completion_test_module'
+
+
+@pytest.fixture()
+def cli_module(tmp_path, monkeypatch):
+    code = textwrap.dedent('''
+        import cloup
+
+        @cloup.group()
+        def cli():
+            pass
+
+        @cli.command(aliases=['dep'])
+        @cloup.option('--force', is_flag=True)
+        def deploy(force):
+            pass
+    ''')
+    (tmp_path / f'{MODULE_NAME}.py').write_text(code)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, MODULE_NAME, raising=False)
+    yield f'{MODULE_NAME}:cli'
+    sys.modules.pop(MODULE_NAME, None)
+
+
+def test_complete_from_index_does_nothing_if_not_completing(monkeypatch, cli_module):
+    monkeypatch.delenv('_MY_CLI_COMPLETE', raising=False)
+    complete_from_index('my-cli', cli_module)
+    monkeypatch.setenv('_MY_CLI_COMPLETE', 'bash_source')
+    complete_from_index('my-cli', cli_module)
+    assert MODULE_NAME not in sys.modules
+
+
+@pytest.mark.parametrize('shell, comp_words, comp_cword, expected', [
+    ('bash', 'my-cli dep --', '2', 'plain,--force\nplain,--help\n'),
+    ('zsh', 'my-cli d', '1', 'plain\ndeploy\n_\n'),
+    ('fish', 'my-cli dep --f', '--f', 'plain,--force\n'),
+])
+def test_complete_from_index(
+    monkeypatch, capsys, tmp_path, cli_module, shell, comp_words, comp_cword, expected
+):
+    index_path = tmp_path / 'index.json'
+    monkeypatch.setenv('_MY_CLI_COMPLETE', f'{shell}_complete')
+    monkeypatch.setenv('COMP_WORDS', comp_words)
+    monkeypatch.setenv('COMP_CWORD', comp_cword)
+
+    # First run: the index is built
+    with pytest.raises(SystemExit) as exc_info:
+        complete_from_index('my-cli', cli_module, index_path=index_path)
+    assert exc_info.value.code == 0
+    assert capsys.readouterr().out == expected
+    assert MODULE_NAME in sys.modules
+    assert index_path.exists()
+
+    # Next runs: the command tree is not imported
+    del sys.modules[MODULE_NAME]
+    with pytest.raises(SystemExit):
+        complete_from_index('my-cli', cli_module, index_path=index_path)
+    assert capsys.readouterr().out == expected
+    assert MODULE_NAME not in sys.modules
+
+
+def test_index_is_rebuilt_when_version_changes(monkeypatch, tmp_path, cli_module):
+    index_path = tmp_path / 'index.json'
+    CompletionIndex({}, 'my-cli', version='old').save(index_path)
+    monkeypatch.setenv('_MY_CLI_COMPLETE', 'bash_complete')
+    monkeypatch.setenv('COMP_WORDS', 'my-cli ')
+    monkeypatch.setenv('COMP_CWORD', '1')
+    with pytest.raises(SystemExit):
+        complete_from_index('my-cli', cli_module, index_path=index_path, version='new')
+    assert CompletionIndex.load(index_path).version == 'new'
+
+
+def test_index_is_rebuilt_when_a_source_file_is_modified(
+    monkeypatch, tmp_path, cli_module
+):
+    index_path = tmp_path / 'index.json'
+    monkeypatch.setenv('_MY_CLI_COMPLETE', 'bash_complete')
+    monkeypatch.setenv('COMP_WORDS', 'my-cli ')
+    monkeypatch.setenv('COMP_CWORD', '1')
+    with pytest.raises(SystemExit):
+        complete_from_index('my-cli', cli_module, index_path=index_path)
+    index = CompletionIndex.load(index_path)
+    source_path = str(tmp_path / f'{MODULE_NAME}.py')
+    assert list(index.sources) == [source_path]
+    assert not index.sources_are_modified()
+
+    stat = os.stat(source_path)
+    os.utime(source_path, (stat.st_atime, stat.st_mtime + 10))
+    assert index.sources_are_modified()
+    del sys.modules[MODULE_NAME]
+    with pytest.raises(SystemExit):
+        complete_from_index('my-cli', cli_module, index_path=index_path)
+    assert MODULE_NAME in sys.modules
+    assert not CompletionIndex.load(index_path).sources_are_modified()
@@ -2,15 +2,17 @@
 Tip: in your editor, set a ruler at 80 characters.
 """
 import inspect
+import io
 from textwrap import dedent
 from typing import Optional
 
 import click
 import pytest
 
+import cloup
 from cloup import HelpFormatter
 from cloup.typing import Possibly
-from cloup.formatting import HelpSection, unstyled_len
+from cloup.formatting import ColumnWidths, HelpSection, display_width, unstyled_len
 from cloup.formatting.sep import (
     Hline, RowSepIf, RowSepPolicy, multiline_rows_are_at_least
 )
@@ -211,6 +213,84 @@ def test_write_text_with_styles():
     assert actual == EXPECTED
 
 
+@pytest.mark.parametrize('string, expected_width', [
+    pytest.param('--name', 6, id='ascii'),
+    pytest.param(click.style('--name', fg='red', bold=True), 6, id='styled'),
+    pytest.param('--naïve', 7, id='accented'),
+    pytest.param('--nai\u0308ve', 7, id='combining_mark'),
+    pytest.param('--名前', 6, id='wide'),
+    pytest.param(click.style('--名前', fg='red'), 6, id='styled_wide'),
+])
+def test_display_width(string, expected_width):
+    assert display_width(string) == expected_width
+
+
+def test_dl_with_wide_characters_is_aligned():
+    formatter = HelpFormatter(width=80, col_spacing=2)
+    formatter.write_dl([
+        ('--名前', 'Name.'),
+        (click.style('--size', fg='red'), 'Size.'),
+    ])
+    lines = click.unstyle(formatter.getvalue()).splitlines()
+    assert lines == ['--名前  Name.', '--size  Size.']
+
+
+def test_callable_second_columns_are_resolved_once():
+    calls = []
+
+    def help_fn(width):
+        calls.append(width)
+        return LOREM
+
+    formatter = HelpFormatter(width=60, col_spacing=2)
+    formatter.write_dl([('--lazy', help_fn), *ROWS[1:]])
+    assert calls == [60 - len(ROWS[1][0]) - 2]
+    assert formatter.getvalue().count(' ipsum ') == 3
+
+
+def test_wrap_rows():
+    from click.formatting import wrap_text
+    from cloup.formatting._util import wrap_lines, wrap_rows
+
+    texts = ['Short.', LOREM, '', LOREM + '\n\nSecond paragraph.']
+    assert wrap_rows(texts, 30) == [
+        tuple(wrap_text(text, 30, preserve_paragraphs=True).splitlines())
+        if text else ('',)
+        for text in texts
+    ]
+    assert wrap_lines(LOREM, 30) is wrap_lines(LOREM, 30)  # cached
+
+
+def test_column_widths():
+    widths = ColumnWidths.of(['--a', '--bbbbb', '--cc', '--名前'])
+    assert widths.max_under(100) == 7
+    assert widths.max_under(6) == 6
+    assert widths.max_under(2) == 0
+    widths.add(10)
+    widths.remove(6)
+    assert widths.max_under(9) == 7
+    assert widths.max_under(10) == 10
+    assert len(widths) == 4
+
+
+def test_aligned_sections_with_col1_widths_hints():
+    def make_sections(with_hints):
+        return [
+            HelpSection(heading, rows,
+                        col1_widths=ColumnWidths.of(r[0] for r in rows)
+                        if with_hints else None)
+            for heading, rows in [('First', ROWS[:1]), ('Second', ROWS[1:])]
+        ]
+
+    outputs = []
+    for with_hints in [False, True]:
+        formatter = HelpFormatter(width=80)
+        formatter.write_aligned_sections(make_sections(with_hints))
+        formatter.write_section(make_sections(with_hints)[1])
+        outputs.append(formatter.getvalue())
+    assert outputs[0] == outputs[1]
+
+
 def test_write_section_print_long_constraint_on_a_new_line():
     formatter = HelpFormatter(width=72, indent_increment=4)
     section = HelpSection(
@@ -231,3 +311,67 @@ def test_write_section_print_long_constraint_on_a_new_line():
     formatter.write_section(section)
     actual = formatter.getvalue()
     assert actual == expected
+
+
+def test_streaming_formatter_writes_completed_sections_to_sink():
+    sink = io.StringIO()
+    formatter = HelpFormatter(width=80, sink=sink)
+    sections = [
+        HelpSection('First', [('--a', 'Option a.')]),
+        HelpSection('Second', [('--long-option', 'Option b.')]),
+    ]
+    formatter.write_section(sections[0])
+    assert sink.getvalue() == '\nFirst:\n  --a  Option a.'
+    formatter.write_section(sections[1])
+    assert formatter.getvalue() == '\n'
+
+    non_streaming = HelpFormatter(width=80)
+    for section in sections:
+        non_streaming.write_section(section)
+    assert sink.getvalue() + formatter.getvalue() == non_streaming.getvalue()
+
+
+def test_streaming_formatter_aligns_sections():
+    sections = [
+        HelpSection('First', [('--a', 'Option a.')]),
+        HelpSection('Second', [('--long-option', 'Option b.')]),
+    ]
+    sink = io.StringIO()
+    formatter = HelpFormatter(width=80, sink=sink)
+    formatter.write_aligned_sections(sections)
+    non_streaming = HelpFormatter(width=80)
+    non_streaming.write_aligned_sections(sections)
+    assert sink.getvalue() + formatter.getvalue() == non_streaming.getvalue()
+
+
+def test_streaming_help_output_equals_non_streaming_output(runner, get_example_group):
+    grp = get_example_group(align_sections=True)
+    expected = runner.invoke(grp, ['--help']).output
+
+    sink = io.StringIO()
+    grp.context_settings['formatter_settings'] = HelpFormatter.settings(sink=sink)
+    result = runner.invoke(grp, ['--help'])
+    assert sink.getvalue()
+    assert sink.getvalue() + result.output == expected
+
+
+def test_streaming_formatter_doesnt_write_usage_of_errors_to_sink(runner):
+    sink = io.StringIO()
+    cmd = cloup.Command('cmd', params=[cloup.Option(['--a'])], context_settings=dict(
+        formatter_settings=HelpFormatter.settings(sink=sink)))
+    result = runner.invoke(cmd, ['--bad'])
+    assert result.exit_code == 2
+    assert sink.getvalue() == ''
+    assert result.output.startswith('Usage: cmd [OPTIONS]\n')
+    assert 'No such option: --bad' in result.output
+
+
+@pytest.mark.parametrize('color', [None, False, True])
+def test_streaming_formatter_respects_ctx_color(runner, color):
+    sink = io.StringIO()
+    cmd = cloup.Command('cmd', params=[cloup.Option(['--a'], help='Option a.')],
+                        context_settings=dict(color=color, formatter_settings=dict(
+                            sink=sink, theme=HelpTheme.dark())))
+    runner.invoke(cmd, ['--help'], color=bool(color))
+    assert ('\x1b[' in sink.getvalue()) == bool(color)
+    assert 'Option a.' in sink.getvalue()
@@ -0,0 +1,133 @@
+"""Tests for the help cache (``cloup.HelpCache``)."""
+from unittest.mock import patch
+
+import pytest
+
+import cloup
+from cloup import HelpCache, HelpFormatter, HelpTheme, Style
+
+
+def make_cli(help_cache, **ctx_settings):
+    @cloup.group(context_settings=dict(help_cache=help_cache, **ctx_settings))
+    @cloup.option('--name', help='A name.')
+    def cli(name):
+        """Group help."""
+
+    @cli.command()
+    def sub():
+        """Subcommand help."""
+
+    return cli
+
+
+@pytest.fixture()
+def count_renders():
+    with patch.object(cloup.Command, 'format_help',
+                      autospec=True, side_effect=cloup.Command.format_help) as mock:
+        yield mock
+
+
+def test_help_is_rendered_once_with_memory_cache(runner, count_renders):
+    cli = make_cli(HelpCache())
+    first = runner.invoke(cli, ['--help'])
+    second = runner.invoke(cli, ['--help'])
+    assert first.exit_code == second.exit_code == 0
+    assert first.output == second.output
+    assert 'Group help.' in first.output
+    assert count_renders.call_count == 1
+
+
+def test_cached_help_equals_uncached_help(runner):
+    cached = runner.invoke(make_cli(HelpCache()), ['sub', '--help'])
+    uncached = runner.invoke(make_cli(None), ['sub', '--help'])
+    assert cached.output == uncached.output
+
+
+def test_cache_key_depends_on_command_path_and_formatter_settings(count_renders):
+    help_cache = HelpCache()
+    cli = make_cli(help_cache)
+    ctx = cloup.Context(cli, info_name='cli')
+    key = help_cache.make_key(ctx)
+    sub_ctx = cloup.Context(cli.commands['sub'], info_name='sub', parent=ctx)
+    assert help_cache.make_key(sub_ctx) != key
+
+    themed_cli = make_cli(help_cache, formatter_settings=HelpFormatter.settings(
+        theme=HelpTheme(heading=Style(fg='red'))))
+    themed_ctx = cloup.Context(
+        themed_cli, info_name='cli', **themed_cli.context_settings)
+    assert help_cache.make_key(themed_ctx) != key
+
+
+def test_disk_cache_is_shared_between_instances(runner, tmp_path, count_renders):
+    first = runner.invoke(make_cli(HelpCache(tmp_path, version='1.0')), ['--help'])
+    assert count_renders.call_count == 1
+    assert len(list(tmp_path.glob('*.txt'))) == 1
+
+    second = runner.invoke(make_cli(HelpCache(tmp_path, version='1.0')), ['--help'])
+    assert count_renders.call_count == 1
+    assert first.output == second.output
+
+    # A different application version invalidates the cache
+    runner.invoke(make_cli(HelpCache(tmp_path, version='1.1')), ['--help'])
+    assert count_renders.call_count == 2
+
+
+def test_disk_cache_is_invalidated_when_source_file_changes(
+    runner, tmp_path, count_renders
+):
+    help_cache = HelpCache(tmp_path)
+    runner.invoke(make_cli(help_cache), ['--help'])
+    with patch('cloup._help_cache._get_source_mtimes', return_value={'x.py': 1.0}):
+        runner.invoke(make_cli(HelpCache(tmp_path)), ['--help'])
+    assert count_renders.call_count == 2
+
+
+@pytest.mark.parametrize('theme', [
+    HelpTheme.dark(),
+    HelpTheme(heading=Style(fg='red', text_transform=str.upper)),
+], ids=['dark', 'custom'])
+def test_disk_cache_works_with_themes(runner, tmp_path, count_renders, theme):
+    def invoke():
+        cli = make_cli(HelpCache(tmp_path),
+                       formatter_settings=HelpFormatter.settings(theme=theme))
+        return runner.invoke(cli, ['--help'], color=True).output
+
+    first = invoke()
+    assert len(list(tmp_path.glob('*.txt'))) == 1
+    assert invoke() == first
+    assert count_renders.call_count == 1
+
+
+def test_memory_cache_distinguishes_commands_with_the_same_path(runner):
+    help_cache = HelpCache()
+    first = cloup.Command('cmd', help='First.', context_settings={
+        'help_cache': help_cache})
+    second = cloup.Command('cmd', help='Second.', context_settings={
+        'help_cache': help_cache})
+    assert 'First.' in runner.invoke(first, ['--help']).output
+    assert 'Second.' in runner.invoke(second, ['--help']).output
+
+
+def test_disk_cache_skips_keys_with_unstable_representation(runner, tmp_path):
+    theme = HelpTheme(heading=lambda s: s.upper())
+    cli = make_cli(HelpCache(tmp_path),
+                   formatter_settings=HelpFormatter.settings(theme=theme))
+    res = runner.invoke(cli, ['--help'])
+    assert 'OPTIONS:' in res.output
+    assert not list(tmp_path.glob('*.txt'))
+
+
+def test_clear(runner, tmp_path, count_renders):
+    help_cache = HelpCache(tmp_path)
+    cli = make_cli(help_cache)
+    runner.invoke(cli, ['--help'])
+    help_cache.clear()
+    assert not list(tmp_path.glob('*.txt'))
+    runner.invoke(cli, ['--help'])
+    assert count_renders.call_count == 2
+
+
+def test_default_directory_is_version_stamped(monkeypatch, tmp_path):
+    monkeypatch.setenv('CLOUP_CACHE_DIR', str(tmp_path))
+    help_cache = HelpCache(directory=True)
+    assert help_cache.directory == tmp_path / cloup.__version__ / 'help'
@@ -0,0 +1,152 @@
+"""Tests for lazy subcommands (``cloup.LazyCommand``)."""
+import sys
+import textwrap
+
+import click
+import pytest
+
+import cloup
+from cloup import LazyCommand, Section
+
+MODULE_NAME = 'cloup_lazy_test_module'
+
+MODULE_CODE = textwrap.dedent('''
+    import cloup
+
+    @cloup.command(help='Long help of deploy.')
+    @cloup.option('--force', is_flag=True)
+    def deploy(force):
+        print('deploying', force)
+
+    not_a_command = 42
+''')
+
+
+@pytest.fixture()
+def lazy_module(tmp_path, monkeypatch):
+    (tmp_path / f'{MODULE_NAME}.py').write_text(MODULE_CODE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, MODULE_NAME, raising=False)
+    yield MODULE_NAME
+    sys.modules.pop(MODULE_NAME, None)
+
+
+def make_cli(section: bool = False) -> cloup.Group:
+    lazy_cmd = LazyCommand(
+        f'{MODULE_NAME}:deploy', 'deploy',
+        aliases=['dep'], short_help='Deploy stuff.')
+
+    @cloup.group(context_settings={'show_subcommand_aliases': True})
+    def cli():
+        pass
+
+    if section:
+        cli.add_section(Section('Deployment', [lazy_cmd]))
+    else:
+        cli.add_command(lazy_cmd)
+    return cli
+
+
+@pytest.mark.parametrize('section', [False, True], ids=['no_section', 'section'])
+def test_group_help_does_not_import_lazy_subcommands(runner, lazy_module, section):
+    cli = make_cli(section)
+    res = runner.invoke(cli, ['--help'])
+    assert res.exit_code == 0, res.output
+    assert 'deploy (dep)  Deploy stuff.' in res.output
+    assert lazy_module not in sys.modules
+
+
+@pytest.mark.parametrize('cmd_name', ['deploy', 'dep'])
+def test_lazy_subcommand_is_loaded_when_invoked(runner, lazy_module, cmd_name):
+    cli = make_cli()
+    res = runner.invoke(cli, [cmd_name, '--force'])
+    assert res.exit_code == 0, res.output
+    assert res.output == 'deploying True\n'
+    assert lazy_module in sys.modules
+    loaded = cli.commands['deploy']
+    assert not isinstance(loaded, LazyCommand)
+    assert cli._default_section.commands['deploy'] is loaded
+    assert loaded.aliases == ['dep']
+    # The imported command is not modified
+    imported = sys.modules[lazy_module].deploy
+    assert imported.aliases == []
+    assert loaded.callback is imported.callback
+
+
+def test_subcommand_help_loads_the_lazy_subcommand(runner, lazy_module):
+    cli = make_cli(section=True)
+    res = runner.invoke(cli, ['deploy', '--help'])
+    assert res.exit_code == 0, res.output
+    assert 'Long help of deploy.' in res.output
+    assert cli._user_sections[0].commands['deploy'] is cli.commands['deploy']
+
+
+def test_lazy_command_is_loaded_only_once(lazy_module):
+    lazy_cmd = LazyCommand(f'{MODULE_NAME}:deploy', 'deploy')
+    assert lazy_cmd.load() is lazy_cmd.load()
+
+
+def test_hidden_lazy_command_is_not_shown_in_help(runner, lazy_module):
+    @cloup.group()
+    def cli():
+        pass
+
+    cli.add_command(LazyCommand(f'{MODULE_NAME}:deploy', 'deploy', hidden=True))
+    cli.add_command(LazyCommand(f'{MODULE_NAME}:deploy', 'other'))
+    res = runner.invoke(cli, ['--help'])
+    assert 'deploy' not in res.output
+    assert 'other' in res.output
+
+
+@pytest.mark.parametrize('import_path', ['mod', 'mod:', ':attr'])
+def test_lazy_command_raises_for_invalid_import_path(import_path):
+    with pytest.raises(ValueError, match='invalid import path'):
+        LazyCommand(import_path, 'cmd')
+
+
+def test_lazy_command_raises_if_the_target_is_not_a_command(lazy_module):
+    lazy_cmd = LazyCommand(f'{MODULE_NAME}:not_a_command', 'cmd')
+    with pytest.raises(TypeError, match='should point to a `click.Command`'):
+        lazy_cmd.load()
+
+
+def test_lazy_command_is_a_click_command():
+    assert isinstance(LazyCommand('a.b:c', 'c'), click.Command)
+
+
+def test_completion_does_not_load_lazy_subcommands(lazy_module):
+    from click.shell_completion import ShellComplete
+    cli = make_cli()
+    cli.add_command(cloup.Command('status', help='Show the status.'))
+    cli.add_command(LazyCommand(f'{MODULE_NAME}:deploy', 'secret', hidden=True))
+    comp = ShellComplete(cli, {}, 'cli', '_CLI_COMPLETE')
+    items = comp.get_completions([], '')
+    assert [(item.value, item.help) for item in items] == [
+        ('deploy', 'Deploy stuff.'), ('status', 'Show the status.')]
+    assert lazy_module not in sys.modules
+
+    items = comp.get_completions(['dep'], '--')
+    assert [item.value for item in items] == ['--force', '--help']
+    assert lazy_module in sys.modules
+
+
+def test_lazy_command_in_click_group(runner, lazy_module):
+    @click.group()
+    def cli():
+        pass
+
+    cli.add_command(LazyCommand(f'{MODULE_NAME}:deploy', 'deploy'))
+    res = runner.invoke(cli, ['deploy', '--force'])
+    assert res.exit_code == 0, res.output
+    assert res.output == 'deploying True\n'
+    res = runner.invoke(cli, ['deploy', '--help'])
+    assert 'Long help of deploy.' in res.output
+    index = cloup.CompletionIndex.from_command(cli, 'cli')
+    assert index.complete(['deploy'], '--f') == [('--force', 'plain', None)]
+
+
+def test_lazy_command_main(runner, lazy_module):
+    lazy_cmd = LazyCommand(f'{MODULE_NAME}:deploy', 'deploy')
+    res = runner.invoke(lazy_cmd, ['--force'])
+    assert res.exit_code == 0, res.output
+    assert res.output == 'deploying True\n'
@@ -0,0 +1,53 @@
+"""Tests for the lazy loading of the public names of the ``cloup`` package."""
+import subprocess
+import sys
+
+import pytest
+
+import cloup
+
+
+def run_python(code: str) -> str:
+    return subprocess.check_output([sys.executable, '-c', code], text=True).strip()
+
+
+def test_import_cloup_does_not_import_submodules_or_click():
+    code = (
+        "import sys, cloup; "
+        "print(','.join(sorted(m for m in sys.modules "
+        "if m.split('.')[0] in ('cloup', 'click'))))"
+    )
+    assert run_python(code) == 'cloup,cloup._version'
+
+
+def test_accessing_a_name_imports_only_the_needed_modules():
+    code = (
+        "import sys, cloup; cloup.HelpTheme; "
+        "print('cloup.constraints' in sys.modules, 'cloup.formatting.sep' in sys.modules)"
+    )
+    assert run_python(code) == 'False False'
+
+
+@pytest.mark.parametrize('name', cloup.__all__)
+def test_all_public_names_are_accessible(name):
+    assert getattr(cloup, name) is not None
+
+
+@pytest.mark.parametrize('name', ['constraints', 'formatting', 'styling', 'warnings'])
+def test_public_submodules_are_accessible_as_attributes(name):
+    assert getattr(cloup, name).__name__ == f'cloup.{name}'
+
+
+def test_from_import_works():
+    from cloup import Command, Section
+    assert Command is cloup._commands.Command
+    assert Section is cloup._sections.Section
+
+
+def test_missing_attribute_raises_attribute_error():
+    with pytest.raises(AttributeError, match="has no attribute 'missing'"):
+        cloup.missing  # noqa
+
+
+def test_dir_includes_lazy_names():
+    assert set(cloup.__all__) <= set(dir(cloup))
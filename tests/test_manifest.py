@@ -0,0 +1,262 @@
+"""Tests for command tree manifests (``cloup.Manifest``)."""
+import sys
+import textwrap
+
+import pytest
+
+import cloup
+from cloup import Manifest, run_from_manifest
+
+MODULE_NAME = 'cloup_manifest_test_module'
+
+CLI_CODE = '''
+import click
+import cloup
+from cloup.constraints import RequireAtLeast, mutually_exclusive
+
+INVOKED = []
+
+@cloup.group(
+    show_subcommand_aliases=True,
+    epilog='See the docs.',
+    context_settings={'help_option_names': ['-h', '--help']},
+    formatter_settings={'theme': cloup.HelpTheme(heading=cloup.Style(fg='red'))},
+)
+@cloup.option('--verbose', '-v', is_flag=True, help='Be verbose.')
+def cli(verbose):
+    """The CLI.
+
+    It does things.
+    """
+
+@cloup.command(aliases=['dep'], help='Deploy something.', show_constraints=True)
+@cloup.option_group(
+    'Target',
+    cloup.option('--env', type=click.Choice(['dev', 'prod']), help='The env.'),
+    cloup.option('--region', help='The region.'),
+    constraint=RequireAtLeast(1),
+)
+@cloup.option('--tag', multiple=True, help='A tag.')
+@cloup.option('--force', is_flag=True)
+@cloup.option('--dry-run', is_flag=True)
+@cloup.constraint(mutually_exclusive, ['force', 'dry_run'])
+@cloup.argument('what', help='What to deploy.')
+def deploy(**kwargs):
+    INVOKED.append(('deploy', kwargs))
+
+cli.section('Deployment', deploy)
+
+@cli.group(
+    help='Manage users.', no_args_is_help=True,
+    context_settings=cloup.Context.settings(
+        formatter_settings=cloup.HelpFormatter.settings(col_spacing=3)),
+)
+def users():
+    pass
+
+@users.command('add', deprecated=True)
+@cloup.option('--admin', is_flag=True)
+def add_user(admin):
+    """Add a user."""
+    INVOKED.append(('add', admin))
+
+@users.command('remove', hidden=True)
+def remove_user():
+    pass
+'''
+
+
+# Settings that can't be stored in a manifest
+UNSERIALIZABLE_CLI_CODE = '''
+import cloup
+
+INVOKED = []
+
+@cloup.group(context_settings={'token_normalize_func': str.lower})
+def cli():
+    pass
+
+@cli.command(formatter_settings={'theme': cloup.HelpTheme(
+    heading=cloup.Style(fg='red', text_transform=str.upper))})
+@cloup.option('--force', is_flag=True, help='Force it.')
+def deploy(force):
+    """Deploy something."""
+    INVOKED.append(('deploy', force))
+'''
+
+
+@pytest.fixture(params=[CLI_CODE])
+def cli_module(request, tmp_path, monkeypatch):
+    (tmp_path / f'{MODULE_NAME}.py').write_text(textwrap.dedent(request.param))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, MODULE_NAME, raising=False)
+    yield f'{MODULE_NAME}:cli'
+    sys.modules.pop(MODULE_NAME, None)
+
+
+@pytest.fixture()
+def manifest_path(tmp_path, cli_module):
+    cli = cloup.LazyCommand(cli_module, 'cli').load()
+    path = tmp_path / 'manifest.json'
+    Manifest.from_command(cli, 'cli', cli_module, version='1.0').save(path)
+    del sys.modules[MODULE_NAME]
+    return path
+
+
+def run_real(cli_module, capsys, args):
+    cli = cloup.LazyCommand(cli_module, 'cli').load()
+    with pytest.raises(SystemExit) as exc_info:
+        cli.main(args, prog_name='cli')
+    return exc_info.value.code, capsys.readouterr()
+
+
+def run_manifest(manifest_path, capsys, args, version='1.0'):
+    with pytest.raises(SystemExit) as exc_info:
+        run_from_manifest(manifest_path, args, version=version)
+    return exc_info.value.code, capsys.readouterr()
+
+
+@pytest.mark.parametrize('args', [
+    ['--help'],
+    ['-h'],
+    ['-v', '--help'],
+    ['deploy', '--help'],
+    ['dep', '-h'],
+    ['users'],
+    ['users', '--help'],
+    ['users', 'add', '--help'],
+    ['users', 'remove', '--help'],
+    ['deplo'],
+    ['-v', 'usr'],
+    ['users', 'ad'],
+], ids=' '.join)
+def test_manifest_output_is_identical_to_real_output(
+    capsys, cli_module, manifest_path, args
+):
+    expected = run_real(cli_module, capsys, list(args))
+    sys.modules.pop(MODULE_NAME)
+    assert run_manifest(manifest_path, capsys, list(args)) == expected
+    assert MODULE_NAME not in sys.modules
+
+
+def test_outdated_manifests_are_ignored(capsys, cli_module, manifest_path):
+    expected = run_real(cli_module, capsys, ['deploy', '--help'])
+    sys.modules.pop(MODULE_NAME)
+    actual = run_manifest(manifest_path, capsys, ['deploy', '--help'], version='2.0')
+    assert actual == expected
+    assert MODULE_NAME in sys.modules
+
+
+def test_other_invocations_import_the_command_tree(capsys, manifest_path):
+    code, _ = run_manifest(manifest_path, capsys, ['users', 'add', '--admin'])
+    assert code == 0
+    assert sys.modules[MODULE_NAME].INVOKED == [('add', True)]
+
+
+def test_completion_from_manifest(monkeypatch, capsys, manifest_path):
+    monkeypatch.setenv('_CLI_COMPLETE', 'bash_complete')
+    monkeypatch.setenv('COMP_WORDS', 'cli dep --')
+    monkeypatch.setenv('COMP_CWORD', '2')
+    code, captured = run_manifest(manifest_path, capsys, [])
+    assert code == 0
+    assert captured.out.splitlines() == [
+        'plain,--env', 'plain,--region', 'plain,--tag', 'plain,--force',
+        'plain,--dry-run', 'plain,--help',
+    ]
+    assert MODULE_NAME not in sys.modules
+
+
+def test_manifest_content(manifest_path):
+    manifest = Manifest.load(manifest_path)
+    assert manifest.prog_name == 'cli'
+    assert manifest.version == '1.0'
+    assert manifest.import_path == f'{MODULE_NAME}:cli'
+    root = manifest.root
+    assert root['sections'] == [
+        {'title': 'Deployment', 'commands': ['deploy']},
+        {'title': 'Other commands', 'commands': ['users']},
+    ]
+    assert root['formatter_settings']['theme'] == {'heading': {'fg': 'red'}}
+    deploy = root['commands']['deploy']
+    assert deploy['own_aliases'] == ['dep']
+    target = deploy['option_groups'][0]
+    assert target['title'] == 'Target'
+    assert target['options'] == ['env', 'region']
+    assert target['constraint']['help'] == 'at least 1 required'
+    users = root['commands']['users']
+    assert users['settings_are_complete']
+    assert users['formatter_settings']['col_spacing'] == 3
+
+
+@pytest.mark.parametrize('cli_module', [UNSERIALIZABLE_CLI_CODE], indirect=True)
+@pytest.mark.parametrize('args', [
+    ['DEPLOY', '--force'],
+    ['Deploy', '--help'],
+    ['deploy', '--help'],
+    ['deplo'],
+], ids=' '.join)
+def test_commands_with_unserializable_settings_are_left_to_the_real_cli(
+    capsys, cli_module, manifest_path, args
+):
+    root = Manifest.load(manifest_path).root
+    assert not root['settings_are_complete']
+    assert not root['commands']['deploy']['settings_are_complete']
+
+    expected = run_real(cli_module, capsys, list(args))
+    sys.modules.pop(MODULE_NAME)
+    assert run_manifest(manifest_path, capsys, list(args)) == expected
+
+
+@pytest.mark.parametrize('content', ['{}', '{"format": 0}', '[]'])
+def test_load_raises_ValueError_for_invalid_manifests(tmp_path, content):
+    path = tmp_path / 'manifest.json'
+    path.write_text(content)
+    with pytest.raises(ValueError):
+        Manifest.load(path)
+
+
+def test_msgpack_format(tmp_path, manifest_path):
+    pytest.importorskip('msgpack')
+    manifest = Manifest.load(manifest_path)
+    path = tmp_path / 'manifest.msgpack'
+    manifest.save(path)
+    loaded = Manifest.load(path)
+    assert loaded.root == manifest.root
+
+
+def test_proxies_cannot_be_invoked(manifest_path):
+    ctx = Manifest.load(manifest_path).make_proxy(['deploy'])
+    assert ctx.command_path == 'cli deploy'
+    with pytest.raises(RuntimeError):
+        ctx.command.invoke(ctx)
+    with pytest.raises(KeyError):
+        Manifest.load(manifest_path).make_proxy(['nope'])
+
+
+def test_callable_second_column_is_resolved():
+    @cloup.command()
+    @cloup.option('--name', help='Name.')
+    def cmd(name):
+        pass
+
+    manifest = Manifest.from_command(cmd, 'cmd', 'mod:cmd')
+    ctx = manifest.make_proxy()
+    assert ctx.get_help() == cmd.get_help(cloup.Context(cmd, info_name='cmd'))
+
+
+def test_styles_passed_to_write_text_are_recorded():
+    class Cmd(cloup.Command):
+        def format_help_text(self, ctx, formatter):
+            formatter.write_text('Styled.', cloup.Style(fg='red', bold=True))
+
+    cmd = Cmd('cmd')
+    manifest = Manifest.from_command(cmd, 'cmd', 'mod:cmd')
+    assert manifest.root['settings_are_complete']
+    ctx = manifest.make_proxy()
+    expected = cmd.get_help(cloup.Context(cmd, info_name='cmd'))
+    assert '\x1b[' in expected
+    assert ctx.get_help() == expected
+
+    cmd.format_help_text = lambda ctx, formatter: formatter.write_text('x', str.upper)
+    manifest = Manifest.from_command(cmd, 'cmd', 'mod:cmd')
+    assert not manifest.root['settings_are_complete']
@@ -296,3 +296,75 @@ def test_default_option_group_title_when_the_only_other_section_is_positional_ar
           --opt TEXT  An option.
           --help      Show this message and exit.
     """)
+
+
+def test_option_group_has_no_instance_dict():
+    assert not hasattr(OptionGroup('Options'), '__dict__')
+
+
+def test_params_partition_is_recomputed_only_when_params_change(monkeypatch):
+    @cloup.command()
+    @option_group('Group', option('--a'), option('--b'))
+    @option('--c')
+    def cmd(**kwargs):
+        pass
+
+    calls = []
+    group_params = cloup.Command._group_params
+    monkeypatch.setattr(cloup.Command, '_group_params', staticmethod(
+        lambda params: calls.append(1) or group_params(params)))
+
+    ctx = cmd.make_context('cmd', [])
+    cmd.get_help(ctx)
+    cmd.get_help(ctx)
+    assert [opt.name for opt in cmd.ungrouped_options] == ['c']
+    assert calls == []  # computed before patching (in the constructor)
+
+    grp = cmd.option_groups[0]
+    cmd.params.append(click.Option(['--d']))
+    e_opt = option('--e', group=grp)(new_dummy_func()).__click_params__[0]
+    cmd.params.insert(0, e_opt)
+    assert [opt.name for opt in cmd.ungrouped_options] == ['c', 'd']
+    assert [opt.name for opt in grp] == ['e', 'a', 'b']
+    assert '--e' in cmd.get_help(ctx)
+    assert len(calls) == 1
+
+    cmd.params = [cmd.params[-1]]
+    assert cmd.option_groups == []
+    assert [opt.name for opt in cmd.ungrouped_options] == ['d']
+    assert len(calls) == 2
+
+
+def test_param_list_counts_modifications():
+    from cloup._option_groups import ParamList
+    opts = make_options('abc')
+    params = ParamList(opts)
+    modifications = [
+        lambda: params.append(opts[0]),
+        lambda: params.extend(opts),
+        lambda: params.insert(0, opts[1]),
+        lambda: params.remove(opts[1]),
+        lambda: params.pop(),
+        lambda: params.__setitem__(0, opts[2]),
+        lambda: params.__delitem__(slice(0, 1)),
+        lambda: params.sort(key=id),
+        lambda: params.reverse(),
+        lambda: params.__iadd__(opts),
+        lambda: params.__imul__(2),
+        lambda: params.clear(),
+    ]
+    for i, modify in enumerate(modifications, start=1):
+        modify()
+        assert params.version == i
+    assert params == []
+
+
+def test_param_list_is_pickled_with_its_version():
+    import pickle
+    from cloup._option_groups import ParamList
+    params = ParamList(make_options('ab'))
+    params.append(params.pop())
+    restored = pickle.loads(pickle.dumps(params))
+    assert type(restored) is ParamList
+    assert restored.version == 2
+    assert [p.name for p in restored] == ['a', 'b']
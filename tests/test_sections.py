@@ -146,3 +146,87 @@ def test_section_error_if_first_arg_is_not_a_string():
     grp = cloup.Group()
     with pytest.raises(TypeError, match="the first argument must be a string"):
         grp.section([cloup.Command('cmd')])
+
+
+def test_section_col1_widths_are_maintained_incrementally():
+    section = Section('Commands', [cloup.Command('cmd-one')])
+    assert section.col1_widths.max_under(100) == len('cmd-one')
+    section.add_command(cloup.Command('a-much-longer-name'))
+    section.add_command(cloup.Command('hidden-command-name', hidden=True))
+    widths = section.col1_widths
+    assert len(widths) == 2
+    assert widths.max_under(100) == len('a-much-longer-name')
+    assert widths.max_under(10) == len('cmd-one')
+
+
+@pytest.mark.parametrize('show_aliases', [False, True])
+def test_sections_are_aligned_using_col1_widths(runner, show_aliases):
+    main = cloup.Group(name='main', show_subcommand_aliases=show_aliases)
+    main.section('First', cloup.Command('cmd', aliases=['a-long-alias'], help='A.'))
+    main.add_command(cloup.Command('other-command', help='B.'))
+    help_sections = [
+        main.make_commands_help_section(cloup.Context(main), section)
+        for section in main.list_sections(cloup.Context(main))
+    ]
+    hints = [s.col1_widths for s in help_sections]
+    assert all((hint is None) == show_aliases for hint in hints)
+
+    res = runner.invoke(main, ['--help'])
+    first_row = 'cmd (a-long-alias)  A.' if show_aliases else 'cmd            A.'
+    other_row = 'other-command       B.' if show_aliases else 'other-command  B.'
+    assert f'  {first_row}\n' in res.output
+    assert f'  {other_row}\n' in res.output
+
+
+def test_section_has_no_instance_dict():
+    assert not hasattr(Section('Commands'), '__dict__')
+
+
+def test_section_extend():
+    section = Section('Commands', [cloup.Command('cmd-one')])
+    assert section.col1_widths.max_under(100) == len('cmd-one')
+    section.extend([cloup.Command('a-much-longer-name'),
+                    cloup.Command('hidden-command-name', hidden=True)])
+    section.extend({'renamed': cloup.Command('cmd-two')})
+    assert list(section.commands) == [
+        'cmd-one', 'a-much-longer-name', 'hidden-command-name', 'renamed']
+    assert len(section.col1_widths) == 3
+    assert section.col1_widths.max_under(100) == len('a-much-longer-name')
+
+
+@pytest.mark.parametrize('commands, error', [
+    ([cloup.Command('new'), cloup.Command('cmd')], 'already exists'),
+    ([cloup.Command('new'), cloup.Command('new')], 'more than once'),
+    ([cloup.Command('new'), cloup.Command(None)], 'missing command name'),
+])
+def test_section_extend_leaves_section_unchanged_on_error(commands, error):
+    section = Section('Commands', [cloup.Command('cmd')])
+    with pytest.raises(Exception, match=error):
+        section.extend(commands)
+    assert list(section.commands) == ['cmd']
+
+
+def test_group_add_commands_is_equivalent_to_add_command(runner):
+    def make_commands(prefix):
+        return [cloup.Command(f'{prefix}-{i}', help=f'Help {prefix} {i}.')
+                for i in range(3)]
+
+    one_by_one = cloup.Group(name='main')
+    section = Section('Section')
+    for cmd in make_commands('s'):
+        one_by_one.add_command(cmd, section=section)
+    for cmd in make_commands('d'):
+        one_by_one.add_command(cmd)
+
+    bulk = cloup.Group(name='main')
+    bulk.add_commands(make_commands('s'), section=Section('Section'))
+    bulk.add_commands({cmd.name: cmd for cmd in make_commands('d')})
+
+    assert list(bulk.commands) == list(one_by_one.commands)
+    expected = runner.invoke(one_by_one, ['--help']).output
+    assert runner.invoke(bulk, ['--help']).output == expected
+    assert 'Section:' in expected
+
+    # Commands can be added to a section already in the group
+    bulk.add_commands([cloup.Command('s-3')], section=bulk.list_sections(None)[0])
+    assert list(bulk.list_sections(None)[0].commands)[-1] == 's-3'
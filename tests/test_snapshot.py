@@ -0,0 +1,156 @@
+"""Tests for pickling command trees and for snapshot()/restore()."""
+import pickle
+import sys
+import textwrap
+
+import click
+import pytest
+
+import cloup
+from cloup import restore, snapshot
+from cloup.constraints import (
+    AcceptBetween, AllSet, AnySet, Equal, If, IsSet, RequireAtLeast, RequireExactly,
+    accept_none, all_or_none, mutually_exclusive, require_all, require_any,
+    require_one,
+)
+from cloup._snapshot import CallbackRef
+from tests.util import make_fake_context, make_options, new_dummy_func
+
+MODULE_NAME = 'cloup_snapshot_test_module'
+
+CLI_CODE = '''
+import click
+import cloup
+from cloup.constraints import Equal, If, RequireAtLeast, mutually_exclusive
+
+INVOKED = []
+
+@cloup.group(show_subcommand_aliases=True)
+def cli():
+    """The CLI."""
+
+@cloup.command(aliases=['dep'], show_constraints=True)
+@cloup.option_group(
+    'Target',
+    cloup.option('--env', type=click.Choice(['dev', 'prod'])),
+    cloup.option('--region'),
+    constraint=RequireAtLeast(1),
+)
+@cloup.option('--force', is_flag=True)
+@cloup.option('--dry-run', is_flag=True)
+@cloup.constraint(mutually_exclusive, ['force', 'dry_run'])
+@cloup.constraint(If(Equal('env', 'prod'), then=RequireAtLeast(1)), ['force'])
+@click.pass_context
+def deploy(ctx, **kwargs):
+    INVOKED.append((ctx.info_name, kwargs))
+
+cli.section('Deployment', deploy)
+'''
+
+
+@pytest.fixture()
+def cli_module(tmp_path, monkeypatch):
+    (tmp_path / f'{MODULE_NAME}.py').write_text(textwrap.dedent(CLI_CODE))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, MODULE_NAME, raising=False)
+    yield cloup.LazyCommand(f'{MODULE_NAME}:cli', 'cli').load()
+    sys.modules.pop(MODULE_NAME, None)
+
+
+@pytest.fixture()
+def snapshot_path(tmp_path, cli_module):
+    path = tmp_path / 'snapshots' / 'cli.pickle'
+    assert snapshot(cli_module, path, version='1.0')
+    del sys.modules[MODULE_NAME]
+    return path
+
+
+@pytest.mark.parametrize('constraint', [
+    require_all, accept_none, all_or_none, mutually_exclusive, require_any,
+    require_one, AcceptBetween(1, 2), RequireExactly(2),
+    RequireAtLeast(1) | require_all, RequireAtLeast(1) & require_all,
+    If(IsSet('a') & ~AllSet('b', 'c'), then=require_all, else_=accept_none),
+    If(AnySet('a', 'b') | Equal('c', 'x'), then=mutually_exclusive),
+], ids=repr)
+def test_built_in_constraints_are_picklable(constraint):
+    ctx = make_fake_context(make_options('abc'))
+    copy = pickle.loads(pickle.dumps(constraint))
+    assert type(copy) is type(constraint)
+    assert repr(copy) == repr(constraint)
+    assert copy.help(ctx) == constraint.help(ctx)
+
+
+def test_constraint_getattr_raises_AttributeError_for_unknown_attributes():
+    assert not hasattr(require_all, 'nope')
+    with pytest.raises(Exception, match='was removed in v0.9'):
+        require_all.toggle_consistency_checks
+
+
+def test_callbacks_are_pickled_by_reference(runner, cli_module, snapshot_path):
+    cli = restore(snapshot_path, version='1.0')
+    deploy = cli.commands['deploy']
+    assert isinstance(deploy.callback, CallbackRef)
+    assert MODULE_NAME not in sys.modules
+
+    res = runner.invoke(cli, ['dep', '--env', 'prod', '--force'])
+    assert res.exit_code == 0, res.output
+    assert sys.modules[MODULE_NAME].INVOKED == [
+        ('deploy', {'env': 'prod', 'region': None, 'force': True, 'dry_run': False})]
+
+
+def test_restored_tree_works_as_the_original(runner, cli_module, snapshot_path):
+    cli = restore(snapshot_path, version='1.0')
+    assert runner.invoke(cli, ['--help']).output == \
+        runner.invoke(cli_module, ['--help']).output
+    # Only invoking a command imports the module
+    assert MODULE_NAME not in sys.modules
+    for args in [['--help'], ['deploy', '--help'], ['deploy'], ['dep', '--env=prod'],
+                 ['dep', '--region=eu', '--force', '--dry-run'], ['depp']]:
+        expected = runner.invoke(cli_module, args)
+        res = runner.invoke(cli, args)
+        assert (res.exit_code, res.output) == (expected.exit_code, expected.output)
+
+
+@pytest.mark.parametrize('version', ['', '2.0'])
+def test_restore_returns_None_if_version_differs(snapshot_path, version):
+    assert restore(snapshot_path, version=version) is None
+
+
+def test_restore_returns_None_if_snapshot_is_invalid(tmp_path):
+    assert restore(tmp_path / 'missing.pickle') is None
+    path = tmp_path / 'corrupted.pickle'
+    path.write_bytes(b'not a pickle')
+    assert restore(path) is None
+
+
+def test_local_callbacks_cannot_be_pickled():
+    cmd = cloup.Command('cmd', callback=new_dummy_func())
+    with pytest.raises(pickle.PicklingError, match='by qualified name'):
+        pickle.dumps(cmd)
+    assert pickle.loads(pickle.dumps(cloup.Command('cmd'))).callback is None
+
+
+def test_callbacks_with_ambiguous_qualified_name_cannot_be_pickled():
+    @cloup.command()
+    def status():
+        pass
+
+    # E.g. two functions named "status" defined at module level: the module
+    # attribute is the last one
+    status.callback.__qualname__ = module_level_command.callback.__qualname__
+    with pytest.raises(pickle.PicklingError, match="command 'status'.* unique name"):
+        pickle.dumps(status)
+    assert pickle.loads(pickle.dumps(module_level_command)).callback() == 'called'
+
+
+def test_callback_ref_resolves_commands_to_their_callback():
+    ref = pickle.loads(pickle.dumps(CallbackRef('click', 'echo')))
+    assert ref.resolve() is click.echo
+    ref = CallbackRef('tests.test_snapshot', 'module_level_command')
+    assert ref.resolve() is module_level_command.callback
+    assert ref() == 'called'
+
+
+@cloup.command()
+def module_level_command():
+    return 'called'
@@ -34,6 +34,44 @@ def test_style():
     assert Style(**kwargs)(text) == click.style(text, **kwargs)
 
 
+@pytest.mark.parametrize('kwargs', [
+    dict(),
+    dict(fg=Color.red),
+    dict(fg=Color.reset, bg='blue', underline=False),
+    dict(fg=(10, 20, 30), italic=True, strikethrough=True),
+], ids=['no_style', 'fg', 'resets', 'rgb'])
+def test_compiled_style_is_equivalent_to_click_style(kwargs):
+    text = 'hi there'
+    style = Style(**kwargs)
+    expected = click.style(text, **kwargs)
+    assert style(text) == expected
+    assert style.compile()(text) == expected
+
+
+def test_compiled_style_applies_text_transform():
+    style = Style(fg='red', text_transform=str.upper)
+    expected = click.style('HI', fg='red')
+    assert style('hi') == style.compile()('hi') == expected
+
+
+def test_style_repr_and_equality_do_not_depend_on_compiled_codes():
+    style = Style(fg='red')
+    repr_before = repr(style)
+    style('x')
+    assert repr(style) == repr_before
+    assert style == Style(fg='red')
+
+
+def test_compiled_help_theme():
+    theme = HelpTheme.dark().with_(epilog=str.upper)
+    compiled = theme.compiled()
+    assert compiled is HelpTheme.dark().with_(epilog=str.upper).compiled()
+    assert not any(isinstance(style, Style) for style in compiled)
+    assert compiled.epilog is str.upper
+    for style, compiled_style in zip(theme, compiled):
+        assert compiled_style('text') == style('text')
+
+
 def test_unsupported_style_args_are_ignored_in_click_7():
     Style(overline=True, italic=True, strikethrough=True)
 
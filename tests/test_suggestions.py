@@ -0,0 +1,116 @@
+"""Tests for the indexes used for "Did you mean...?" suggestions and prefix matching."""
+import difflib
+import random
+import string
+
+import pytest
+
+import cloup
+from cloup._suggestions import PrefixIndex, SuggestionIndex
+from tests.util import new_dummy_func
+
+
+@pytest.fixture(scope='module')
+def names():
+    rnd = random.Random(0)
+    alphabet = string.ascii_lowercase + '-'
+    return sorted({
+        ''.join(rnd.choice(alphabet) for _ in range(rnd.randint(2, 15)))
+        for _ in range(3000)
+    })
+
+
+def test_get_close_matches_has_the_same_quality_of_difflib(names):
+    index = SuggestionIndex(names)
+    rnd = random.Random(1)
+    for name in rnd.sample(names, 50):
+        # Introduce a typo by replacing a random character
+        i = rnd.randrange(len(name))
+        word = name[:i] + rnd.choice(string.ascii_lowercase) + name[i + 1:]
+        matches = index.get_close_matches(word)
+        expected = difflib.get_close_matches(word, names)
+        # The best match is always found; other matches with a similarity close
+        # to the cutoff may be missed if they don't share any n-gram with word.
+        assert matches[:1] == expected[:1]
+        assert set(matches) <= set(expected)
+
+
+@pytest.mark.parametrize('n, cutoff', [(1, 0.6), (5, 0.6), (3, 0.8)])
+def test_get_close_matches_respects_n_and_cutoff(n, cutoff):
+    names = ['install', 'uninstall', 'instance', 'list', 'info', 'init']
+    index = SuggestionIndex(names)
+    for word in ['inst', 'lst', 'nstall', 'infoo']:
+        assert index.get_close_matches(word, n, cutoff) == \
+            difflib.get_close_matches(word, names, n, cutoff)
+
+
+def test_index_is_a_collection_of_names():
+    index = SuggestionIndex(['a', 'b'])
+    index.add('c')
+    index.add('a')
+    assert len(index) == 3
+    assert 'c' in index
+    assert sorted(index) == ['a', 'b', 'c']
+
+
+def test_group_updates_index_in_add_command():
+    cmd = cloup.Command('install', aliases=['i'], callback=new_dummy_func())
+    grp = cloup.Group(
+        'grp', commands={'list': cloup.Command('list')},
+        sections=[cloup.Section('Section', [cmd])],
+    )
+    grp.add_command(cloup.Command('remove', aliases=['rm']))
+    assert grp._suggestion_index is None  # built when first needed
+    index = grp._get_suggestion_index()
+    assert sorted(index) == ['i', 'install', 'list', 'remove', 'rm']
+    grp.add_command(cloup.Command('clear', aliases=['clr']))
+    assert grp._get_suggestion_index() is index
+    assert 'clear' in index and 'clr' in index
+
+
+def test_group_suggestion_tunables(runner):
+    class CustomGroup(cloup.Group):
+        MAX_SUGGESTIONS = 1
+
+    grp = CustomGroup('grp')
+    grp.add_command(cloup.Command('install', aliases=['ins'], callback=new_dummy_func()))
+    res = runner.invoke(grp, ['inst'])
+    assert res.output.endswith("Did you mean 'ins'?\n")
+
+    CustomGroup.SUGGESTIONS_CUTOFF = 0.9
+    res = runner.invoke(grp, ['inst'])
+    assert res.output.endswith("No such command 'inst'.\n")
+
+
+def test_handle_bad_command_name_receives_a_list(runner):
+    received = []
+
+    class CustomGroup(cloup.Group):
+        def handle_bad_command_name(self, bad_name, valid_names, error):
+            received.append(valid_names)
+            return super().handle_bad_command_name(
+                bad_name, valid_names[:1], error)
+
+    grp = CustomGroup('grp')
+    grp.add_command(cloup.Command('install', aliases=['ins'], callback=new_dummy_func()))
+    grp.add_command(cloup.Command('instance', callback=new_dummy_func()))
+    res = runner.invoke(grp, ['inst'])
+    assert received == [['install', 'instance', 'ins']]
+    # Suggestions are taken from the names passed by the override
+    assert res.output.endswith("Did you mean 'install'?\n")
+
+
+@pytest.mark.parametrize('prefix, expected', [
+    ('dep', ('deploy', [])),
+    ('deploy', ('deploy', [])),
+    ('d', (None, ['delete', 'deploy'])),
+    ('', (None, ['delete', 'deploy', 'show'])),
+    ('x', (None, [])),
+    ('deployx', (None, [])),
+])
+def test_prefix_index(prefix, expected):
+    index = PrefixIndex([
+        ('deploy', 'deploy'), ('dep', 'deploy'), ('delete', 'delete'),
+        ('show', 'show'), ('sh', 'show'),
+    ])
+    assert index.resolve(prefix) == expected
@@ -0,0 +1,117 @@
+"""Tests for the recording of per-phase timings (``cloup.PhaseTimings``)."""
+import json
+
+import pytest
+
+import cloup
+from cloup import PhaseTimings
+from cloup._timings import get_timings_target
+from cloup.constraints import mutually_exclusive
+
+
+def make_cli(**context_settings):
+    @cloup.group(context_settings=context_settings)
+    def cli():
+        pass
+
+    @cli.command()
+    @cloup.option_group(
+        'Options',
+        cloup.option('--a', is_flag=True),
+        cloup.option('--b', is_flag=True),
+        constraint=mutually_exclusive,
+    )
+    def sub(a, b):
+        pass
+
+    return cli
+
+
+def run(cli, capsys, args):
+    with pytest.raises(SystemExit) as exc_info:
+        cli.main(args, prog_name='cli')
+    assert exc_info.value.code == 0
+    return capsys.readouterr().err
+
+
+def test_timings_are_disabled_by_default(monkeypatch):
+    monkeypatch.delenv('CLOUP_TIMINGS', raising=False)
+    cli = make_cli()
+    ctx = cli.make_context('cli', ['sub'])
+    assert ctx.phase_timings is None
+
+
+def test_timings_tree(monkeypatch):
+    monkeypatch.delenv('CLOUP_TIMINGS', raising=False)
+    cli = make_cli()
+    with cli.make_context('cli', ['sub', '--a'], timings=True) as ctx:
+        cli.invoke(ctx)
+    root = ctx.phase_timings
+    assert root.command_name == 'cli'
+    assert list(root.to_dict()['phases']) == [
+        'construction', 'consistency', 'parsing', 'constraints', 'resolution',
+        'invoke']
+    [sub] = root.children
+    assert sub.command_name == 'sub'
+    assert set(sub.phases) == {
+        'construction', 'consistency', 'parsing', 'constraints', 'invoke'}
+    assert all(seconds >= 0 for seconds in sub.phases.values())
+    assert root.phases['invoke'] >= sub.phases['invoke']
+
+
+def test_timings_are_printed_to_stderr(capsys):
+    err = run(make_cli(timings=True), capsys, ['sub', '--help'])
+    lines = err.splitlines()
+    assert lines[0].startswith('cli: construction=')
+    assert lines[1].startswith('  sub: construction=')
+    assert 'help=' in lines[1]
+
+
+def test_timings_are_written_to_json_file(tmp_path, capsys):
+    path = tmp_path / 'timings.json'
+    assert run(make_cli(timings=str(path)), capsys, ['sub']) == ''
+    report = json.loads(path.read_text())
+    assert report['command'] == 'cli'
+    assert list(report['children'][0]['phases']) == [
+        'construction', 'consistency', 'parsing', 'constraints', 'invoke']
+
+
+def test_timings_are_enabled_by_env_var(monkeypatch, capsys):
+    monkeypatch.setenv('CLOUP_TIMINGS', '1')
+    assert run(make_cli(), capsys, ['sub']).startswith('cli: ')
+    assert run(make_cli(timings=False), capsys, ['sub']) == ''
+
+
+@pytest.mark.parametrize('setting, env, expected', [
+    (None, None, None),
+    (None, '', None),
+    (False, '1', None),
+    (True, None, '-'),
+    ('-', None, '-'),
+    (None, 'stderr', '-'),
+    (None, 'out.json', 'out.json'),
+    (None, '0', None),
+    (None, 'false', None),
+    (None, 'No', None),
+    (None, 'FALSE', None),
+    ('0', None, None),
+    ('a.json', 'b.json', 'a.json'),
+])
+def test_get_timings_target(monkeypatch, setting, env, expected):
+    if env is None:
+        monkeypatch.delenv('CLOUP_TIMINGS', raising=False)
+    else:
+        monkeypatch.setenv('CLOUP_TIMINGS', env)
+    assert get_timings_target(setting) == expected
+
+
+def test_phase_timings_format():
+    root = PhaseTimings('cli')
+    root.add('invoke', 0.002)
+    root.add('construction', 0.001)
+    root.add('invoke', 0.001)
+    root.add_child('sub').add('parsing', 0.0005)
+    assert root.format() == (
+        'cli: construction=1.000ms invoke=3.000ms\n'
+        '  sub: parsing=0.500ms'
+    )
@@ -0,0 +1,93 @@
+"""Tests for the tracer of the construction of command trees."""
+import cloup
+from cloup import ConstructionTracer
+from cloup._tracing import trace_construction
+from cloup.constraints import RequireAtLeast, mutually_exclusive
+
+
+def build_cli():
+    @cloup.group()
+    def cli():
+        pass
+
+    @cloup.command()
+    @cloup.option_group(
+        'Target',
+        cloup.option('--env'),
+        cloup.option('--region'),
+        constraint=RequireAtLeast(1),
+    )
+    @cloup.option('--force', is_flag=True)
+    @cloup.option('--dry-run', is_flag=True)
+    @cloup.constraint(mutually_exclusive, ['force', 'dry_run'])
+    def deploy(**kwargs):
+        pass
+
+    cli.section('Deployment', deploy)
+    return cli
+
+
+def test_records():
+    with ConstructionTracer() as tracer:
+        build_cli()
+    prefix = f'{__name__}.build_cli.<locals>.'
+    assert [(r.kind, r.name) for r in tracer.records] == [
+        ('constraints', prefix + 'cli'),
+        ('command', prefix + 'cli'),
+        ('option_group', prefix + 'deploy: Target'),
+        ('constraints', prefix + 'deploy'),
+        ('command', prefix + 'deploy'),
+        ('section', 'cli: Deployment'),
+    ]
+    constraints, command = tracer.records[3:5]
+    assert command.seconds >= constraints.seconds
+    assert command.self_seconds == command.seconds - constraints.seconds
+    assert all(r.allocated == 0 for r in tracer.records)
+    assert tracer.total_seconds <= sum(r.seconds for r in tracer.records)
+
+
+def test_nothing_is_recorded_outside_the_with_block():
+    tracer = ConstructionTracer()
+    with tracer:
+        with ConstructionTracer() as inner:
+            build_cli()
+        assert not tracer.records
+        build_cli()
+    build_cli()
+    assert len(inner.records) == len(tracer.records) == 6
+
+
+def test_trace_allocations():
+    with ConstructionTracer(trace_allocations=True) as tracer:
+        build_cli()
+    assert all(r.allocated >= r.self_allocated for r in tracer.records)
+    assert max(r.self_allocated for r in tracer.records) > 0
+    top = tracer.top(2, by='self_allocated')
+    assert top[0].self_allocated >= top[1].self_allocated
+
+
+def test_report():
+    with ConstructionTracer(trace_allocations=True) as tracer:
+        build_cli()
+    lines = tracer.format_report(n=3).splitlines()
+    assert lines[0].startswith('6 construction steps traced, ')
+    assert lines[0].endswith('top 3 by self_seconds:')
+    assert lines[1] == '  self ms  total ms  self KiB  kind          name'
+    assert len(lines) == 5
+    assert [line[31:43].strip() for line in lines[2:]] == [
+        r.kind for r in tracer.top(3)]
+
+
+def test_names_are_built_only_if_a_tracer_is_active(monkeypatch):
+    class Subject:
+        def __str__(self):
+            raise AssertionError('name built without a tracer')
+
+    with trace_construction('section', Subject(), 'Title'):
+        pass
+
+    monkeypatch.setattr(Subject, '__str__', lambda self: 'subject')
+    with ConstructionTracer() as tracer:
+        with trace_construction('section', Subject(), 'Title'):
+            pass
+    assert tracer.records[0].name == 'subject: Title'